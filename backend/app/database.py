@@ -1,9 +1,18 @@
 # backend/app/database.py
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
+from prometheus_client import Counter
 import os
+import random
 from dotenv import load_dotenv
+from utils.request_metrics import instrument_engine
+from utils.security import token_subject
+from utils.cache import TTLCache
 
 # Get the directory of the current file
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -12,14 +21,156 @@ ROOT_DIR = os.path.dirname(os.path.dirname(BASE_DIR))
 load_dotenv(os.path.join(ROOT_DIR, ".env"))
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Comma-separated read replicas of DATABASE_URL, used by get_read_db
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+# After a user writes, their reads stay on the primary this many seconds
+# so replica lag never hides their own vote or post
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Connection pool tuning
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Per-statement timeout in milliseconds (0 disables it)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 5000))
+
+def _async_url(url: str) -> str:
+    # Accept the usual sync URLs in .env and pick the async driver
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+def _engine_options(url: str) -> dict:
+    options = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    if url.startswith("sqlite"):
+        # SQLite has no statement timeout; use it as the lock wait instead
+        if DB_STATEMENT_TIMEOUT_MS:
+            options["connect_args"] = {"timeout": DB_STATEMENT_TIMEOUT_MS / 1000}
+        return options
+
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    if DB_STATEMENT_TIMEOUT_MS and url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        }
+    return options
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores foreign keys, and so ON DELETE CASCADE, unless every
+    # connection turns them on
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def _create_engine(url: str):
+    async_url = _async_url(url)
+    created = create_async_engine(async_url, **_engine_options(async_url))
+    if async_url.startswith("sqlite"):
+        event.listen(created.sync_engine, "connect", _enable_sqlite_foreign_keys)
+    # Per-statement timing and per-request query counts
+    instrument_engine(created.sync_engine)
+    return created
+
+def _sessionmaker(bind):
+    return async_sessionmaker(
+        bind, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+engine = _create_engine(DATABASE_URL)
+SessionLocal = _sessionmaker(engine)
+replica_engines = [_create_engine(url) for url in DATABASE_REPLICA_URLS]
+_replica_sessions = [_sessionmaker(replica) for replica in replica_engines]
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+DB_READ_SESSIONS = Counter(
+    "db_read_sessions_total", "Sessions opened by get_read_db", ["target"]
+)
+
+# Users who committed a write recently; kept per process, so with several
+# workers the window only holds where the load balancer is sticky
+recent_writers = TTLCache(max_size=100000, ttl=READ_YOUR_WRITES_SECONDS)
+
+# Session-class events also fire for the sync session inside AsyncSession
+@event.listens_for(Session, "after_flush")
+def _note_orm_write(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_statement_write(orm_execute_state):
+    # Core insert/update/delete run through session.execute never flush
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session):
+    if session.info.pop("wrote", False):
+        user_id = token_subject(session.info.get("authorization"))
+        if user_id is not None:
+            recent_writers.set(user_id, True)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session):
+    session.info.pop("wrote", None)
+
+async def get_db(request: Request):
+    # Primary session; the caller's token is kept so a committed write
+    # pins their reads to the primary for a while
+    async with SessionLocal() as db:
+        db.info["authorization"] = request.headers.get("authorization")
+        yield db
+
+def _wrote_recently(request: Request) -> bool:
+    user_id = token_subject(request.headers.get("authorization"))
+    return user_id is not None and recent_writers.get(user_id) is not None
+
+# INSERT constructs that support ON CONFLICT DO UPDATE, per dialect
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+def upsert_insert(db: AsyncSession):
+    # The session's dialect-specific insert() for upserts, or None when
+    # its database has none
+    return _UPSERT_INSERTS.get(db.bind.dialect.name)
+
+def read_sessionmaker():
+    # Session factory for reads outside a request's session, such as
+    # streamed exports: a random replica, or the primary without any
+    if not _replica_sessions:
+        return SessionLocal
+    return random.choice(_replica_sessions)
+
+async def get_read_db(request: Request):
+    # Session for read-only handlers: a random replica, or the primary
+    # when there are none or the caller has just written. The latter sets
+    # info["read_your_writes"] so cached responses, possibly built from a
+    # lagging replica, are rebuilt instead.
+    if not _replica_sessions:
+        DB_READ_SESSIONS.labels(target="primary").inc()
+        async with SessionLocal() as db:
+            yield db
+        return
+
+    if _wrote_recently(request):
+        DB_READ_SESSIONS.labels(target="primary").inc()
+        async with SessionLocal() as db:
+            db.info["read_your_writes"] = True
+            yield db
+        return
+
+    DB_READ_SESSIONS.labels(target="replica").inc()
+    async with random.choice(_replica_sessions)() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
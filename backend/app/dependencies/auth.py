@@ -1,17 +1,88 @@
 # backend/app/dependencies/auth.py
+import logging
+import os
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
+from sqlalchemy import event, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from prometheus_client import Counter
 from utils.security import SECRET_KEY, ALGORITHM
+from utils.cache import TTLCache
+from utils.log import log_event, LOG_SAMPLE_RATE
 from database import get_db
 from models.user import User
 
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer()
 
-def get_current_user(
+USER_CACHE_ENABLED = os.getenv("USER_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", 10000))
+
+USER_CACHE_HITS = Counter("user_cache_hits_total", "Authenticated user lookups served from cache")
+USER_CACHE_MISSES = Counter("user_cache_misses_total", "Authenticated user lookups that hit the database")
+
+user_cache = TTLCache(max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+class CurrentUser:
+    # Detached snapshot of the user fields request handlers need. Cached
+    # for up to USER_CACHE_TTL_SECONDS; ORM changes to a user drop it from
+    # this process's cache on commit, changes made elsewhere wait out the TTL
+    __slots__ = ("id", "username", "phone_number", "is_active", "is_admin")
+
+    def __init__(self, id, username, phone_number, is_active, is_admin=False):
+        self.id = id
+        self.username = username
+        self.phone_number = phone_number
+        self.is_active = is_active
+        self.is_admin = is_admin
+
+async def _load_user(db: AsyncSession, user_id: int):
+    if USER_CACHE_ENABLED:
+        cached = user_cache.get(user_id)
+        if cached is not None:
+            USER_CACHE_HITS.inc()
+            return cached
+        USER_CACHE_MISSES.inc()
+
+    result = await db.execute(
+        select(User.id, User.username, User.phone_number, User.is_active, User.is_admin).where(
+            User.id == user_id
+        )
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    user = CurrentUser(row.id, row.username, row.phone_number, row.is_active, row.is_admin)
+    if USER_CACHE_ENABLED:
+        user_cache.set(user_id, user)
+    return user
+
+# Session-class events also fire for the sync session inside AsyncSession
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    # Remember users modified in this transaction...
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            session.info.setdefault("changed_user_ids", set()).add(obj.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    # ...and drop them from the cache once the change is visible
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -24,15 +95,25 @@ def get_current_user(
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id_raw = payload.get("sub")
         if user_id_raw is None:
-            print("DEBUG: No sub in payload")
+            log_event(logger, logging.INFO, "auth.token_without_subject", sample_rate=LOG_SAMPLE_RATE)
             raise credentials_exception
         user_id = int(user_id_raw)
     except (JWTError, ValueError) as e:
-        print(f"DEBUG: JWT Decode Error: {str(e)}")
+        log_event(logger, logging.INFO, "auth.token_invalid", sample_rate=LOG_SAMPLE_RATE, error=str(e))
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await _load_user(db, user_id)
     if user is None:
-        print(f"DEBUG: User not found for id {user_id}")
+        log_event(logger, logging.INFO, "auth.user_not_found", sample_rate=LOG_SAMPLE_RATE, user_id=user_id)
+        raise credentials_exception
+    if not user.is_active:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
+
+async def get_current_admin(current_user: CurrentUser = Depends(get_current_user)):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator privileges required",
+        )
+    return current_user
@@ -0,0 +1,52 @@
+# backend/app/dependencies/rate_limit.py
+import logging
+import os
+from fastapi import Depends, HTTPException, Request, status
+from utils.rate_limit import Budget, RateLimited, rate_limiter
+from utils.log import log_event, LOG_SAMPLE_RATE
+from dependencies.auth import get_current_user
+
+logger = logging.getLogger(__name__)
+
+# Only honour X-Forwarded-For behind a proxy that sets it; otherwise any
+# client could pick its own key
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() in ("1", "true", "yes")
+
+# Per-route budgets, each overridable as RATE_LIMIT_<NAME>="<requests>/<seconds>"
+LOGIN_PER_IP = Budget.from_env("login_ip", "20/60")
+LOGIN_PER_ACCOUNT = Budget.from_env("login_account", "5/60")
+SIGNUP_PER_IP = Budget.from_env("signup_ip", "5/300")
+REFRESH_PER_IP = Budget.from_env("refresh_ip", "30/60")
+VOTE_PER_USER = Budget.from_env("vote_user", "60/60")
+CREATE_POST_PER_USER = Budget.from_env("create_post_user", "10/60")
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+async def enforce(budget: Budget, key: str):
+    try:
+        await rate_limiter.hit(budget, key)
+    except RateLimited as e:
+        log_event(logger, logging.INFO, "rate_limit.throttled", sample_rate=LOG_SAMPLE_RATE,
+                  budget=budget.name, retry_after=e.retry_after)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many requests, please retry in {e.retry_after} seconds",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+def limit_by_ip(budget: Budget):
+    async def dependency(request: Request):
+        await enforce(budget, client_ip(request))
+    return dependency
+
+def limit_by_user(budget: Budget):
+    # get_current_user is cached per request, so routes depending on it
+    # as well don't authenticate twice
+    async def dependency(current_user=Depends(get_current_user)):
+        await enforce(budget, str(current_user.id))
+    return dependency
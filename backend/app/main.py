@@ -8,17 +8,42 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(os.path.dirname(BASE_DIR))
 load_dotenv(os.path.join(ROOT_DIR, ".env"))
 
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from database import engine, Base
-from routes import auth, posts, rankings
+from fastapi.staticfiles import StaticFiles
+from database import engine, replica_engines, SessionLocal, Base
+from services.user_stats_service import UserStatsService
+from routes import auth, posts, rankings, moderation, users, data
+from utils.pagination import NEXT_CURSOR_HEADER
+from services.vote_buffer import vote_buffer
+from utils.hashing_pool import hashing_pool
+from utils.rate_limit import rate_limiter
+from services.media_pipeline import media_pipeline
+from services.leaderboard import leaderboard
+from services.storage import storage, LocalStorage
+from utils.log import configure_logging
+from utils.request_metrics import start_request, finish_request
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 import uvicorn
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+configure_logging()
 
 app = FastAPI(title="Community Help App", version="1.0.0")
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    # Latency and SQL statement count/time per route, see utils/request_metrics.py
+    stats = start_request()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        finish_request(request, status_code, stats, time.perf_counter() - started)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -26,16 +51,56 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Retry-After"],
 )
 
 # Include routers
 app.include_router(auth.router)
 app.include_router(posts.router)
 app.include_router(rankings.router)
+app.include_router(users.router)
+app.include_router(moderation.router)
+app.include_router(data.router)
+
+# Serve uploaded media when it is stored on local disk
+if isinstance(storage, LocalStorage):
+    app.mount("/media", StaticFiles(directory=storage.root), name="media")
+
+@app.on_event("startup")
+async def create_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # Fill the dashboard counters once for databases that predate them
+    async with SessionLocal() as db:
+        await UserStatsService.rebuild_if_empty(db)
+
+@app.on_event("startup")
+async def start_background_workers():
+    if vote_buffer is not None:
+        vote_buffer.start()
+    await media_pipeline.start()
+    leaderboard.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    # Flush buffered votes before the process exits
+    if vote_buffer is not None:
+        await vote_buffer.close()
+    await media_pipeline.close()
+    await leaderboard.close()
+    hashing_pool.shutdown()
+    await rate_limiter.close()
+    await engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
 
 @app.get("/")
 def read_root():
     return {"message": "Community Help App API"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="localhost", port=8000, reload=True)
\ No newline at end of file
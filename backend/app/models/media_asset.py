@@ -0,0 +1,19 @@
+# backend/app/models/media_asset.py
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from database import Base
+
+class MediaAsset(Base):
+    __tablename__ = "media_assets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # SHA-256 of the uploaded bytes; identical files share one asset
+    content_hash = Column(String(64), unique=True, index=True, nullable=False)
+    storage_key = Column(String, nullable=False)
+    url = Column(String, nullable=False)
+    resource_type = Column(String, nullable=False)  # 'image' or 'video'
+    # Resized copies: {width: {format: {"url", "key"}}}
+    variants = Column(JSON, nullable=True)
+    # Number of posts using this asset; deleted from storage at zero
+    ref_count = Column(Integer, default=0, server_default="0", nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,9 +1,15 @@
 # backend/app/models/post.py
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float
-from sqlalchemy.sql import func
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Text, ForeignKey, Float, Index, JSON, Boolean, DDL, event
+)
+from sqlalchemy.sql import func, false
 from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
 from database import Base
 
+def _utcnow():
+    return datetime.now(timezone.utc)
+
 class Post(Base):
     __tablename__ = "posts"
 
@@ -11,14 +17,76 @@ class Post(Base):
     text = Column(Text, nullable=False)
     media_url = Column(String, nullable=True)
     media_type = Column(String, nullable=True)  # 'image' or 'video'
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    media_status = Column(String, nullable=True)  # 'pending', 'ready' or 'failed'
+    media_hash = Column(String(64), nullable=True, index=True)  # media_assets.content_hash
+    # Copied from the media asset so listings need no join
+    thumbnail_url = Column(String, nullable=True)
+    media_variants = Column(JSON, nullable=True)  # {format: {width: url}}
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Optional location; geohash indexes it for the nearby feed
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)
+    # Hidden by a moderator: left out of every listing but kept in the database
+    is_hidden = Column(Boolean, default=False, server_default=false(), nullable=False)
+    # Stamped in Python so it is stored in the same format keyset cursors
+    # bind with; SQLite's CURRENT_TIMESTAMP text has no fractional seconds
+    # and compares out of order against them
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Ranking aggregates (cached for performance)
-    total_rankings = Column(Integer, default=0)
-    average_rank = Column(Float, default=0.0)
+    total_rankings = Column(Integer, default=0, server_default="0", nullable=False)
+    average_rank = Column(Float, default=0.0, server_default="0", nullable=False)
+    rank_1_count = Column(Integer, default=0, server_default="0", nullable=False)
+    rank_2_count = Column(Integer, default=0, server_default="0", nullable=False)
+    rank_3_count = Column(Integer, default=0, server_default="0", nullable=False)
     
     # Relationships
     owner = relationship("User", back_populates="posts")
-    rankings = relationship("Ranking", back_populates="post", cascade="all, delete-orphan")
\ No newline at end of file
+    # Rankings go with the post through ON DELETE CASCADE; passive_deletes
+    # stops the ORM loading and deleting them one by one first
+    rankings = relationship(
+        "Ranking", back_populates="post", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    __table_args__ = (
+        # Keyset pagination of the feed seeks on (created_at, id)
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        # A user's own posts, newest first; also serves deletes by user
+        Index("ix_posts_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Server-side "priority" and "most_ranked" feed sorts
+        Index("ix_posts_average_rank_created_at_id", "average_rank", "created_at", "id"),
+        Index("ix_posts_total_rankings_created_at_id", "total_rankings", "created_at", "id"),
+        # Nearby feed matches geohash prefixes; pattern ops let PostgreSQL
+        # use the index for LIKE 'prefix%' whatever the collation
+        Index("ix_posts_geohash", "geohash", postgresql_ops={"geohash": "varchar_pattern_ops"}),
+    )
+
+# Full-text search index on posts.text, created next to the table. Both
+# variants are maintained by the database itself, so every insert, update
+# and delete of a post keeps the index in sync.
+#
+# PostgreSQL: a generated tsvector column with a GIN index
+_POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector)",
+]
+# SQLite: an external-content FTS5 table kept current by triggers
+_SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "text, content='posts', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, text) VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF text ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, text) VALUES ('delete', old.id, old.text); "
+    "INSERT INTO posts_fts(rowid, text) VALUES (new.id, new.text); END",
+]
+
+for _statement in _POSTGRES_SEARCH_DDL:
+    event.listen(Post.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in _SQLITE_SEARCH_DDL:
+    event.listen(Post.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
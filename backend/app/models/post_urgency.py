@@ -0,0 +1,21 @@
+# backend/app/models/post_urgency.py
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index
+from database import Base
+
+class PostUrgency(Base):
+    # Time-decayed urgency per post and leaderboard period. Scores are
+    # stored as of computed_at, which is the same for every row of a
+    # period, so ordering by score orders by current urgency. (Rows a vote
+    # nudged in during a recompute keep the older time until the next one.)
+    __tablename__ = "post_urgency"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    period = Column(String(8), primary_key=True)  # '24h', '7d' or 'all'
+    score = Column(Float, nullable=False, default=0.0)
+    vote_count = Column(Integer, nullable=False, default=0)
+    computed_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # Top N of a period is an index range scan
+        Index("ix_post_urgency_period_score", "period", "score"),
+    )
@@ -1,5 +1,5 @@
 # backend/app/models/ranking.py
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -8,13 +8,18 @@ class Ranking(Base):
     __tablename__ = "rankings"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Indexed so the database-level cascade from posts is a range delete
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, index=True)
     rank_value = Column(Integer, nullable=False)  # 1, 2, or 3
     ranked_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Ensure one ranking per user per post
-    __table_args__ = (UniqueConstraint('user_id', 'post_id', name='unique_user_post_ranking'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'post_id', name='unique_user_post_ranking'),
+        # A user's votes, most recent first
+        Index("ix_rankings_user_id_id", "user_id", "id"),
+    )
     
     # Relationships
     user = relationship("User", back_populates="rankings")
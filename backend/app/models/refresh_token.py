@@ -0,0 +1,20 @@
+# backend/app/models/refresh_token.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from database import Base
+
+class RefreshToken(Base):
+    # One opaque refresh token. Only its SHA-256 is stored. Each refresh
+    # marks the token used and issues the next one in the same family, so
+    # a used token coming back means it leaked and the family is revoked.
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    # Every token descended from one login shares its family
+    family_id = Column(String(32), index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    used_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
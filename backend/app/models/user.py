@@ -1,6 +1,6 @@
 # backend/app/models/user.py
 from sqlalchemy import Column, Integer, String, DateTime, Boolean
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, false
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -13,6 +13,8 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     national_id = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    # Moderators may hide or delete anyone's posts
+    is_admin = Column(Boolean, default=False, server_default=false(), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
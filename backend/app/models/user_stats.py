@@ -0,0 +1,24 @@
+# backend/app/models/user_stats.py
+from sqlalchemy import Column, Integer, ForeignKey
+from database import Base
+
+# Counters kept by the write paths through UserStatsService.apply
+STAT_COLUMNS = (
+    "posts_count", "votes_received", "votes_cast",
+    "high_priority_posts", "medium_priority_posts", "low_priority_posts",
+)
+
+class UserStats(Base):
+    # Per-user dashboard summary, updated incrementally on every post and
+    # vote write so reading it is a primary key lookup
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    posts_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Votes on the user's posts, and votes the user has cast on others'
+    votes_received = Column(Integer, default=0, server_default="0", nullable=False)
+    votes_cast = Column(Integer, default=0, server_default="0", nullable=False)
+    # The user's posts by current priority level (average rank thresholds)
+    high_priority_posts = Column(Integer, default=0, server_default="0", nullable=False)
+    medium_priority_posts = Column(Integer, default=0, server_default="0", nullable=False)
+    low_priority_posts = Column(Integer, default=0, server_default="0", nullable=False)
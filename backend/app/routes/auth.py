@@ -1,28 +1,51 @@
 # backend/app/routes/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
-from schemas.user import UserCreate, UserLogin, UserResponse
-from services.auth_service import AuthService
+from schemas.user import UserCreate, UserLogin, UserResponse, RefreshRequest
+from services.auth_service import AuthService, InvalidRefreshToken
 from dependencies.auth import get_current_user
+from utils.hashing_pool import HashingPoolBusy
+from dependencies.rate_limit import (
+    enforce, limit_by_ip, LOGIN_PER_IP, LOGIN_PER_ACCOUNT, SIGNUP_PER_IP, REFRESH_PER_IP
+)
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
-@router.post("/signup", response_model=UserResponse)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+def _hashing_busy(e: HashingPoolBusy):
+    # Push back instead of queueing logins without bound
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+@router.post(
+    "/signup", response_model=UserResponse,
+    dependencies=[Depends(limit_by_ip(SIGNUP_PER_IP))]
+)
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_db)):
     try:
-        db_user = AuthService.create_user(db, user)
+        db_user = await AuthService.create_user(db, user)
         return db_user
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HashingPoolBusy as e:
+        raise _hashing_busy(e)
 
-@router.post("/login")
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
-    user = AuthService.authenticate_user(
-        db, 
-        credentials.phone_number, 
-        credentials.password
-    )
+@router.post("/login", dependencies=[Depends(limit_by_ip(LOGIN_PER_IP))])
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
+    # Per account as well, so guessing one password from many addresses
+    # is throttled too; both checks run before the expensive verify
+    await enforce(LOGIN_PER_ACCOUNT, credentials.phone_number)
+    try:
+        user = await AuthService.authenticate_user(
+            db, 
+            credentials.phone_number, 
+            credentials.password
+        )
+    except HashingPoolBusy as e:
+        raise _hashing_busy(e)
     
     if not user:
         raise HTTPException(
@@ -31,8 +54,27 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return AuthService.create_user_token(user)
+    return await AuthService.create_user_token(db, user.id)
+
+@router.post("/refresh", dependencies=[Depends(limit_by_ip(REFRESH_PER_IP))])
+async def refresh(body: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    # Exchanges a refresh token for a new pair; no password check involved
+    try:
+        return await AuthService.refresh(db, body.refresh_token)
+    except InvalidRefreshToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.post("/logout")
+async def logout(body: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    # Ends the session the refresh token belongs to; issued access tokens
+    # stay valid until they expire
+    await AuthService.revoke(db, body.refresh_token)
+    return {"message": "Logged out"}
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: UserResponse = Depends(get_current_user)):
+async def get_current_user_info(current_user: UserResponse = Depends(get_current_user)):
     return current_user
\ No newline at end of file
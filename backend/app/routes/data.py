@@ -0,0 +1,69 @@
+# backend/app/routes/data.py
+import codecs
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated
+from database import get_db, read_sessionmaker
+from schemas.data_transfer import DataTable, DataFormat, ImportResult
+from services.data_transfer_service import DataTransferService, ImportConflict
+from services.leaderboard import leaderboard
+from utils.http_cache import response_cache
+from utils.log import log_event
+from dependencies.auth import get_current_admin
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/data", tags=["data"])
+
+_MEDIA_TYPES = {
+    DataFormat.NDJSON: "application/x-ndjson",
+    DataFormat.CSV: "text/csv",
+}
+
+@router.get("/export/{table}")
+async def export_table(
+    table: DataTable,
+    data_format: DataFormat = Query(DataFormat.NDJSON, alias="format"),
+    admin=Depends(get_current_admin)
+):
+    # Streamed in chunks from a server-side cursor, off a replica when
+    # there is one, so memory stays flat whatever the table size
+    log_event(logger, logging.INFO, "data.export", admin_id=admin.id, table=table.value)
+    return StreamingResponse(
+        DataTransferService.export_rows(read_sessionmaker(), table, data_format),
+        media_type=_MEDIA_TYPES[data_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{table.value}.{data_format.value}"'
+        }
+    )
+
+@router.post("/import/{table}", response_model=ImportResult)
+async def import_table(
+    table: DataTable,
+    file: Annotated[UploadFile, File()],
+    data_format: DataFormat = Query(DataFormat.NDJSON, alias="format"),
+    admin=Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    # Same columns as the export; import posts before their rankings.
+    # The whole file is loaded in one transaction or not at all.
+    lines = codecs.iterdecode(file.file, "utf-8-sig")
+    try:
+        imported = await DataTransferService.import_rows(db, table, data_format, lines)
+    except ImportConflict as e:
+        raise HTTPException(status_code=409, detail=f"Import conflicts with existing data: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Aggregates were rebuilt with the load; bring the cached listings and
+    # the leaderboard up too
+    response_cache.clear()
+    await leaderboard.recompute()
+
+    log_event(
+        logger, logging.INFO, "data.import",
+        admin_id=admin.id, table=table.value, imported=imported
+    )
+    return {"table": table, "imported": imported}
@@ -0,0 +1,50 @@
+# backend/app/routes/moderation.py
+import logging
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db
+from schemas.moderation import ModerationAction, ModerationRequest, ModerationResult
+from services.moderation_service import ModerationService
+from services.media_pipeline import media_pipeline
+from services.live_broker import live_broker
+from utils.http_cache import response_cache, FEED_SCOPE, LEADERBOARD_SCOPE, post_scope
+from utils.log import log_event
+from dependencies.auth import get_current_admin
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/moderation", tags=["moderation"])
+
+@router.post("/posts", response_model=ModerationResult)
+async def moderate_posts(
+    moderation: ModerationRequest,
+    admin=Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    # Delete, hide or unhide many posts, or all of one user's, at once
+    condition = ModerationService.target(moderation.post_ids, moderation.user_id)
+
+    if moderation.action == ModerationAction.DELETE:
+        post_ids, files = await ModerationService.delete_posts(db, condition)
+        # Storage deletes happen in the background, not in this request
+        media_pipeline.discard(files)
+    else:
+        post_ids = await ModerationService.set_hidden(
+            db, condition, moderation.action == ModerationAction.HIDE
+        )
+
+    if post_ids:
+        response_cache.invalidate(
+            FEED_SCOPE, LEADERBOARD_SCOPE, *[post_scope(post_id) for post_id in post_ids]
+        )
+    if moderation.action != ModerationAction.UNHIDE:
+        # Hidden posts vanish for viewers just like deleted ones
+        for post_id in post_ids:
+            live_broker.publish_deleted(post_id)
+
+    log_event(
+        logger, logging.INFO, "moderation.posts",
+        admin_id=admin.id, action=moderation.action.value,
+        target_user_id=moderation.user_id, affected=len(post_ids)
+    )
+    return {"action": moderation.action, "affected": len(post_ids), "post_ids": post_ids}
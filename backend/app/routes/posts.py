@@ -1,104 +1,246 @@
 # backend/app/routes/posts.py
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import List, Optional, Annotated
-from database import get_db
-from schemas.post import PostCreate, PostResponse, PostUpdate
+from database import get_db, get_read_db
+from schemas.post import (
+    PostCreate, PostResponse, PostUpdate, PostSort, PriorityLevel,
+    NearbySort, NearbyPostResponse, LeaderboardPeriod, LeaderboardEntry
+)
 from models.post import Post
-from services.cloudinary_service import CloudinaryService
+from services.media_pipeline import (
+    media_pipeline, media_resource_type, spool_upload, discard_spool,
+    MEDIA_PENDING, MEDIA_READY
+)
+from services.media_service import MediaService
+from services.moderation_service import ModerationService
+from services.user_stats_service import UserStatsService, stat_deltas, record_post_created
+from services.media_variants import thumbnail_url, public_variants
+from services.post_service import PostService, post_listing_query, post_row_to_dict
+from services.live_broker import live_broker
+from services.leaderboard import leaderboard
+from utils.pagination import NEXT_CURSOR_HEADER
+from utils import geo
+from utils.log import log_event, LOG_SAMPLE_RATE
+from utils.http_cache import (
+    response_cache, conditional_response, render_json, json_response,
+    FEED_SCOPE, LEADERBOARD_SCOPE, post_scope
+)
 from dependencies.auth import get_current_user
+from dependencies.rate_limit import limit_by_user, CREATE_POST_PER_USER
 from models.user import User
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/posts", tags=["posts"])
 
-@router.post("/", response_model=PostResponse)
-def create_post(
+@router.post(
+    "/", response_model=PostResponse,
+    dependencies=[Depends(limit_by_user(CREATE_POST_PER_USER))]
+)
+async def create_post(
     text: Annotated[str, Form()],
     media_file: Annotated[Optional[UploadFile], File()] = None,
+    latitude: Annotated[Optional[float], Form(ge=-90, le=90)] = None,
+    longitude: Annotated[Optional[float], Form(ge=-180, le=180)] = None,
     current_user: Annotated[User, Depends(get_current_user)] = None,
-    db: Annotated[Session, Depends(get_db)] = None
+    db: Annotated[AsyncSession, Depends(get_db)] = None
 ):
-    print(f"DEBUG: create_post called with text='{text}'")
+    log_event(
+        logger, logging.INFO, "post.create", sample_rate=LOG_SAMPLE_RATE,
+        user_id=current_user.id, text_length=len(text), has_media=media_file is not None
+    )
+    if (latitude is None) != (longitude is None):
+        raise HTTPException(status_code=400, detail="Latitude and longitude must be given together")
+    
     media_url = None
     media_type = None
+    media_status = None
+    media_hash = None
+    thumbnail = None
+    variants = None
+    spool_path = None
     
     if media_file:
-        # Upload to Cloudinary
-        upload_result = CloudinaryService.upload_media(media_file)
-        media_url = upload_result["url"]
-        media_type = upload_result["resource_type"]
+        # Spool to disk now; the upload itself runs in the background
+        media_type = media_resource_type(media_file)
+        spool_path, media_hash = await spool_upload(media_file)
+        
+        # Same bytes already stored: reuse them instead of uploading again
+        asset = await MediaService.acquire(db, media_hash)
+        if asset:
+            media_url = asset.url
+            media_type = asset.resource_type
+            media_status = MEDIA_READY
+            thumbnail = thumbnail_url(asset.variants)
+            variants = public_variants(asset.variants)
+            discard_spool(spool_path)
+            spool_path = None
+        else:
+            media_status = MEDIA_PENDING
     
     # Create post
     db_post = Post(
         text=text,
         media_url=media_url,
         media_type=media_type,
+        media_status=media_status,
+        media_hash=media_hash,
+        thumbnail_url=thumbnail,
+        media_variants=variants,
+        latitude=latitude,
+        longitude=longitude,
+        geohash=geo.encode(latitude, longitude) if latitude is not None else None,
         user_id=current_user.id
     )
     
     db.add(db_post)
-    db.commit()
-    db.refresh(db_post)
+    stats = stat_deltas()
+    record_post_created(stats, current_user.id)
+    await UserStatsService.apply(db, stats)
+    await db.commit()
+    await db.refresh(db_post)
+    
+    response_cache.invalidate(FEED_SCOPE)
+    
+    if spool_path:
+        # Worker fills in media_url once the upload lands
+        media_pipeline.submit(db_post.id, spool_path, media_type, media_hash)
     
     # Add owner username to response
     db_post.owner_username = current_user.username
     return db_post
 
 @router.get("/", response_model=List[PostResponse])
-def get_all_posts(
+async def get_all_posts(
+    request: Request,
     skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: PostSort = PostSort.NEWEST,
+    priority: Optional[PriorityLevel] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[User] = Depends(get_current_user)
 ):
-    query = db.query(Post)
-    
     # NEW FEATURE: Exclude current user's own posts from "All Posts"
-    if current_user:
-        query = query.filter(Post.user_id != current_user.id)
-        
-    posts = query.order_by(Post.created_at.desc()).offset(skip).limit(limit).all()
-    
-    # Add owner usernames
-    for post in posts:
-        post.owner_username = post.owner.username
-    
-    return posts
+    exclude_user_id = current_user.id if current_user else None
+
+    async def build():
+        posts, next_cursor = await PostService.get_feed(
+            db,
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            exclude_user_id=exclude_user_id,
+            sort=sort,
+            priority=priority
+        )
+        # Clients page by sending this back as ?cursor=
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        return render_json(posts), headers
+
+    key = ("feed", exclude_user_id, skip, limit, cursor, sort, priority)
+    try:
+        entry = await response_cache.get_or_build(
+            key, [FEED_SCOPE], build, refresh=db.info.get("read_your_writes", False)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return conditional_response(request, entry)
 
 @router.get("/my-posts", response_model=List[PostResponse])
-def get_my_posts(
+async def get_my_posts(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    posts = db.query(Post).filter(
-        Post.user_id == current_user.id
-    ).order_by(Post.created_at.desc()).all()
-    
-    for post in posts:
-        post.owner_username = current_user.username
-    
-    return posts
+    # Owners still see their hidden posts, flagged is_hidden
+    try:
+        posts, next_cursor = await PostService.get_user_posts(
+            db, current_user.id, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    return json_response(posts, headers)
+
+@router.get("/search", response_model=List[PostResponse])
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return json_response(await PostService.search(db, q, limit=limit, offset=offset))
+
+@router.get("/nearby", response_model=List[NearbyPostResponse])
+async def get_nearby_posts(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(1000, gt=0, le=50000, description="Radius in meters"),
+    sort: NearbySort = NearbySort.DISTANCE,
+    limit: int = Query(50, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    matches = await PostService.nearby(db, lat, lng, radius, limit=limit, sort=sort)
+    return json_response([
+        {**post, "distance_m": round(distance, 1)}
+        for post, distance in matches
+    ])
+
+@router.get("/leaderboard", response_model=List[LeaderboardEntry])
+async def get_leaderboard(
+    request: Request,
+    period: LeaderboardPeriod = LeaderboardPeriod.DAY,
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    # Most urgent posts by time-decayed votes within the period
+    async def build():
+        entries = await leaderboard.top(db, period, limit)
+        return render_json([
+            {**post, "urgency_score": round(score, 3), "period_votes": vote_count}
+            for post, score, vote_count in entries
+        ]), {}
+
+    key = ("leaderboard", period, limit)
+    entry = await response_cache.get_or_build(
+        key, [FEED_SCOPE, LEADERBOARD_SCOPE], build, refresh=db.info.get("read_your_writes", False)
+    )
+    return conditional_response(request, entry)
 
 @router.get("/{post_id}", response_model=PostResponse)
-def get_post(
+async def get_post(
     post_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
-    
-    post.owner_username = post.owner.username
-    return post
+    async def build():
+        result = await db.execute(post_listing_query().where(Post.id == post_id))
+        row = result.first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Post not found")
+        
+        return render_json(post_row_to_dict(row)), {}
+
+    entry = await response_cache.get_or_build(
+        ("post", post_id), [post_scope(post_id)], build, refresh=db.info.get("read_your_writes", False)
+    )
+    return conditional_response(request, entry)
 
 @router.put("/{post_id}", response_model=PostResponse)
-def update_post(
+async def update_post(
     post_id: int,
     post_update: PostUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    db_post = db.query(Post).filter(Post.id == post_id).first()
+    db_post = await db.get(Post, post_id)
     
     if not db_post:
         raise HTTPException(status_code=404, detail="Post not found")
@@ -111,33 +253,34 @@ def update_post(
         setattr(db_post, field, value)
     
     db_post.owner_username = current_user.username
-    db.commit()
-    db.refresh(db_post)
+    await db.commit()
+    await db.refresh(db_post)
+    response_cache.invalidate(FEED_SCOPE, post_scope(post_id))
+    live_broker.publish_updated(post_id, db_post.text)
     return db_post
 
 @router.delete("/{post_id}")
-def delete_post(
+async def delete_post(
     post_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    db_post = db.query(Post).filter(Post.id == post_id).first()
+    # Lock the row so a finishing media upload can't attach to it meanwhile
+    owner_id = await db.scalar(
+        select(Post.user_id).where(Post.id == post_id).with_for_update()
+    )
     
-    if not db_post:
+    if owner_id is None:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    if db_post.user_id != current_user.id:
+    if owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this post")
     
-    # Delete media from Cloudinary if exists
-    if db_post.media_url and "res.cloudinary.com" in db_post.media_url:
-        # Extract public_id from URL (simplified)
-        import re
-        match = re.search(r'/([^/]+)\.(jpg|jpeg|png|gif|mp4|mov|avi)$', db_post.media_url)
-        if match:
-            public_id = match.group(1)
-            CloudinaryService.delete_media(public_id)
+    # One DELETE; its rankings go through the database's ON DELETE CASCADE.
+    # Media the post held is released and removed in the background.
+    _, released = await ModerationService.delete_posts(db, Post.id == post_id)
+    response_cache.invalidate(FEED_SCOPE, LEADERBOARD_SCOPE, post_scope(post_id))
+    live_broker.publish_deleted(post_id)
     
-    db.delete(db_post)
-    db.commit()
-    return {"message": "Post deleted successfully"}
\ No newline at end of file
+    media_pipeline.discard(released)
+    return {"message": "Post deleted successfully"}
@@ -1,22 +1,55 @@
 # backend/app/routes/rankings.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_db
-from schemas.ranking import RankingCreate, RankingResponse, RankingStats
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, get_read_db
+from schemas.ranking import (
+    RankingCreate, RankingResponse, RankingStats,
+    RankingBatchRequest, PostRankingSummary, MAX_BATCH_POST_IDS
+)
 from services.ranking_service import RankingService
+from services.vote_buffer import vote_buffer
+from services.live_broker import (
+    live_broker, format_sse, LIVE_DELIVERED, LIVE_HEARTBEAT_SECONDS
+)
+from utils.http_cache import (
+    response_cache, conditional_response, render_json, json_response, post_scope
+)
+from utils.pagination import NEXT_CURSOR_HEADER
 from dependencies.auth import get_current_user
+from dependencies.rate_limit import limit_by_user, VOTE_PER_USER
 from models.user import User
 
 router = APIRouter(prefix="/rankings", tags=["rankings"])
 
-@router.post("/", response_model=RankingResponse)
-def create_or_update_ranking(
+@router.post(
+    "/", response_model=RankingResponse,
+    dependencies=[Depends(limit_by_user(VOTE_PER_USER))]
+)
+async def create_or_update_ranking(
     ranking: RankingCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
-        db_ranking = RankingService.add_or_update_ranking(
+        if vote_buffer is not None:
+            # Buffered mode: acknowledge now, the vote is written in the
+            # next batch flush
+            await RankingService.queue_ranking(
+                db, vote_buffer, current_user.id, ranking.post_id, ranking.rank_value
+            )
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={
+                    "post_id": ranking.post_id,
+                    "rank_value": ranking.rank_value,
+                    "user_id": current_user.id,
+                    "status": "queued"
+                }
+            )
+
+        db_ranking = await RankingService.add_or_update_ranking(
             db, current_user.id, ranking.post_id, ranking.rank_value
         )
         return db_ranking
@@ -24,31 +57,102 @@ def create_or_update_ranking(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/post/{post_id}/stats", response_model=RankingStats)
-def get_post_ranking_stats(
+async def get_post_ranking_stats(
     post_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
+):
+    async def build():
+        stats = await RankingService.get_ranking_stats(db, post_id)
+        return render_json(stats), {}
+
+    entry = await response_cache.get_or_build(
+        ("stats", post_id), [post_scope(post_id)], build, refresh=db.info.get("read_your_writes", False)
+    )
+    return conditional_response(request, entry)
+
+@router.get("/live")
+async def stream_ranking_updates(
+    request: Request,
+    post_ids: List[int] = Query(...)
+):
+    # Server-Sent Events stream of stat changes for the given posts,
+    # replacing per-vote polling of /stats
+    post_ids = set(post_ids)
+    if len(post_ids) > MAX_BATCH_POST_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_POST_IDS} post ids per stream"
+        )
+
+    async def events():
+        subscription = live_broker.subscribe(post_ids)
+        try:
+            # Tell the browser how long to wait before reconnecting
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                pending = await subscription.next_events(LIVE_HEARTBEAT_SECONDS)
+                if not pending:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                for event, data in pending:
+                    yield format_sse(event, data)
+                LIVE_DELIVERED.inc(len(pending))
+        finally:
+            live_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/batch", response_model=List[PostRankingSummary])
+async def get_batch_rankings(
+    batch: RankingBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    stats = RankingService.get_ranking_stats(db, post_id)
-    return stats
+    # Stats plus the caller's own vote for a whole page of posts
+    summaries = await RankingService.get_batch_ranking_stats(db, current_user.id, batch.post_ids)
+    if vote_buffer is not None:
+        # Show the caller their own not-yet-flushed votes
+        for summary in summaries:
+            pending = vote_buffer.pending_vote(current_user.id, summary["post_id"])
+            if pending is not None:
+                summary["rank_value"] = pending
+    return summaries
 
 @router.get("/post/{post_id}/my-ranking")
-def get_my_ranking_for_post(
+async def get_my_ranking_for_post(
     post_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    ranking = RankingService.get_user_ranking(db, current_user.id, post_id)
+    if vote_buffer is not None:
+        pending = vote_buffer.pending_vote(current_user.id, post_id)
+        if pending is not None:
+            return {"rank_value": pending}
+
+    ranking = await RankingService.get_user_ranking(db, current_user.id, post_id)
     if ranking:
         return {"rank_value": ranking.rank_value}
     return {"rank_value": None}
 
-@router.get("/user/my-rankings")
-def get_my_rankings(
+@router.get("/user/my-rankings", response_model=List[RankingResponse])
+async def get_my_rankings(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    from models.ranking import Ranking
-    rankings = db.query(Ranking).filter(
-        Ranking.user_id == current_user.id
-    ).all()
-    return rankings
\ No newline at end of file
+    try:
+        rankings, next_cursor = await RankingService.get_user_rankings(
+            db, current_user.id, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    return json_response(rankings, headers)
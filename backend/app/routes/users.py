@@ -0,0 +1,28 @@
+# backend/app/routes/users.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_read_db
+from schemas.user import UserDashboard
+from services.user_stats_service import UserStatsService
+from dependencies.auth import get_current_user
+from models.user import User
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+@router.get("/me/dashboard", response_model=UserDashboard)
+async def get_my_dashboard(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    # Counters maintained by the write paths, so this is one row lookup
+    stats = await UserStatsService.get(db, current_user.id)
+    return {
+        "posts_count": stats["posts_count"],
+        "votes_received": stats["votes_received"],
+        "votes_cast": stats["votes_cast"],
+        "priority_distribution": {
+            "high": stats["high_priority_posts"],
+            "medium": stats["medium_priority_posts"],
+            "low": stats["low_priority_posts"],
+        },
+    }
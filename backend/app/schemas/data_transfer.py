@@ -0,0 +1,15 @@
+# backend/app/schemas/data_transfer.py
+from pydantic import BaseModel
+from enum import Enum
+
+class DataTable(str, Enum):
+    POSTS = "posts"
+    RANKINGS = "rankings"
+
+class DataFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class ImportResult(BaseModel):
+    table: DataTable
+    imported: int
@@ -0,0 +1,39 @@
+# backend/app/schemas/moderation.py
+from pydantic import BaseModel, validator, root_validator
+from typing import Optional, List
+from enum import Enum
+
+# Upper bound on post IDs per moderation request
+MAX_MODERATION_POST_IDS = 1000
+
+class ModerationAction(str, Enum):
+    DELETE = "delete"
+    HIDE = "hide"
+    UNHIDE = "unhide"
+
+class ModerationRequest(BaseModel):
+    action: ModerationAction
+    # Either explicit posts or every post of one user
+    post_ids: Optional[List[int]] = None
+    user_id: Optional[int] = None
+
+    @validator('post_ids')
+    def validate_post_ids(cls, v):
+        if v is None:
+            return v
+        if not v:
+            raise ValueError('post_ids must not be empty')
+        if len(v) > MAX_MODERATION_POST_IDS:
+            raise ValueError(f'At most {MAX_MODERATION_POST_IDS} post IDs per request')
+        return list(dict.fromkeys(v))
+
+    @root_validator(skip_on_failure=True)
+    def validate_target(cls, values):
+        if (values.get('post_ids') is None) == (values.get('user_id') is None):
+            raise ValueError('Give exactly one of post_ids or user_id')
+        return values
+
+class ModerationResult(BaseModel):
+    action: ModerationAction
+    affected: int
+    post_ids: List[int]
@@ -1,6 +1,6 @@
 # backend/app/schemas/post.py
 from pydantic import BaseModel, validator
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
 
@@ -8,6 +8,26 @@ class MediaType(str, Enum):
     IMAGE = "image"
     VIDEO = "video"
 
+class PostSort(str, Enum):
+    NEWEST = "newest"
+    OLDEST = "oldest"
+    PRIORITY = "priority"
+    MOST_RANKED = "most_ranked"
+
+class PriorityLevel(str, Enum):
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+class NearbySort(str, Enum):
+    DISTANCE = "distance"
+    PRIORITY = "priority"
+
+class LeaderboardPeriod(str, Enum):
+    DAY = "24h"
+    WEEK = "7d"
+    ALL_TIME = "all"
+
 class PostBase(BaseModel):
     text: str
     media_url: Optional[str] = None
@@ -23,12 +43,25 @@ class PostUpdate(BaseModel):
 
 class PostResponse(PostBase):
     id: int
+    media_status: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    media_variants: Optional[Dict[str, Dict[str, str]]] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     user_id: int
     created_at: datetime
     updated_at: Optional[datetime]
     total_rankings: int = 0
     average_rank: float = 0.0
+    is_hidden: bool = False
     owner_username: str
     
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class NearbyPostResponse(PostResponse):
+    distance_m: float
+
+class LeaderboardEntry(PostResponse):
+    urgency_score: float
+    period_votes: int
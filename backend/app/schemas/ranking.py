@@ -1,7 +1,10 @@
 # backend/app/schemas/ranking.py
 from pydantic import BaseModel, validator
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
+
+# Upper bound on post IDs per batch request (one feed page)
+MAX_BATCH_POST_IDS = 100
 
 class RankingBase(BaseModel):
     post_id: int
@@ -29,4 +32,20 @@ class RankingStats(BaseModel):
     average_rank: float
     rank_1_count: int
     rank_2_count: int
-    rank_3_count: int
\ No newline at end of file
+    rank_3_count: int
+
+class RankingBatchRequest(BaseModel):
+    post_ids: List[int]
+
+    @validator('post_ids')
+    def validate_post_ids(cls, v):
+        if not v:
+            raise ValueError('post_ids must not be empty')
+        if len(v) > MAX_BATCH_POST_IDS:
+            raise ValueError(f'At most {MAX_BATCH_POST_IDS} post IDs per request')
+        # Drop duplicates but keep the caller's order
+        return list(dict.fromkeys(v))
+
+class PostRankingSummary(RankingStats):
+    post_id: int
+    rank_value: Optional[int] = None
\ No newline at end of file
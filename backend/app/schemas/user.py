@@ -29,9 +29,23 @@ class UserLogin(BaseModel):
     phone_number: str
     password: str
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
 class UserResponse(UserBase):
     id: int
     is_active: bool
     
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class PriorityDistribution(BaseModel):
+    high: int
+    medium: int
+    low: int
+
+class UserDashboard(BaseModel):
+    posts_count: int
+    votes_received: int
+    votes_cast: int
+    priority_distribution: PriorityDistribution
@@ -1,18 +1,30 @@
 # backend/app/services/auth_service.py
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete
 from models.user import User
+from models.refresh_token import RefreshToken
 from schemas.user import UserCreate
-from utils.security import get_password_hash, verify_password, create_access_token
-from datetime import timedelta
+from utils.security import (
+    create_access_token, create_refresh_token, hash_refresh_token,
+    ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS, REFRESH_REUSE_GRACE_SECONDS
+)
+from utils.hashing_pool import get_password_hash_pooled, verify_password_pooled
+from datetime import datetime, timedelta, timezone
+import uuid
+
+class InvalidRefreshToken(Exception):
+    pass
 
 class AuthService:
     @staticmethod
-    def create_user(db: Session, user: UserCreate):
+    async def create_user(db: AsyncSession, user: UserCreate):
         # Check if user exists
-        existing_user = db.query(User).filter(
-            (User.username == user.username) | 
-            (User.phone_number == user.phone_number)
-        ).first()
+        existing_user = await db.scalar(
+            select(User).where(
+                (User.username == user.username) | 
+                (User.phone_number == user.phone_number)
+            )
+        )
         
         if existing_user:
             raise ValueError("Username or phone number already exists")
@@ -21,29 +33,115 @@ class AuthService:
         db_user = User(
             username=user.username,
             phone_number=user.phone_number,
-            hashed_password=get_password_hash(user.password),
+            hashed_password=await get_password_hash_pooled(user.password),
             national_id=user.national_id
         )
         
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         return db_user
     
     @staticmethod
-    def authenticate_user(db: Session, phone_number: str, password: str):
-        user = db.query(User).filter(User.phone_number == phone_number).first()
+    async def authenticate_user(db: AsyncSession, phone_number: str, password: str):
+        user = await db.scalar(select(User).where(User.phone_number == phone_number))
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_pooled(password, user.hashed_password):
             return None
         return user
     
     @staticmethod
-    def create_user_token(user: User):
-        access_token_expires = timedelta(minutes=30)
+    async def create_user_token(db: AsyncSession, user_id: int, family_id: str = None):
+        # Access token plus a refresh token; a new family per login, the
+        # same family when rotating
+        now = datetime.now(timezone.utc)
         access_token = create_access_token(
-            data={"sub": str(user.id)},
-            expires_delta=access_token_expires
+            data={"sub": str(user_id)},
+            expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        refresh_token = create_refresh_token()
+
+        if family_id is None:
+            family_id = uuid.uuid4().hex
+            # Logging in is a good moment to forget this user's dead tokens
+            await db.execute(
+                delete(RefreshToken).where(
+                    RefreshToken.user_id == user_id,
+                    RefreshToken.expires_at < now
+                ).execution_options(synchronize_session=False)
+            )
+        await db.execute(insert(RefreshToken).values(
+            token_hash=hash_refresh_token(refresh_token),
+            family_id=family_id,
+            user_id=user_id,
+            expires_at=now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        ))
+        await db.commit()
+
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            "refresh_token": refresh_token,
+        }
+
+    @staticmethod
+    async def refresh(db: AsyncSession, refresh_token: str):
+        # Rotate: one UPDATE claims the token if it is live and its user
+        # active, so a token can be exchanged once, even under races
+        token_hash = hash_refresh_token(refresh_token)
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            update(RefreshToken).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+                RefreshToken.user_id.in_(select(User.id).where(User.is_active.is_(True)))
+            ).values(
+                used_at=now
+            ).returning(
+                RefreshToken.user_id, RefreshToken.family_id
+            ).execution_options(synchronize_session=False)
+        )
+        claimed = result.first()
+        if claimed is not None:
+            return await AuthService.create_user_token(db, claimed.user_id, claimed.family_id)
+
+        # Not exchangeable. A token that was rotated a while ago coming back
+        # means someone else holds a copy: end the whole session. A reuse
+        # right after the rotation is just turned away, as tabs sharing the
+        # token refresh together when their access tokens expire.
+        family_id = await db.scalar(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.used_at < now - timedelta(seconds=REFRESH_REUSE_GRACE_SECONDS)
+            )
+        )
+        if family_id is not None:
+            await AuthService.revoke_family(db, family_id)
+        raise InvalidRefreshToken()
+
+    @staticmethod
+    async def revoke(db: AsyncSession, refresh_token: str):
+        # Logout: revoke the session the token belongs to
+        family_id = await db.scalar(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == hash_refresh_token(refresh_token)
+            )
+        )
+        if family_id is not None:
+            await AuthService.revoke_family(db, family_id)
+
+    @staticmethod
+    async def revoke_family(db: AsyncSession, family_id: str):
+        await db.execute(
+            update(RefreshToken).where(
+                RefreshToken.family_id == family_id,
+                RefreshToken.revoked_at.is_(None)
+            ).values(
+                revoked_at=datetime.now(timezone.utc)
+            ).execution_options(synchronize_session=False)
         )
-        return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+        await db.commit()
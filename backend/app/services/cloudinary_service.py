@@ -45,10 +45,26 @@ class CloudinaryService:
             raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
     
     @staticmethod
-    def delete_media(public_id: str):
-        try:
-            result = cloudinary.uploader.destroy(public_id)
-            return result.get("result") == "ok"
-        except Exception as e:
-            print(f"Error deleting media: {e}")
-            return False
\ No newline at end of file
+    def upload_path(path: str, resource_type: str, folder: str = "community_posts"):
+        # Upload an already spooled file; errors propagate so callers can retry
+        upload_result = cloudinary.uploader.upload(
+            path,
+            resource_type=resource_type,
+            folder=folder
+        )
+        return {
+            "url": upload_result["secure_url"],
+            "public_id": upload_result["public_id"],
+            "resource_type": resource_type
+        }
+    
+    @staticmethod
+    def delete_media(public_id: str, resource_type: str = "image") -> bool:
+        # Delete a stored file; errors propagate so callers can retry.
+        # False when it was already gone.
+        result = cloudinary.uploader.destroy(public_id, resource_type=resource_type).get("result")
+        if result == "not found":
+            return False
+        if result != "ok":
+            raise RuntimeError(f"Cloudinary could not delete {public_id}: {result}")
+        return True
@@ -0,0 +1,246 @@
+# backend/app/services/data_transfer_service.py
+import asyncio
+import csv
+import io
+import json
+import os
+from datetime import datetime, timezone
+from sqlalchemy import select, insert, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.post import Post
+from models.ranking import Ranking
+from schemas.data_transfer import DataTable, DataFormat
+from schemas.post import MediaType
+from services.ranking_service import RankingService, RANK_VALUES
+from services.user_stats_service import UserStatsService
+from utils.http_cache import render_json
+from utils import geo
+
+# Rows per fetch from the export's server-side cursor, and rows per COPY
+# or executemany batch on import
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 5000))
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 5000))
+
+_TABLES = {
+    DataTable.POSTS: Post.__table__,
+    DataTable.RANKINGS: Ranking.__table__,
+}
+
+# Exported columns in file order; posts come with their aggregates
+EXPORT_COLUMNS = {
+    DataTable.POSTS: (
+        Post.id, Post.user_id, Post.text, Post.media_url, Post.media_type,
+        Post.latitude, Post.longitude, Post.is_hidden, Post.created_at, Post.updated_at,
+        Post.total_rankings, Post.average_rank,
+        Post.rank_1_count, Post.rank_2_count, Post.rank_3_count,
+    ),
+    DataTable.RANKINGS: (
+        Ranking.id, Ranking.user_id, Ranking.post_id, Ranking.rank_value, Ranking.ranked_at,
+    ),
+}
+
+class ImportConflict(Exception):
+    pass
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    lowered = str(value).strip().lower()
+    if lowered in ("1", "true", "t", "yes"):
+        return True
+    if lowered in ("0", "false", "f", "no"):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+def _parse_datetime(value) -> datetime:
+    parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def _parse_media_type(value) -> str:
+    # The same values the API accepts
+    return MediaType(str(value)).value
+
+# Imported columns as (name, parser, required). Post ids are kept so the
+# rankings file can refer to them; ranking ids and all aggregates are not
+# imported but assigned and recounted by the database.
+IMPORT_COLUMNS = {
+    DataTable.POSTS: (
+        ("id", int, True),
+        ("user_id", int, True),
+        ("text", str, True),
+        ("media_url", str, False),
+        ("media_type", _parse_media_type, False),
+        ("latitude", float, False),
+        ("longitude", float, False),
+        ("is_hidden", _parse_bool, False),
+        ("created_at", _parse_datetime, False),
+    ),
+    DataTable.RANKINGS: (
+        ("user_id", int, True),
+        ("post_id", int, True),
+        ("rank_value", int, True),
+        ("ranked_at", _parse_datetime, False),
+    ),
+}
+
+def _prepare_row(table: DataTable, record, number: int, now: datetime) -> dict:
+    # One file record as a complete row; every row of a table gets the same
+    # keys so a batch can go out as one COPY
+    if not isinstance(record, dict):
+        raise ValueError(f"Record {number}: expected an object")
+    row = {}
+    for name, parse, required in IMPORT_COLUMNS[table]:
+        value = record.get(name)
+        if value is None or value == "":
+            if required:
+                raise ValueError(f"Record {number}: {name} is required")
+            row[name] = None
+            continue
+        try:
+            row[name] = parse(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Record {number}: invalid {name} {value!r}")
+
+    if table == DataTable.POSTS:
+        if (row["latitude"] is None) != (row["longitude"] is None):
+            raise ValueError(f"Record {number}: give both latitude and longitude or neither")
+        # The bounds post creation enforces
+        if row["latitude"] is not None and not (
+            -90 <= row["latitude"] <= 90 and -180 <= row["longitude"] <= 180
+        ):
+            raise ValueError(f"Record {number}: latitude or longitude out of range")
+        row["geohash"] = (
+            geo.encode(row["latitude"], row["longitude"]) if row["latitude"] is not None else None
+        )
+        if row["media_url"] and not row["media_type"]:
+            raise ValueError(f"Record {number}: media_url needs a media_type")
+        # A media type without a URL is an upload that never finished
+        if row["media_type"]:
+            row["media_status"] = "ready" if row["media_url"] else "failed"
+        else:
+            row["media_status"] = None
+        row["is_hidden"] = bool(row["is_hidden"])
+        row["created_at"] = row["created_at"] or now
+    else:
+        if row["rank_value"] not in RANK_VALUES:
+            raise ValueError(f"Record {number}: rank_value must be 1, 2 or 3")
+        row["ranked_at"] = row["ranked_at"] or now
+    return row
+
+def _read_records(lines, data_format: DataFormat):
+    if data_format == DataFormat.CSV:
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+def _next_batch(table: DataTable, records, size: int, now: datetime):
+    # Parses up to `size` records; run in a thread, files can be large
+    batch = []
+    for number, record in records:
+        batch.append(_prepare_row(table, record, number, now))
+        if len(batch) == size:
+            break
+    return batch
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_export_value(value) for value in row])
+    return buffer.getvalue().encode()
+
+def _ndjson_chunk(keys, rows) -> bytes:
+    return b"".join(render_json(dict(zip(keys, row))) + b"\n" for row in rows)
+
+class DataTransferService:
+    @staticmethod
+    async def export_rows(session_factory, table: DataTable, data_format: DataFormat):
+        # Yields the table as encoded chunks, one per cursor fetch. The
+        # session is opened here rather than taken from the request, since
+        # the body is still streaming after the handler has returned.
+        columns = EXPORT_COLUMNS[table]
+        keys = [column.key for column in columns]
+        if data_format == DataFormat.CSV:
+            yield _csv_chunk([keys])
+
+        async with session_factory() as db:
+            # Server-side cursor: only one batch of rows is held at a time
+            result = await db.stream(
+                select(*columns).order_by(columns[0]).execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            async for rows in result.partitions():
+                if data_format == DataFormat.CSV:
+                    yield _csv_chunk(rows)
+                else:
+                    yield _ndjson_chunk(keys, rows)
+
+    @staticmethod
+    async def import_rows(db: AsyncSession, table: DataTable, data_format: DataFormat, lines) -> int:
+        # Loads a whole file in one transaction, COPY on PostgreSQL and
+        # batched executemany elsewhere, then recounts post aggregates and
+        # user stats in set-based passes. Raises ValueError for a bad
+        # record and ImportConflict for rows the constraints reject.
+        postgres = db.bind.dialect.name == "postgresql"
+        records = enumerate(_read_records(lines, data_format), start=1)
+        now = datetime.now(timezone.utc)
+        imported = 0
+
+        if postgres:
+            # The driver opens its transaction on the first statement; COPY
+            # on the raw connection has to run inside it
+            await db.execute(text("SELECT 1"))
+
+        try:
+            while True:
+                batch = await asyncio.to_thread(_next_batch, table, records, IMPORT_BATCH_SIZE, now)
+                if not batch:
+                    break
+                if postgres:
+                    await DataTransferService._copy(db, table, batch)
+                else:
+                    await db.execute(insert(_TABLES[table]), batch)
+                imported += len(batch)
+        except IntegrityError as e:
+            raise ImportConflict(str(e.orig))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON line: {e}")
+        except UnicodeDecodeError:
+            raise ValueError("File is not UTF-8")
+
+        if postgres and table == DataTable.POSTS:
+            # COPY with explicit ids leaves the id sequence behind
+            await db.execute(text(
+                "SELECT setval(pg_get_serial_sequence('posts', 'id'), "
+                "(SELECT coalesce(max(id), 1) FROM posts))"
+            ))
+
+        # The rows, post aggregates and user stats commit together
+        await RankingService.rebuild_post_aggregates(db)
+        await UserStatsService.rebuild(db)
+        await db.commit()
+        return imported
+
+    @staticmethod
+    async def _copy(db: AsyncSession, table: DataTable, batch):
+        columns = list(batch[0])
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        try:
+            await raw.driver_connection.copy_records_to_table(
+                _TABLES[table].name,
+                records=[tuple(row[column] for column in columns) for row in batch],
+                columns=columns,
+            )
+        except Exception as e:
+            # asyncpg errors bypass SQLAlchemy; class 23 is integrity violations
+            if str(getattr(e, "sqlstate", "")).startswith("23"):
+                raise ImportConflict(str(e))
+            raise
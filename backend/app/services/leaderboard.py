@@ -0,0 +1,273 @@
+# backend/app/services/leaderboard.py
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from prometheus_client import Gauge, Histogram
+from sqlalchemy import select, delete, insert, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import SessionLocal, upsert_insert
+from models.post import Post
+from models.post_urgency import PostUrgency
+from models.ranking import Ranking
+from schemas.post import LeaderboardPeriod
+from services.post_service import post_listing_query, post_row_to_dict
+from utils.http_cache import response_cache, LEADERBOARD_SCOPE
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_RECOMPUTE_INTERVAL = float(os.getenv("LEADERBOARD_RECOMPUTE_INTERVAL", 300))
+_STREAM_BATCH_SIZE = 10000
+# Votes this close to a recompute's start may have committed after its
+# snapshot was read; ranked_at is their transaction's start time
+_MISSED_VOTE_SLACK = timedelta(minutes=1)
+
+LEADERBOARD_RECOMPUTE_SECONDS = Histogram(
+    "leaderboard_recompute_seconds", "Time taken by a full urgency score recompute"
+)
+LEADERBOARD_SCORED_POSTS = Gauge(
+    "leaderboard_scored_posts", "Posts with an urgency score, per period", ["period"]
+)
+
+# period -> (how far back votes count, half-life of a vote's weight).
+# A vote adds rank_value * 2^(-age / half_life), so the score grows with
+# the number of votes and their urgency and fades as they age.
+PERIODS = {
+    LeaderboardPeriod.DAY: (timedelta(hours=24), timedelta(hours=6)),
+    LeaderboardPeriod.WEEK: (timedelta(days=7), timedelta(days=2)),
+    LeaderboardPeriod.ALL_TIME: (None, timedelta(days=30)),
+}
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def compute_scores(post_ids, rank_values, ages, window, half_life):
+    """Decayed urgency per post from parallel arrays of votes.
+
+    ages and the window/half-life are in seconds; window None means
+    every vote counts. Returns (post_ids, scores, vote_counts) arrays.
+    """
+    ages = np.maximum(ages, 0.0)
+    if window is not None:
+        mask = ages <= window
+        post_ids, rank_values, ages = post_ids[mask], rank_values[mask], ages[mask]
+    if post_ids.size == 0:
+        return post_ids, np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    unique_ids, slots = np.unique(post_ids, return_inverse=True)
+    weights = rank_values * np.exp2(-ages / half_life)
+    scores = np.bincount(slots, weights=weights, minlength=unique_ids.size)
+    counts = np.bincount(slots, minlength=unique_ids.size)
+    return unique_ids, scores, counts
+
+def _weight(at: datetime, reference_at: datetime, half_life: timedelta) -> float:
+    # A vote's weight at `at`, expressed at the reference time
+    return 2.0 ** ((at - reference_at) / half_life)
+
+class Leaderboard:
+    # Keeps post_urgency current: a periodic full recompute over all
+    # votes, plus a cheap upsert per vote in between. Each row's score is
+    # relative to its own computed_at, which a nudge reads back rather
+    # than keeping in memory, so workers recomputing at different times
+    # still add comparable weights.
+    def __init__(self, session_factory=SessionLocal, interval: float = LEADERBOARD_RECOMPUTE_INTERVAL):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stopped = False
+        self._task = None
+
+    def start(self):
+        # Must be called from the running event loop (app startup)
+        if self._task is None:
+            self._stopped = False
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def recompute(self):
+        started = time.perf_counter()
+        reference_at = datetime.now(timezone.utc)
+
+        async with self.session_factory() as db:
+            post_ids, rank_values, ages = [], [], []
+            result = await db.stream(
+                select(Ranking.post_id, Ranking.rank_value, Ranking.ranked_at).execution_options(
+                    yield_per=_STREAM_BATCH_SIZE
+                )
+            )
+            async for rows in result.partitions():
+                post_ids.append(np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)))
+                rank_values.append(np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows)))
+                ages.append(np.fromiter(
+                    ((reference_at - _utc(row[2])).total_seconds() for row in rows),
+                    dtype=np.float64, count=len(rows)
+                ))
+
+            if post_ids:
+                votes = (np.concatenate(post_ids), np.concatenate(rank_values), np.concatenate(ages))
+            else:
+                votes = (np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0))
+            rows_by_period = await asyncio.to_thread(self._score_rows, votes, reference_at)
+
+            # Overwrite in place rather than delete-then-insert, so a vote
+            # nudging a row meanwhile can't collide with the rewrite
+            make_insert = upsert_insert(db)
+            if make_insert is None:
+                await db.execute(delete(PostUrgency))
+                stmt = insert(PostUrgency)
+            else:
+                stmt = make_insert(PostUrgency)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[PostUrgency.post_id, PostUrgency.period],
+                    set_={
+                        "score": stmt.excluded.score,
+                        "vote_count": stmt.excluded.vote_count,
+                        "computed_at": stmt.excluded.computed_at,
+                    }
+                )
+            for period, rows in rows_by_period.items():
+                if rows:
+                    await db.execute(stmt, rows)
+                LEADERBOARD_SCORED_POSTS.labels(period=period).set(len(rows))
+            # Rows not rewritten have no votes left in their window, unless a
+            # vote the snapshot above missed nudged them in meanwhile (a new
+            # post's first vote, say); those stay until the next run. Any
+            # vote that recent lies in every window, so a row that truly
+            # has none is never spared.
+            missed_votes = select(Ranking.id).where(
+                Ranking.post_id == PostUrgency.post_id,
+                Ranking.ranked_at >= reference_at - _MISSED_VOTE_SLACK
+            ).exists()
+            await db.execute(delete(PostUrgency).where(
+                PostUrgency.computed_at < reference_at, ~missed_votes
+            ))
+            await db.commit()
+
+        response_cache.invalidate(LEADERBOARD_SCOPE)
+        LEADERBOARD_RECOMPUTE_SECONDS.observe(time.perf_counter() - started)
+
+    @staticmethod
+    def _score_rows(votes, reference_at: datetime):
+        post_ids, rank_values, ages = votes
+        rows_by_period = {}
+        for period, (window, half_life) in PERIODS.items():
+            ids, scores, counts = compute_scores(
+                post_ids, rank_values, ages,
+                window.total_seconds() if window is not None else None,
+                half_life.total_seconds()
+            )
+            rows_by_period[period.value] = [
+                {
+                    "post_id": int(post_id),
+                    "period": period.value,
+                    "score": float(score),
+                    "vote_count": int(count),
+                    "computed_at": reference_at,
+                }
+                for post_id, score, count in zip(ids, scores, counts)
+            ]
+        return rows_by_period
+
+    async def nudge(self, db: AsyncSession, votes):
+        """Apply votes to the stored scores inside the caller's transaction.
+
+        votes is a list of (post_id, rank_value, previous) where previous
+        is the (rank_value, ranked_at) of the vote being replaced, or None.
+        Drift from decay and from votes leaving a window is corrected by
+        the next recompute.
+        """
+        make_insert = upsert_insert(db)
+        if make_insert is None or not votes:
+            return
+
+        # The reference time of each row touched, locked so a recompute
+        # can't rebase it between this read and the upsert below. Rows
+        # not there yet start out at now.
+        now = datetime.now(timezone.utc)
+        keys = sorted({(post_id, period.value) for post_id, _, _ in votes for period in PERIODS})
+        result = await db.execute(
+            select(PostUrgency.post_id, PostUrgency.period, PostUrgency.computed_at).where(
+                tuple_(PostUrgency.post_id, PostUrgency.period).in_(keys)
+            ).with_for_update()
+        )
+        references = {(post_id, period): _utc(at) for post_id, period, at in result.all()}
+
+        changes = defaultdict(lambda: [0.0, 0])
+        for post_id, rank_value, previous in votes:
+            for period, (window, half_life) in PERIODS.items():
+                key = (post_id, period.value)
+                reference_at = references.setdefault(key, now)
+                change = changes[key]
+                change[0] += rank_value * _weight(now, reference_at, half_life)
+                change[1] += 1
+                if previous is not None:
+                    old_value, old_at = previous
+                    old_at = _utc(old_at)
+                    if window is None or now - old_at <= window:
+                        change[0] -= old_value * _weight(old_at, reference_at, half_life)
+                        change[1] -= 1
+
+        # One statement; keys are unique, so ON CONFLICT sees each row once
+        stmt = make_insert(PostUrgency).values([
+            {
+                "post_id": post_id,
+                "period": period,
+                "score": score,
+                "vote_count": count,
+                "computed_at": references[(post_id, period)],
+            }
+            for (post_id, period), (score, count) in sorted(changes.items())
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PostUrgency.post_id, PostUrgency.period],
+            set_={
+                "score": PostUrgency.score + stmt.excluded.score,
+                "vote_count": PostUrgency.vote_count + stmt.excluded.vote_count,
+            }
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    async def top(db: AsyncSession, period: LeaderboardPeriod, limit: int):
+        # (post dict, current score, votes in period), most urgent first
+        result = await db.execute(
+            post_listing_query(
+                PostUrgency.score, PostUrgency.vote_count, PostUrgency.computed_at
+            ).join(PostUrgency, PostUrgency.post_id == Post.id).where(
+                PostUrgency.period == period.value
+            ).order_by(PostUrgency.score.desc()).limit(limit)
+        )
+
+        _, half_life = PERIODS[period]
+        now = datetime.now(timezone.utc)
+        entries = []
+        for row in result.all():
+            score, vote_count, computed_at = row[-3:]
+            # Bring the stored score forward to now
+            current = score * 2.0 ** (-((now - _utc(computed_at)) / half_life))
+            entries.append((post_row_to_dict(row), current, vote_count))
+        return entries
+
+    async def _run(self):
+        while not self._stopped:
+            try:
+                await self.recompute()
+            except Exception:
+                logger.exception("Leaderboard recompute failed")
+            await asyncio.sleep(self.interval)
+
+leaderboard = Leaderboard()
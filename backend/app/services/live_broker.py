@@ -0,0 +1,92 @@
+# backend/app/services/live_broker.py
+import asyncio
+import json
+import os
+from typing import Iterable
+from prometheus_client import Counter, Gauge
+
+# Updates to one post within this window reach a subscriber as one event
+LIVE_COALESCE_SECONDS = float(os.getenv("LIVE_COALESCE_SECONDS", 0.5))
+LIVE_HEARTBEAT_SECONDS = float(os.getenv("LIVE_HEARTBEAT_SECONDS", 15))
+
+LIVE_SUBSCRIBERS = Gauge("live_subscribers", "Open live update streams")
+LIVE_PUBLISHED = Counter("live_events_published_total", "Post updates published to the broker")
+LIVE_FANOUT = Counter("live_events_fanout_total", "Post updates queued for a subscriber")
+LIVE_COALESCED = Counter(
+    "live_events_coalesced_total", "Queued updates replaced by a newer one for the same post"
+)
+LIVE_DELIVERED = Counter("live_events_delivered_total", "Events written to subscriber streams")
+
+class Subscription:
+    # One stream's interest in a set of posts. Only the latest update
+    # per post is kept, so a slow client never builds up a backlog.
+    def __init__(self, post_ids: Iterable[int]):
+        self.post_ids = frozenset(post_ids)
+        self._pending = {}
+        self._ready = asyncio.Event()
+
+    def offer(self, post_id: int, event: str, data: dict):
+        if post_id in self._pending:
+            LIVE_COALESCED.inc()
+        self._pending[post_id] = (event, data)
+        self._ready.set()
+
+    async def next_events(self, timeout: float):
+        # Pending (event, data) pairs, or [] if nothing arrived in time
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        # Let a burst of votes on the same post collapse into one event
+        await asyncio.sleep(LIVE_COALESCE_SECONDS)
+        events = list(self._pending.values())
+        self._pending.clear()
+        self._ready.clear()
+        return events
+
+class LiveBroker:
+    # In-process pub/sub of post updates to live streams. Publishers call
+    # it after their transaction commits; each worker process has its
+    # own broker and sees only the writes it made.
+    def __init__(self):
+        self._by_post = {}
+
+    def subscribe(self, post_ids: Iterable[int]) -> Subscription:
+        subscription = Subscription(post_ids)
+        for post_id in subscription.post_ids:
+            self._by_post.setdefault(post_id, set()).add(subscription)
+        LIVE_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for post_id in subscription.post_ids:
+            subscribers = self._by_post.get(post_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_post[post_id]
+        LIVE_SUBSCRIBERS.dec()
+
+    def publish(self, post_id: int, event: str, data: dict):
+        LIVE_PUBLISHED.inc()
+        subscribers = self._by_post.get(post_id)
+        if not subscribers:
+            return
+        LIVE_FANOUT.inc(len(subscribers))
+        for subscription in subscribers:
+            subscription.offer(post_id, event, data)
+
+    def publish_stats(self, post_id: int, stats: dict):
+        self.publish(post_id, "stats", {"post_id": post_id, **stats})
+
+    def publish_updated(self, post_id: int, text: str):
+        self.publish(post_id, "updated", {"post_id": post_id, "text": text})
+
+    def publish_deleted(self, post_id: int):
+        self.publish(post_id, "deleted", {"post_id": post_id})
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+live_broker = LiveBroker()
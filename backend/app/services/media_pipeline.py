@@ -0,0 +1,327 @@
+# backend/app/services/media_pipeline.py
+import asyncio
+import glob
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import uuid
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from database import SessionLocal
+from models.post import Post
+from services.storage import storage
+from utils.http_cache import response_cache, FEED_SCOPE, post_scope
+from concurrent.futures import ThreadPoolExecutor
+from services.media_service import MediaService
+from services.media_variants import (
+    variants_supported, render_variants, variant_keys, thumbnail_url, public_variants
+)
+
+logger = logging.getLogger(__name__)
+
+MEDIA_SPOOL_DIR = os.getenv(
+    "MEDIA_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "community_help_uploads")
+)
+MEDIA_UPLOAD_WORKERS = int(os.getenv("MEDIA_UPLOAD_WORKERS", 4))
+MEDIA_UPLOAD_RETRIES = int(os.getenv("MEDIA_UPLOAD_RETRIES", 3))
+MEDIA_UPLOAD_RETRY_DELAY = float(os.getenv("MEDIA_UPLOAD_RETRY_DELAY", 2.0))
+# Threads resizing images; kept apart from the request threadpool
+MEDIA_VARIANT_WORKERS = int(os.getenv("MEDIA_VARIANT_WORKERS", 2))
+
+MEDIA_PENDING = "pending"
+MEDIA_READY = "ready"
+MEDIA_FAILED = "failed"
+
+def media_resource_type(file: UploadFile) -> str:
+    content_type = file.content_type or ""
+    if content_type.startswith('image/'):
+        return 'image'
+    if content_type.startswith('video/'):
+        return 'video'
+    raise HTTPException(status_code=400, detail="Invalid file type")
+
+def _safe_extension(filename: str) -> str:
+    extension = os.path.splitext(filename or "")[1].lower()
+    return extension if re.fullmatch(r"\.[a-z0-9]{1,5}", extension) else ""
+
+async def spool_upload(file: UploadFile):
+    # Copy the request body to local disk so the request can finish
+    # without waiting for the storage backend, hashing it on the way
+    os.makedirs(MEDIA_SPOOL_DIR, exist_ok=True)
+    path = os.path.join(
+        MEDIA_SPOOL_DIR, f"upload-{uuid.uuid4().hex}{_safe_extension(file.filename)}"
+    )
+
+    def copy():
+        digest = hashlib.sha256()
+        with open(path, "wb") as destination:
+            while True:
+                chunk = file.file.read(1024 * 1024)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                destination.write(chunk)
+        return digest.hexdigest()
+
+    content_hash = await run_in_threadpool(copy)
+    return path, content_hash
+
+def discard_spool(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _spool_path_for_post(post_id: int, extension: str) -> str:
+    # Spool files are renamed after their post so pending uploads can be
+    # found again after a restart, and tagged with the process handling them
+    return os.path.join(MEDIA_SPOOL_DIR, f"post-{post_id}.claimed-{os.getpid()}{extension}")
+
+_CLAIM_TAG = re.compile(r"\.claimed-(\d+)")
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill(pid, 0) would send CTRL_C_EVENT there; the API runs as a
+        # single process on Windows, so another pid's claim is left over
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _claim_spool(post_id: int):
+    # Renames the post's spool file to one tagged with this process. Rename
+    # is atomic, so when several workers resume at once each file goes to
+    # exactly one of them. Returns (path, busy); busy means another live
+    # process holds the file.
+    busy = False
+    candidates = glob.glob(os.path.join(MEDIA_SPOOL_DIR, f"post-{post_id}.*")) + \
+        glob.glob(os.path.join(MEDIA_SPOOL_DIR, f"post-{post_id}"))
+    for candidate in candidates:
+        name = os.path.basename(candidate)
+        claim = _CLAIM_TAG.search(name)
+        if claim:
+            if _process_alive(int(claim.group(1))):
+                busy = True
+                continue
+            extension = name[claim.end():]
+        else:
+            extension = os.path.splitext(name)[1]
+        path = _spool_path_for_post(post_id, extension)
+        try:
+            os.rename(candidate, path)
+        except FileNotFoundError:
+            # Another worker claimed it first
+            busy = True
+            continue
+        return path, False
+    return None, busy
+
+class MediaPipeline:
+    def __init__(self, storage_backend=storage, session_factory=SessionLocal,
+                 workers: int = MEDIA_UPLOAD_WORKERS, retries: int = MEDIA_UPLOAD_RETRIES,
+                 retry_delay: float = MEDIA_UPLOAD_RETRY_DELAY):
+        self.storage = storage_backend
+        self.session_factory = session_factory
+        self.workers = workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._queue = None
+        self._tasks = []
+        # Stored files of deleted posts, removed off the request path
+        self._cleanup_queue = None
+        self._cleanup_task = None
+        self._variant_executor = ThreadPoolExecutor(
+            max_workers=MEDIA_VARIANT_WORKERS, thread_name_prefix="media-variants"
+        )
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._cleanup_queue = asyncio.Queue()
+        self._cleanup_task = asyncio.create_task(self._cleanup_worker())
+        await self._resume_pending()
+
+    async def close(self):
+        # Let queued uploads finish, then stop the workers
+        if self._queue is not None:
+            await self._queue.join()
+        if self._cleanup_queue is not None:
+            await self._cleanup_queue.join()
+        tasks = self._tasks + ([self._cleanup_task] if self._cleanup_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._cleanup_task = None
+        self._variant_executor.shutdown(wait=True)
+
+    def submit(self, post_id: int, spool_path: str, resource_type: str, content_hash: str):
+        path = _spool_path_for_post(post_id, os.path.splitext(spool_path)[1])
+        os.replace(spool_path, path)
+        self._queue.put_nowait((post_id, path, resource_type, content_hash))
+
+    def discard(self, files):
+        # Queue [(storage_key, resource_type)] for deletion from storage;
+        # callers pass what MediaService.release* returned, after commit
+        for key, resource_type in files:
+            self._cleanup_queue.put_nowait((key, resource_type))
+
+    async def _resume_pending(self):
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(Post.id, Post.media_type, Post.media_hash).where(
+                    Post.media_status == MEDIA_PENDING
+                )
+            )
+            pending = result.all()
+
+        for post_id, resource_type, content_hash in pending:
+            path, busy = _claim_spool(post_id)
+            if path:
+                self._queue.put_nowait((post_id, path, resource_type, content_hash))
+            elif not busy:
+                logger.warning("Spooled media for post %s is gone, marking failed", post_id)
+                await self._mark_failed(post_id)
+
+    async def _worker(self):
+        while True:
+            post_id, path, resource_type, content_hash = await self._queue.get()
+            try:
+                await self._process(post_id, path, resource_type, content_hash)
+            except Exception:
+                logger.exception("Media upload for post %s crashed", post_id)
+            finally:
+                self._queue.task_done()
+
+    async def _cleanup_worker(self):
+        while True:
+            key, resource_type = await self._cleanup_queue.get()
+            try:
+                for attempt in range(self.retries):
+                    try:
+                        await run_in_threadpool(self.storage.delete, key, resource_type)
+                        break
+                    except Exception:
+                        logger.warning(
+                            "Deleting stored media %s failed (attempt %d/%d)",
+                            key, attempt + 1, self.retries, exc_info=True
+                        )
+                        if attempt + 1 < self.retries:
+                            await asyncio.sleep(self.retry_delay * 2 ** attempt)
+                else:
+                    logger.error("Giving up on deleting stored media %s", key)
+            finally:
+                self._cleanup_queue.task_done()
+
+    async def _process(self, post_id: int, path: str, resource_type: str, content_hash: str):
+        try:
+            # The same bytes may have been stored since this job was queued
+            if await self._attach(post_id, content_hash, resource_type):
+                return
+
+            for attempt in range(self.retries):
+                try:
+                    stored = await run_in_threadpool(self.storage.save, path, resource_type)
+                    break
+                except Exception:
+                    logger.warning(
+                        "Media upload for post %s failed (attempt %d/%d)",
+                        post_id, attempt + 1, self.retries, exc_info=True
+                    )
+                    if attempt + 1 < self.retries:
+                        await asyncio.sleep(self.retry_delay * 2 ** attempt)
+            else:
+                await self._mark_failed(post_id)
+                return
+
+            variants = await self._store_variants(post_id, path, resource_type)
+            await self._attach(post_id, content_hash, resource_type, stored, variants)
+        finally:
+            discard_spool(path)
+
+    async def _store_variants(self, post_id: int, path: str, resource_type: str) -> dict:
+        # Resized WebP/JPEG copies of images; best effort, the post still
+        # shows the original if this fails
+        if not variants_supported(resource_type):
+            return {}
+
+        loop = asyncio.get_running_loop()
+        variants = {}
+        rendered = []
+        try:
+            rendered = await loop.run_in_executor(self._variant_executor, render_variants, path)
+            for width, format_name, variant_path in rendered:
+                stored = await run_in_threadpool(self.storage.save, variant_path, "image")
+                variants.setdefault(str(width), {})[format_name] = stored
+        except Exception:
+            logger.warning("Could not create image variants for post %s", post_id, exc_info=True)
+            self.discard([(key, "image") for key in variant_keys(variants)])
+            variants = {}
+        finally:
+            for _, _, variant_path in rendered:
+                discard_spool(variant_path)
+        return variants
+
+    async def _attach(self, post_id: int, content_hash: str, resource_type: str,
+                      stored: dict = None, variants: dict = None) -> bool:
+        # Point the post at the asset for content_hash, taking a reference.
+        # Without `stored` this only succeeds if the asset already exists.
+        unused_keys = []
+        async with self.session_factory() as db:
+            if stored is None:
+                asset = await MediaService.acquire(db, content_hash)
+                if asset is None:
+                    return False
+            else:
+                asset, kept = await MediaService.register(
+                    db, content_hash, stored, resource_type, variants
+                )
+                if not kept:
+                    # A parallel upload of the same bytes got there first
+                    unused_keys.append((stored["key"], resource_type))
+                    unused_keys += [(key, "image") for key in variant_keys(variants)]
+
+            # Only a pending post takes the asset; another worker may have
+            # finished or failed it already
+            result = await db.execute(
+                update(Post).where(
+                    Post.id == post_id, Post.media_status == MEDIA_PENDING
+                ).values(
+                    media_url=asset.url,
+                    media_type=asset.resource_type,
+                    media_status=MEDIA_READY,
+                    thumbnail_url=thumbnail_url(asset.variants),
+                    media_variants=public_variants(asset.variants)
+                ).execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                # Post was deleted or settled while uploading; give back
+                # the reference taken above
+                unused_keys += await MediaService.release(db, content_hash)
+            await db.commit()
+        response_cache.invalidate(FEED_SCOPE, post_scope(post_id))
+        self.discard(unused_keys)
+        return True
+
+    async def _mark_failed(self, post_id: int):
+        async with self.session_factory() as db:
+            await db.execute(
+                update(Post).where(
+                    Post.id == post_id, Post.media_status == MEDIA_PENDING
+                ).values(
+                    media_status=MEDIA_FAILED
+                ).execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        response_cache.invalidate(FEED_SCOPE, post_scope(post_id))
+
+media_pipeline = MediaPipeline()
@@ -0,0 +1,92 @@
+# backend/app/services/media_service.py
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, case
+from sqlalchemy.exc import IntegrityError
+from models.media_asset import MediaAsset
+from services.media_variants import variant_keys
+
+class MediaService:
+    @staticmethod
+    async def acquire(db: AsyncSession, content_hash: str):
+        # Take a reference on an already stored asset; None if the content
+        # has never been uploaded
+        result = await db.execute(
+            update(MediaAsset).where(
+                MediaAsset.content_hash == content_hash
+            ).values(
+                ref_count=MediaAsset.ref_count + 1
+            ).returning(
+                MediaAsset.url, MediaAsset.storage_key, MediaAsset.resource_type,
+                MediaAsset.variants
+            ).execution_options(synchronize_session=False)
+        )
+        return result.first()
+
+    @staticmethod
+    async def register(db: AsyncSession, content_hash: str, stored: dict, resource_type: str,
+                       variants: dict = None):
+        # Record a fresh upload holding one reference. Returns the asset and
+        # whether ours was kept; if another upload of the same bytes won,
+        # the caller should delete its own copy.
+        try:
+            async with db.begin_nested():
+                db.add(MediaAsset(
+                    content_hash=content_hash,
+                    storage_key=stored["key"],
+                    url=stored["url"],
+                    resource_type=resource_type,
+                    variants=variants or None,
+                    ref_count=1
+                ))
+        except IntegrityError:
+            return await MediaService.acquire(db, content_hash), False
+
+        result = await db.execute(
+            select(
+                MediaAsset.url, MediaAsset.storage_key, MediaAsset.resource_type,
+                MediaAsset.variants
+            ).where(MediaAsset.content_hash == content_hash)
+        )
+        return result.first(), True
+
+    @staticmethod
+    async def release(db: AsyncSession, content_hash: str):
+        # Drop one reference. When that was the last one, returns the
+        # [(storage_key, resource_type)] files the caller deletes after commit.
+        return await MediaService.release_many(db, {content_hash: 1})
+
+    @staticmethod
+    async def release_many(db: AsyncSession, counts: dict):
+        # Drop counts[content_hash] references from each asset in one
+        # statement; files of the assets that reached zero are returned
+        if not counts:
+            return []
+        result = await db.execute(
+            update(MediaAsset).where(
+                MediaAsset.content_hash.in_(list(counts))
+            ).values(
+                ref_count=MediaAsset.ref_count - case(counts, value=MediaAsset.content_hash, else_=0)
+            ).returning(
+                MediaAsset.content_hash, MediaAsset.ref_count, MediaAsset.storage_key,
+                MediaAsset.resource_type, MediaAsset.variants
+            ).execution_options(synchronize_session=False)
+        )
+        unused = {row.content_hash: row for row in result.all() if row.ref_count <= 0}
+        if not unused:
+            return []
+
+        # Only delete those nobody re-acquired in the meantime
+        result = await db.execute(
+            delete(MediaAsset).where(
+                MediaAsset.content_hash.in_(list(unused)),
+                MediaAsset.ref_count <= 0
+            ).returning(
+                MediaAsset.content_hash
+            ).execution_options(synchronize_session=False)
+        )
+        files = []
+        for content_hash in result.scalars().all():
+            row = unused[content_hash]
+            files.append((row.storage_key, row.resource_type))
+            files += [(key, "image") for key in variant_keys(row.variants)]
+        return files
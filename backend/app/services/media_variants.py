@@ -0,0 +1,68 @@
+# backend/app/services/media_variants.py
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it posts keep only the original
+    Image = None
+
+# Widths rendered for every image; the smallest one is the feed thumbnail
+VARIANT_WIDTHS = (320, 960)
+THUMBNAIL_WIDTH = VARIANT_WIDTHS[0]
+VARIANT_FORMATS = {
+    "webp": ("WEBP", ".webp"),
+    "jpeg": ("JPEG", ".jpg"),
+}
+VARIANT_QUALITY = int(os.getenv("MEDIA_VARIANT_QUALITY", 80))
+
+def variants_supported(resource_type: str) -> bool:
+    return Image is not None and resource_type == "image"
+
+def render_variants(path: str):
+    # Returns [(width, format_name, temp_path)]; CPU bound, run it in the
+    # variant worker pool. The caller removes the temp files.
+    rendered = []
+    with Image.open(path) as source:
+        image = ImageOps.exif_transpose(source).convert("RGB")
+
+    for width in VARIANT_WIDTHS:
+        resized = image.copy()
+        # Keeps the aspect ratio and never upscales
+        resized.thumbnail((width, width * 4))
+        for format_name, (pil_format, extension) in VARIANT_FORMATS.items():
+            handle, temp_path = tempfile.mkstemp(suffix=extension)
+            os.close(handle)
+            resized.save(temp_path, pil_format, quality=VARIANT_QUALITY)
+            rendered.append((width, format_name, temp_path))
+    return rendered
+
+def public_variants(variants: dict):
+    # Stored form is {width: {format: {"url", "key"}}}; clients only need
+    # {format: {width: url}} to build a srcset
+    if not variants:
+        return None
+    public = {}
+    for width, formats in variants.items():
+        for format_name, stored in formats.items():
+            public.setdefault(format_name, {})[str(width)] = stored["url"]
+    return public
+
+def thumbnail_url(variants: dict):
+    if not variants:
+        return None
+    formats = variants.get(str(THUMBNAIL_WIDTH), {})
+    stored = formats.get("webp") or formats.get("jpeg")
+    return stored["url"] if stored else None
+
+def variant_keys(variants: dict):
+    if not variants:
+        return []
+    return [
+        stored["key"]
+        for formats in variants.values()
+        for stored in formats.values()
+    ]
@@ -0,0 +1,60 @@
+# backend/app/services/moderation_service.py
+from collections import Counter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, update
+from models.post import Post
+from services.media_service import MediaService
+from services.media_pipeline import MEDIA_READY
+from services.user_stats_service import UserStatsService, stat_deltas, record_post_deleted
+
+class ModerationService:
+    # Bulk actions on posts as single set-based statements; nothing is
+    # loaded into the session, and rankings and leaderboard rows go with
+    # their posts through ON DELETE CASCADE
+    @staticmethod
+    def target(post_ids=None, user_id=None):
+        if post_ids is not None:
+            return Post.id.in_(post_ids)
+        return Post.user_id == user_id
+
+    @staticmethod
+    async def delete_posts(db: AsyncSession, condition):
+        # Returns the deleted post ids and the stored files no post uses
+        # any more, for the caller to remove after this commits
+        await UserStatsService.forget_votes_on(db, condition)
+        result = await db.execute(
+            delete(Post).where(condition).returning(
+                Post.id, Post.user_id, Post.media_hash, Post.media_status,
+                Post.rank_1_count, Post.rank_2_count, Post.rank_3_count
+            ).execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+
+        stats = stat_deltas()
+        for row in rows:
+            record_post_deleted(stats, row.user_id, {
+                1: row.rank_1_count or 0, 2: row.rank_2_count or 0, 3: row.rank_3_count or 0
+            })
+        await UserStatsService.apply(db, stats)
+
+        released = Counter(
+            row.media_hash for row in rows
+            if row.media_hash and row.media_status == MEDIA_READY
+        )
+        files = await MediaService.release_many(db, dict(released))
+        await db.commit()
+        return [row.id for row in rows], files
+
+    @staticmethod
+    async def set_hidden(db: AsyncSession, condition, hidden: bool):
+        # Returns the ids of the posts whose visibility changed
+        result = await db.execute(
+            update(Post).where(
+                condition, Post.is_hidden.is_(not hidden)
+            ).values(
+                is_hidden=hidden
+            ).returning(Post.id).execution_options(synchronize_session=False)
+        )
+        post_ids = list(result.scalars().all())
+        await db.commit()
+        return post_ids
@@ -0,0 +1,226 @@
+# backend/app/services/post_service.py
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, tuple_, func, literal_column, table, column, or_
+from typing import Optional
+import re
+from models.post import Post
+from models.user import User
+from schemas.post import PostSort, PriorityLevel, NearbySort
+from utils.pagination import encode_cursor, decode_cursor
+from utils import geo
+
+# Average rank thresholds shared with the priority badges in the frontend
+HIGH_PRIORITY_THRESHOLD = 2.5
+MEDIUM_PRIORITY_THRESHOLD = 1.5
+
+# Sort key per feed order; every key ends in id so the order is total
+# and each one is backed by a matching composite index on posts
+SORT_KEYS = {
+    PostSort.NEWEST: (Post.created_at, Post.id),
+    PostSort.OLDEST: (Post.created_at, Post.id),
+    PostSort.PRIORITY: (Post.average_rank, Post.created_at, Post.id),
+    PostSort.MOST_RANKED: (Post.total_rankings, Post.created_at, Post.id),
+}
+
+# Search backends, see the DDL at the bottom of models/post.py
+_search_vector = literal_column("posts.search_vector")
+_posts_fts = table("posts_fts", column("rowid"), column("rank"))
+
+def _fts5_query(q: str) -> str:
+    # Quote every word so user input can't use FTS5 query syntax; the
+    # last word also matches as a prefix for search-as-you-type
+    words = re.findall(r"\w+", q)
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+# Columns a post listing returns, in PostResponse field order. Listings
+# select these as plain rows and serialize them directly, without
+# loading ORM objects or going through the pydantic model per post.
+POST_LIST_COLUMNS = (
+    Post.text, Post.media_url, Post.media_type, Post.id, Post.media_status,
+    Post.thumbnail_url, Post.media_variants, Post.latitude, Post.longitude,
+    Post.user_id, Post.created_at, Post.updated_at, Post.total_rankings,
+    Post.average_rank, Post.is_hidden, User.username.label("owner_username"),
+)
+
+_POST_LIST_KEYS = tuple(column.key for column in POST_LIST_COLUMNS)
+
+def post_listing_query(*extra_columns, include_hidden: bool = False):
+    # Extra columns come after the post's and are ignored by post_row_to_dict.
+    # Posts hidden by moderators are left out unless include_hidden.
+    query = select(*POST_LIST_COLUMNS, *extra_columns).join(User, Post.user_id == User.id)
+    if not include_hidden:
+        query = query.where(Post.is_hidden.is_(False))
+    return query
+
+def post_row_to_dict(row) -> dict:
+    # PostResponse-shaped dict for one listing row
+    post = dict(zip(_POST_LIST_KEYS, row))
+    post["total_rankings"] = post["total_rankings"] or 0
+    post["average_rank"] = post["average_rank"] or 0.0
+    return post
+
+def _geohash_prefix_match(dialect: str, prefix: str):
+    # Both forms are index range scans: LIKE through varchar_pattern_ops
+    # on PostgreSQL, GLOB through the default binary collation on SQLite
+    if dialect == "sqlite":
+        return Post.geohash.op("GLOB")(prefix + "*")
+    return Post.geohash.like(prefix + "%")
+
+class PostService:
+    @staticmethod
+    async def get_feed(
+        db: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        exclude_user_id: Optional[int] = None,
+        sort: PostSort = PostSort.NEWEST,
+        priority: Optional[PriorityLevel] = None
+    ):
+        # Owner username comes from the same query, no per-row lazy load
+        query = post_listing_query()
+
+        if exclude_user_id is not None:
+            query = query.where(Post.user_id != exclude_user_id)
+
+        if priority == PriorityLevel.HIGH:
+            query = query.where(Post.average_rank >= HIGH_PRIORITY_THRESHOLD)
+        elif priority == PriorityLevel.MEDIUM:
+            query = query.where(
+                Post.average_rank >= MEDIUM_PRIORITY_THRESHOLD,
+                Post.average_rank < HIGH_PRIORITY_THRESHOLD
+            )
+        elif priority == PriorityLevel.LOW:
+            query = query.where(Post.average_rank < MEDIUM_PRIORITY_THRESHOLD)
+
+        sort_key = SORT_KEYS[sort]
+        ascending = sort == PostSort.OLDEST
+
+        if cursor:
+            # Keyset pagination: seek past the last row of the previous page
+            # using the sort's index instead of skipping rows
+            last_values = decode_cursor(cursor, len(sort_key))
+            if ascending:
+                query = query.where(tuple_(*sort_key) > tuple_(*last_values))
+            else:
+                query = query.where(tuple_(*sort_key) < tuple_(*last_values))
+        elif skip:
+            query = query.offset(skip)
+
+        if ascending:
+            order_by = [column.asc() for column in sort_key]
+        else:
+            order_by = [column.desc() for column in sort_key]
+
+        result = await db.execute(query.order_by(*order_by).limit(limit))
+        posts = [post_row_to_dict(row) for row in result.all()]
+
+        next_cursor = None
+        if len(posts) == limit:
+            last = posts[-1]
+            next_cursor = encode_cursor([last[column.key] for column in sort_key])
+
+        return posts, next_cursor
+
+    @staticmethod
+    async def get_user_posts(db: AsyncSession, user_id: int, limit: int, cursor: Optional[str] = None):
+        # A user's own posts, hidden ones included, newest first and keyset
+        # paged like the feed
+        sort_key = SORT_KEYS[PostSort.NEWEST]
+        query = post_listing_query(include_hidden=True).where(Post.user_id == user_id)
+        if cursor:
+            query = query.where(tuple_(*sort_key) < tuple_(*decode_cursor(cursor, len(sort_key))))
+
+        result = await db.execute(
+            query.order_by(*[column.desc() for column in sort_key]).limit(limit)
+        )
+        posts = [post_row_to_dict(row) for row in result.all()]
+
+        next_cursor = None
+        if len(posts) == limit:
+            last = posts[-1]
+            next_cursor = encode_cursor([last[column.key] for column in sort_key])
+        return posts, next_cursor
+
+    @staticmethod
+    async def search(db: AsyncSession, q: str, limit: int, offset: int = 0):
+        # Ranked full-text search over post text
+        query = post_listing_query()
+        dialect = db.bind.dialect.name
+
+        if dialect == "postgresql":
+            ts_query = func.websearch_to_tsquery("english", q)
+            rank = func.ts_rank(_search_vector, ts_query)
+            query = query.where(_search_vector.op("@@")(ts_query)).order_by(
+                rank.desc(), Post.id.desc()
+            )
+        elif dialect == "sqlite":
+            match = _fts5_query(q)
+            if not match:
+                return []
+            # FTS5's hidden rank column is bm25, lower is better
+            query = query.join(_posts_fts, _posts_fts.c.rowid == Post.id).where(
+                literal_column("posts_fts").op("MATCH")(match)
+            ).order_by(_posts_fts.c.rank, Post.id.desc())
+        else:
+            # No full-text index available: plain substring match
+            query = query.where(Post.text.ilike(f"%{q}%")).order_by(Post.created_at.desc())
+
+        result = await db.execute(query.offset(offset).limit(limit))
+        return [post_row_to_dict(row) for row in result.all()]
+
+    @staticmethod
+    async def nearby(
+        db: AsyncSession,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: int,
+        sort: NearbySort = NearbySort.DISTANCE
+    ):
+        # Posts within radius_m of (lat, lng) as (post dict, distance) pairs
+        cells = geo.covering_cells(lat, lng, radius_m)
+        dialect = db.bind.dialect.name
+
+        # Prefilter on the geohash index, fetching only what the exact
+        # distance check and the sort need
+        candidates = select(
+            Post.id, Post.latitude, Post.longitude, Post.average_rank
+        ).where(Post.geohash.is_not(None), Post.is_hidden.is_(False))
+        if cells:
+            candidates = candidates.where(
+                or_(*[_geohash_prefix_match(dialect, cell) for cell in cells])
+            )
+        result = await db.execute(candidates)
+
+        matches = []
+        for post_id, post_lat, post_lng, average_rank in result.all():
+            distance = geo.haversine_m(lat, lng, post_lat, post_lng)
+            if distance <= radius_m:
+                matches.append((post_id, distance, average_rank or 0))
+
+        if sort == NearbySort.PRIORITY:
+            matches.sort(key=lambda match: (-match[2], match[1]))
+        else:
+            matches.sort(key=lambda match: match[1])
+        matches = matches[:limit]
+        if not matches:
+            return []
+
+        result = await db.execute(
+            post_listing_query().where(Post.id.in_([match[0] for match in matches]))
+        )
+        posts = {}
+        for row in result.all():
+            post = post_row_to_dict(row)
+            posts[post["id"]] = post
+
+        return [
+            (posts[post_id], distance)
+            for post_id, distance, _ in matches
+            if post_id in posts
+        ]
@@ -1,75 +1,327 @@
 # backend/app/services/ranking_service.py
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, insert, update, cast, tuple_, Float, Numeric
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from collections import defaultdict
 from models.ranking import Ranking
 from models.post import Post
-import math
+from utils.http_cache import response_cache, FEED_SCOPE, post_scope
+from utils.pagination import encode_cursor, decode_cursor
+from services.live_broker import live_broker
+from services.leaderboard import leaderboard
+from services.user_stats_service import UserStatsService, stat_deltas, record_post_votes
+
+RANK_VALUES = (1, 2, 3)
+
+def _rank_count_column(rank_value: int):
+    return getattr(Post, f"rank_{rank_value}_count")
 
 class RankingService:
     @staticmethod
-    def add_or_update_ranking(db: Session, user_id: int, post_id: int, rank_value: int):
+    async def add_or_update_ranking(db: AsyncSession, user_id: int, post_id: int, rank_value: int):
+        await RankingService._check_can_rank(db, user_id, post_id)
+
+        # Lock the user's existing vote so the old value we diff against
+        # can't change under us
+        ranking = await RankingService._lock_user_ranking(db, user_id, post_id)
+        delta = {}
+        stats = stat_deltas()
+
+        if ranking is None:
+            try:
+                async with db.begin_nested():
+                    ranking = Ranking(
+                        user_id=user_id,
+                        post_id=post_id,
+                        rank_value=rank_value
+                    )
+                    db.add(ranking)
+                delta = {rank_value: 1}
+                stats[user_id]["votes_cast"] += 1
+                await leaderboard.nudge(db, [(post_id, rank_value, None)])
+            except IntegrityError:
+                # A parallel request from the same user inserted first,
+                # so this vote becomes a change of that one
+                ranking = await RankingService._lock_user_ranking(db, user_id, post_id)
+
+        while not delta and ranking.rank_value != rank_value:
+            # Changed vote: move one count from the old value to the new one.
+            # The UPDATE only matches while the vote still holds the value
+            # read above, so parallel changes can't both move the same count
+            # (SQLite ignores FOR UPDATE); on a miss, re-read and try again.
+            previous = (ranking.rank_value, ranking.ranked_at)
+            changed = await db.execute(
+                update(Ranking).where(
+                    Ranking.id == ranking.id,
+                    Ranking.rank_value == previous[0]
+                ).values(
+                    rank_value=rank_value,
+                    # A changed vote is a fresh signal for the decayed urgency
+                    ranked_at=func.now()
+                ).execution_options(synchronize_session=False)
+            )
+            if changed.rowcount:
+                delta = {previous[0]: -1, rank_value: 1}
+                await leaderboard.nudge(db, [(post_id, rank_value, previous)])
+            else:
+                ranking = await RankingService._lock_user_ranking(db, user_id, post_id)
+                if ranking is None:
+                    # Votes only go away with their post (or user)
+                    raise ValueError("Post not found")
+
+        counts = None
+        if delta:
+            owner_id, counts = await RankingService._apply_post_delta(db, post_id, delta)
+            record_post_votes(stats, owner_id, counts, delta)
+            await UserStatsService.apply(db, stats)
+
+        await db.commit()
+        if delta:
+            # Aggregates changed: drop cached stats and listings, push the
+            # new stats to live viewers
+            response_cache.invalidate(FEED_SCOPE, post_scope(post_id))
+            live_broker.publish_stats(post_id, RankingService._stats_from_counts(counts))
+        await db.refresh(ranking)
+        return ranking
+
+    @staticmethod
+    async def queue_ranking(db: AsyncSession, buffer, user_id: int, post_id: int, rank_value: int):
+        # Buffered mode: validate now, write later in a batch
+        await RankingService._check_can_rank(db, user_id, post_id)
+        buffer.add(user_id, post_id, rank_value)
+
+    @staticmethod
+    async def apply_votes(db: AsyncSession, votes: dict):
+        # Write a batch of {(user_id, post_id): rank_value} votes and update
+        # each touched post's aggregates once
+        result = await db.execute(
+            select(Post.id, Post.user_id).where(
+                Post.id.in_({post_id for _, post_id in votes}),
+                Post.is_hidden.is_(False)
+            )
+        )
+        post_owners = dict(result.all())
+
+        # Drop votes for posts deleted or hidden since they were queued
+        votes = {
+            (user_id, post_id): rank_value
+            for (user_id, post_id), rank_value in votes.items()
+            if post_id in post_owners and post_owners[post_id] != user_id
+        }
+        if not votes:
+            return
+
+        result = await db.execute(
+            select(Ranking).where(
+                tuple_(Ranking.user_id, Ranking.post_id).in_(list(votes))
+            ).with_for_update()
+        )
+        existing = {
+            (ranking.user_id, ranking.post_id): ranking
+            for ranking in result.scalars().all()
+        }
+
+        deltas = defaultdict(lambda: defaultdict(int))
+        stats = stat_deltas()
+        new_rankings = []
+        urgency_votes = []
+        for (user_id, post_id), rank_value in votes.items():
+            ranking = existing.get((user_id, post_id))
+            if ranking is None:
+                new_rankings.append({
+                    "user_id": user_id,
+                    "post_id": post_id,
+                    "rank_value": rank_value
+                })
+                deltas[post_id][rank_value] += 1
+                stats[user_id]["votes_cast"] += 1
+                urgency_votes.append((post_id, rank_value, None))
+            elif ranking.rank_value != rank_value:
+                deltas[post_id][ranking.rank_value] -= 1
+                deltas[post_id][rank_value] += 1
+                urgency_votes.append((post_id, rank_value, (ranking.rank_value, ranking.ranked_at)))
+                ranking.rank_value = rank_value
+                ranking.ranked_at = func.now()
+
+        if new_rankings:
+            await db.execute(insert(Ranking), new_rankings)
+        await leaderboard.nudge(db, urgency_votes)
+
+        # Fixed order so concurrent flushers lock posts consistently
+        new_counts = {}
+        for post_id in sorted(deltas):
+            delta = {value: change for value, change in deltas[post_id].items() if change}
+            if delta:
+                owner_id, counts = await RankingService._apply_post_delta(db, post_id, delta)
+                record_post_votes(stats, owner_id, counts, delta)
+                new_counts[post_id] = counts
+        await UserStatsService.apply(db, stats)
+
+        await db.commit()
+        if deltas:
+            response_cache.invalidate(FEED_SCOPE, *[post_scope(post_id) for post_id in deltas])
+        for post_id, counts in new_counts.items():
+            live_broker.publish_stats(post_id, RankingService._stats_from_counts(counts))
+
+    @staticmethod
+    async def _check_can_rank(db: AsyncSession, user_id: int, post_id: int):
         # Check if user owns the post
-        post = db.query(Post).filter(Post.id == post_id).first()
-        if post.user_id == user_id:
+        post_owner_id = await db.scalar(
+            select(Post.user_id).where(Post.id == post_id, Post.is_hidden.is_(False))
+        )
+        if post_owner_id is None:
+            raise ValueError("Post not found")
+        if post_owner_id == user_id:
             raise ValueError("Cannot rank your own post")
-        
-        # Check if ranking exists
-        existing_ranking = db.query(Ranking).filter(
-            Ranking.user_id == user_id,
-            Ranking.post_id == post_id
-        ).first()
-        
-        if existing_ranking:
-            # Update existing ranking
-            existing_ranking.rank_value = rank_value
-        else:
-            # Create new ranking
-            new_ranking = Ranking(
-                user_id=user_id,
-                post_id=post_id,
-                rank_value=rank_value
-            )
-            db.add(new_ranking)
-        
-        db.commit()
-        
-        # Update post aggregates
-        RankingService._update_post_rankings(db, post_id)
-        
-        return existing_ranking or new_ranking
-    
+
+    @staticmethod
+    async def _lock_user_ranking(db: AsyncSession, user_id: int, post_id: int):
+        # populate_existing: a re-read must not return the stale copy
+        # already in the session
+        return await db.scalar(
+            select(Ranking).where(
+                Ranking.user_id == user_id,
+                Ranking.post_id == post_id
+            ).with_for_update().execution_options(populate_existing=True)
+        )
+
+    @staticmethod
+    async def _apply_post_delta(db: AsyncSession, post_id: int, delta: dict):
+        # Single UPDATE applying only the change; the database does the
+        # arithmetic so parallel votes on the same post can't lose counts.
+        # Returns the post's owner and new counts.
+        counts = {
+            value: _rank_count_column(value) + delta.get(value, 0)
+            for value in RANK_VALUES
+        }
+        result = await db.execute(
+            update(Post).where(Post.id == post_id).values(
+                **RankingService._aggregate_values(counts)
+            ).returning(
+                Post.user_id, Post.rank_1_count, Post.rank_2_count, Post.rank_3_count
+            ).execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            # Deleted since the caller checked it
+            raise ValueError("Post not found")
+        return row.user_id, RankingService._counts_from_row(row)
+
     @staticmethod
-    def _update_post_rankings(db: Session, post_id: int):
-        # Calculate aggregates
-        result = db.query(
-            func.count(Ranking.id).label('total'),
-            func.avg(Ranking.rank_value).label('average')
-        ).filter(Ranking.post_id == post_id).first()
-        
-        post = db.query(Post).filter(Post.id == post_id).first()
-        if post and result.total:
-            post.total_rankings = result.total
-            post.average_rank = round(float(result.average), 2)
-            db.commit()
-    
+    def _aggregate_values(counts: dict):
+        # Build SET values for the counters, total and average from one
+        # SQL expression per rank value
+        total = counts[1] + counts[2] + counts[3]
+        weighted = counts[1] + 2 * counts[2] + 3 * counts[3]
+        average = func.round(
+            cast(cast(weighted, Float) / func.nullif(total, 0), Numeric), 2
+        )
+
+        values = {f"rank_{value}_count": counts[value] for value in RANK_VALUES}
+        values["total_rankings"] = total
+        values["average_rank"] = func.coalesce(average, 0)
+        return values
+
+    @staticmethod
+    async def rebuild_post_aggregates(db: AsyncSession):
+        # Set-based recount of every post's counters from the rankings
+        # table, for backfills and bulk loads. The caller commits, and
+        # clears the response cache once it has.
+        counts = {
+            value: select(func.count(Ranking.id)).where(
+                Ranking.post_id == Post.id,
+                Ranking.rank_value == value
+            ).scalar_subquery()
+            for value in RANK_VALUES
+        }
+        await db.execute(
+            update(Post).values(
+                **RankingService._aggregate_values(counts)
+            ).execution_options(synchronize_session=False)
+        )
+
     @staticmethod
-    def get_ranking_stats(db: Session, post_id: int):
-        # Get count for each rank value
-        stats = db.query(
-            Ranking.rank_value,
-            func.count(Ranking.id).label('count')
-        ).filter(
-            Ranking.post_id == post_id
-        ).group_by(Ranking.rank_value).all()
-        
+    async def get_ranking_stats(db: AsyncSession, post_id: int):
+        # Counters are maintained on the post by every vote
+        result = await db.execute(
+            select(
+                Post.rank_1_count,
+                Post.rank_2_count,
+                Post.rank_3_count
+            ).where(Post.id == post_id)
+        )
+        row = result.first()
+
         # Initialize counts
         counts = {1: 0, 2: 0, 3: 0}
-        for rank_value, count in stats:
-            counts[rank_value] = count
-        
+        if row:
+            counts = RankingService._counts_from_row(row)
+
+        return RankingService._stats_from_counts(counts)
+
+    @staticmethod
+    async def get_batch_ranking_stats(db: AsyncSession, user_id: int, post_ids: List[int]):
+        # Two queries regardless of how many posts are asked for: the
+        # counters for all posts, then the caller's votes on them
+        result = await db.execute(
+            select(
+                Post.id,
+                Post.rank_1_count,
+                Post.rank_2_count,
+                Post.rank_3_count
+            ).where(Post.id.in_(post_ids))
+        )
+        counts_by_post = {row.id: RankingService._counts_from_row(row) for row in result.all()}
+
+        result = await db.execute(
+            select(Ranking.post_id, Ranking.rank_value).where(
+                Ranking.user_id == user_id,
+                Ranking.post_id.in_(post_ids)
+            )
+        )
+        my_rankings = dict(result.all())
+
+        results = []
+        for post_id in post_ids:
+            stats = RankingService._stats_from_counts(
+                counts_by_post.get(post_id, {1: 0, 2: 0, 3: 0})
+            )
+            stats["post_id"] = post_id
+            stats["rank_value"] = my_rankings.get(post_id)
+            results.append(stats)
+        return results
+
+    @staticmethod
+    async def get_user_rankings(db: AsyncSession, user_id: int, limit: int, cursor: Optional[str] = None):
+        # Votes the user has cast, most recent first, keyset paged on id
+        query = select(
+            Ranking.id, Ranking.user_id, Ranking.post_id, Ranking.rank_value, Ranking.ranked_at
+        ).where(Ranking.user_id == user_id)
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            query = query.where(Ranking.id < last_id)
+
+        result = await db.execute(query.order_by(Ranking.id.desc()).limit(limit))
+        rankings = [dict(row._mapping) for row in result.all()]
+
+        next_cursor = None
+        if len(rankings) == limit:
+            next_cursor = encode_cursor([rankings[-1]["id"]])
+        return rankings, next_cursor
+
+    @staticmethod
+    def _counts_from_row(row):
+        return {
+            value: getattr(row, f"rank_{value}_count") or 0
+            for value in RANK_VALUES
+        }
+
+    @staticmethod
+    def _stats_from_counts(counts: dict):
         total = sum(counts.values())
         average = sum(k * v for k, v in counts.items()) / total if total > 0 else 0
-        
+
         return {
             "total_rankings": total,
             "average_rank": round(average, 2),
@@ -77,10 +329,12 @@ class RankingService:
             "rank_2_count": counts[2],
             "rank_3_count": counts[3]
         }
-    
+
     @staticmethod
-    def get_user_ranking(db: Session, user_id: int, post_id: int):
-        return db.query(Ranking).filter(
-            Ranking.user_id == user_id,
-            Ranking.post_id == post_id
-        ).first()
\ No newline at end of file
+    async def get_user_ranking(db: AsyncSession, user_id: int, post_id: int):
+        return await db.scalar(
+            select(Ranking).where(
+                Ranking.user_id == user_id,
+                Ranking.post_id == post_id
+            )
+        )
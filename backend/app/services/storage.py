@@ -0,0 +1,68 @@
+# backend/app/services/storage.py
+import os
+import shutil
+import uuid
+from abc import ABC, abstractmethod
+from services.cloudinary_service import CloudinaryService
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIR = os.path.dirname(os.path.dirname(BASE_DIR))
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "cloudinary")
+LOCAL_MEDIA_ROOT = os.getenv("LOCAL_MEDIA_ROOT", os.path.join(ROOT_DIR, "media"))
+LOCAL_MEDIA_URL = os.getenv("LOCAL_MEDIA_URL", "http://localhost:8000/media")
+
+class StorageBackend(ABC):
+    # Where finished media lives. save() takes a local file and returns
+    # {"url", "key"}; the key is what delete() needs later. delete()
+    # returns False if the file was already gone and raises on failure.
+    @abstractmethod
+    def save(self, path: str, resource_type: str) -> dict:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str, resource_type: str) -> bool:
+        ...
+
+class CloudinaryStorage(StorageBackend):
+    def __init__(self, folder: str = "community_posts"):
+        self.folder = folder
+
+    def save(self, path: str, resource_type: str) -> dict:
+        result = CloudinaryService.upload_path(path, resource_type, self.folder)
+        return {"url": result["url"], "key": result["public_id"]}
+
+    def delete(self, key: str, resource_type: str) -> bool:
+        return CloudinaryService.delete_media(key, resource_type)
+
+class LocalStorage(StorageBackend):
+    # Files under a directory served by the app at /media; used for local
+    # runs and benchmarks without a Cloudinary account
+    def __init__(self, root: str = LOCAL_MEDIA_ROOT, base_url: str = LOCAL_MEDIA_URL):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+
+    def save(self, path: str, resource_type: str) -> dict:
+        extension = os.path.splitext(path)[1]
+        key = f"{resource_type}/{uuid.uuid4().hex}{extension}"
+        destination = os.path.join(self.root, key)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copyfile(path, destination)
+        return {"url": f"{self.base_url}/{key}", "key": key}
+
+    def delete(self, key: str, resource_type: str) -> bool:
+        try:
+            os.remove(os.path.join(self.root, key))
+            return True
+        except FileNotFoundError:
+            return False
+
+def create_storage() -> StorageBackend:
+    if STORAGE_BACKEND == "local":
+        return LocalStorage()
+    if STORAGE_BACKEND == "cloudinary":
+        return CloudinaryStorage()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+storage = create_storage()
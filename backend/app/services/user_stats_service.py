@@ -0,0 +1,151 @@
+# backend/app/services/user_stats_service.py
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete, func, case
+from database import upsert_insert
+from models.user import User
+from models.post import Post
+from models.ranking import Ranking
+from models.user_stats import UserStats, STAT_COLUMNS
+from services.post_service import HIGH_PRIORITY_THRESHOLD, MEDIUM_PRIORITY_THRESHOLD
+
+def stat_deltas():
+    # {user_id: {column: change}}, filled by the helpers below and
+    # written with UserStatsService.apply
+    return defaultdict(lambda: defaultdict(int))
+
+def priority_level(counts: dict) -> str:
+    # Level of a post with {rank_value: count} votes, from the average the
+    # database stores (rounded to two places)
+    total = sum(counts.values())
+    if not total:
+        return "low"
+    weighted = counts.get(1, 0) + 2 * counts.get(2, 0) + 3 * counts.get(3, 0)
+    average = (Decimal(weighted) / total).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    if average >= Decimal(str(HIGH_PRIORITY_THRESHOLD)):
+        return "high"
+    if average >= Decimal(str(MEDIUM_PRIORITY_THRESHOLD)):
+        return "medium"
+    return "low"
+
+def record_post_created(deltas, user_id: int):
+    deltas[user_id]["posts_count"] += 1
+    deltas[user_id][f"{priority_level({})}_priority_posts"] += 1
+
+def record_post_votes(deltas, owner_id: int, counts: dict, delta: dict):
+    # The owner's side of a vote: counts are the post's new rank counts
+    # and delta the change that produced them
+    previous = {value: count - delta.get(value, 0) for value, count in counts.items()}
+    deltas[owner_id]["votes_received"] += sum(delta.values())
+    old_level, new_level = priority_level(previous), priority_level(counts)
+    if old_level != new_level:
+        deltas[owner_id][f"{old_level}_priority_posts"] -= 1
+        deltas[owner_id][f"{new_level}_priority_posts"] += 1
+
+def record_post_deleted(deltas, owner_id: int, counts: dict):
+    deltas[owner_id]["posts_count"] -= 1
+    deltas[owner_id]["votes_received"] -= sum(counts.values())
+    deltas[owner_id][f"{priority_level(counts)}_priority_posts"] -= 1
+
+class UserStatsService:
+    @staticmethod
+    async def apply(db: AsyncSession, deltas):
+        # Add the deltas to the counters in one upsert, inside the
+        # caller's transaction; missing rows start from zero
+        make_insert = upsert_insert(db)
+        rows = [
+            {"user_id": user_id, **{column: changes.get(column, 0) for column in STAT_COLUMNS}}
+            for user_id, changes in sorted(deltas.items())
+            if any(changes.values())
+        ]
+        if make_insert is None or not rows:
+            return
+
+        # Sorted by user so concurrent writers lock rows in the same order
+        stmt = make_insert(UserStats).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                column: getattr(UserStats, column) + getattr(stmt.excluded, column)
+                for column in STAT_COLUMNS
+            }
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    async def forget_votes_on(db: AsyncSession, post_condition):
+        # Before posts matching post_condition are deleted (their rankings
+        # go by cascade): take those votes off each voter's votes_cast
+        voters = select(
+            Ranking.user_id, func.count(Ranking.id).label("votes")
+        ).where(
+            Ranking.post_id.in_(select(Post.id).where(post_condition))
+        ).group_by(Ranking.user_id).subquery()
+        await db.execute(
+            update(UserStats).where(
+                UserStats.user_id == voters.c.user_id
+            ).values(
+                votes_cast=UserStats.votes_cast - voters.c.votes
+            ).execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def get(db: AsyncSession, user_id: int) -> dict:
+        result = await db.execute(
+            select(*[getattr(UserStats, column) for column in STAT_COLUMNS]).where(
+                UserStats.user_id == user_id
+            )
+        )
+        row = result.first()
+        return dict(zip(STAT_COLUMNS, row)) if row else dict.fromkeys(STAT_COLUMNS, 0)
+
+    @staticmethod
+    async def rebuild(db: AsyncSession):
+        # Set-based recount of every user's counters from posts and
+        # rankings, for backfills and bulk loads; the caller commits
+        def level_count(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        posts = select(
+            Post.user_id,
+            func.count(Post.id).label("posts_count"),
+            func.coalesce(func.sum(Post.total_rankings), 0).label("votes_received"),
+            level_count(Post.average_rank >= HIGH_PRIORITY_THRESHOLD).label("high"),
+            level_count(
+                (Post.average_rank >= MEDIUM_PRIORITY_THRESHOLD)
+                & (Post.average_rank < HIGH_PRIORITY_THRESHOLD)
+            ).label("medium"),
+            level_count(
+                func.coalesce(Post.average_rank, 0) < MEDIUM_PRIORITY_THRESHOLD
+            ).label("low"),
+        ).group_by(Post.user_id).subquery()
+        votes = select(
+            Ranking.user_id, func.count(Ranking.id).label("votes_cast")
+        ).group_by(Ranking.user_id).subquery()
+
+        await db.execute(delete(UserStats))
+        await db.execute(
+            insert(UserStats).from_select(
+                ["user_id", *STAT_COLUMNS],
+                select(
+                    User.id,
+                    func.coalesce(posts.c.posts_count, 0),
+                    func.coalesce(posts.c.votes_received, 0),
+                    func.coalesce(votes.c.votes_cast, 0),
+                    func.coalesce(posts.c.high, 0),
+                    func.coalesce(posts.c.medium, 0),
+                    func.coalesce(posts.c.low, 0),
+                ).outerjoin(posts, posts.c.user_id == User.id).outerjoin(
+                    votes, votes.c.user_id == User.id
+                )
+            )
+        )
+
+    @staticmethod
+    async def rebuild_if_empty(db: AsyncSession):
+        # First start after the table was added: fill it from existing data
+        if await db.scalar(select(UserStats.user_id).limit(1)) is None:
+            if await db.scalar(select(User.id).limit(1)) is not None:
+                await UserStatsService.rebuild(db)
+                await db.commit()
@@ -0,0 +1,199 @@
+# backend/app/services/vote_buffer.py
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.exc import OperationalError
+from database import SessionLocal
+from services.ranking_service import RankingService
+
+logger = logging.getLogger(__name__)
+
+VOTE_BUFFER_DEPTH = Gauge(
+    "vote_buffer_depth", "Votes acknowledged but not yet flushed to the database"
+)
+VOTE_BUFFER_FLUSH_SECONDS = Histogram(
+    "vote_buffer_flush_seconds", "Time taken to flush one batch of buffered votes"
+)
+VOTE_BUFFER_FLUSHED = Counter(
+    "vote_buffer_flushed_votes_total", "Votes written to the database by the buffer"
+)
+VOTE_BUFFER_COALESCED = Counter(
+    "vote_buffer_coalesced_votes_total", "Votes replaced by a later vote before flushing"
+)
+VOTE_BUFFER_FLUSH_FAILURES = Counter(
+    "vote_buffer_flush_failures_total", "Flushes that failed and were requeued"
+)
+VOTE_BUFFER_DROPPED = Counter(
+    "vote_buffer_dropped_votes_total", "Votes given up on after repeated failed writes"
+)
+
+# Longest pause between flushes while the database keeps failing
+_MAX_BACKOFF_SECONDS = 60.0
+
+def _is_transient(error: Exception) -> bool:
+    # The database is unreachable or busy, rather than rejecting a vote
+    return isinstance(error, (OperationalError, OSError, asyncio.TimeoutError)) or \
+        getattr(error, "connection_invalidated", False)
+
+class VoteBuffer:
+    def __init__(self, session_factory=SessionLocal, max_batch: int = 500, flush_interval: float = 1.0,
+                 max_retries: int = 10):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+
+        # (user_id, post_id) -> rank_value, last write wins
+        self._pending = {}
+        # Batch currently being written, still visible to readers
+        self._inflight = {}
+        # (user_id, post_id) -> failed writes of the vote now pending
+        self._attempts = {}
+        # Flushes in a row that found the database unavailable
+        self._outages = 0
+        self._flush_lock = None
+        self._wake = None
+        self._stopped = False
+        self._task = None
+
+    def start(self):
+        # Must be called from the running event loop (app startup)
+        if self._task is None:
+            self._flush_lock = asyncio.Lock()
+            self._wake = asyncio.Event()
+            self._stopped = False
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        # Stop the flusher, then drain whatever is left so no
+        # acknowledged vote is lost on shutdown
+        self._stopped = True
+        if self._task is not None:
+            self._wake.set()
+            await self._task
+            self._task = None
+        while self.depth():
+            if not await self.flush():
+                break
+        if self.depth():
+            logger.error("Vote buffer closed with %d unwritten votes, they are lost", self.depth())
+
+    def add(self, user_id: int, post_id: int, rank_value: int):
+        key = (user_id, post_id)
+        if key in self._pending:
+            VOTE_BUFFER_COALESCED.inc()
+        self._pending[key] = rank_value
+        self._attempts.pop(key, None)
+        depth = len(self._pending)
+        VOTE_BUFFER_DEPTH.set(depth)
+
+        # Size trigger: don't wait for the timer when the batch is full,
+        # unless the flusher is backing off from a database outage
+        if depth >= self.max_batch and self._wake is not None and not self._outages:
+            self._wake.set()
+
+    def pending_vote(self, user_id: int, post_id: int) -> Optional[int]:
+        key = (user_id, post_id)
+        if key in self._pending:
+            return self._pending[key]
+        return self._inflight.get(key)
+
+    def depth(self) -> int:
+        return len(self._pending)
+
+    async def flush(self) -> int:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+            VOTE_BUFFER_DEPTH.set(0)
+
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            unwritten, outage = await self._write(batch)
+            self._outages = self._outages + 1 if outage else 0
+            for key in batch:
+                if key not in unwritten:
+                    self._attempts.pop(key, None)
+            if unwritten:
+                VOTE_BUFFER_FLUSH_FAILURES.inc()
+                self._requeue(unwritten)
+            self._inflight = {}
+            VOTE_BUFFER_DEPTH.set(len(self._pending))
+
+            written = len(batch) - len(unwritten)
+            VOTE_BUFFER_FLUSH_SECONDS.observe(time.perf_counter() - started)
+            VOTE_BUFFER_FLUSHED.inc(written)
+            return written
+
+    async def _write(self, votes: dict):
+        # Writes the votes in one transaction. If the database rejects the
+        # batch, it is split in halves until the votes at fault stand
+        # alone, so one bad vote doesn't hold back the rest. Returns the
+        # votes left unwritten and whether the database was unavailable.
+        try:
+            async with self.session_factory() as db:
+                await RankingService.apply_votes(db, votes)
+            return {}, False
+        except Exception as e:
+            if _is_transient(e):
+                logger.warning("Vote buffer flush of %d votes failed, database unavailable",
+                               len(votes), exc_info=True)
+                return votes, True
+            if len(votes) == 1:
+                logger.warning("Vote %s was rejected", next(iter(votes.items())), exc_info=True)
+                return votes, False
+
+        items = list(votes.items())
+        middle = len(items) // 2
+        first, first_outage = await self._write(dict(items[:middle]))
+        second, second_outage = await self._write(dict(items[middle:]))
+        return {**first, **second}, first_outage or second_outage
+
+    def _requeue(self, votes: dict):
+        for key, rank_value in votes.items():
+            if key in self._pending:
+                # A newer vote arrived meanwhile and takes precedence
+                continue
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts >= self.max_retries:
+                self._attempts.pop(key, None)
+                VOTE_BUFFER_DROPPED.inc()
+                logger.error("Dropping vote %s after %d failed writes", (key, rank_value), attempts)
+                continue
+            self._attempts[key] = attempts
+            self._pending[key] = rank_value
+
+    async def _run(self):
+        while not self._stopped:
+            # Back off exponentially while the database is unavailable
+            delay = min(self.flush_interval * 2 ** self._outages, _MAX_BACKOFF_SECONDS)
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Vote buffer flusher error")
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+# Buffered (write-behind) voting is opt-in; None means votes are
+# written synchronously by RankingService.add_or_update_ranking
+vote_buffer = None
+if _env_flag("RANKING_BUFFER_ENABLED"):
+    vote_buffer = VoteBuffer(
+        max_batch=int(os.getenv("RANKING_BUFFER_MAX_BATCH", 500)),
+        flush_interval=float(os.getenv("RANKING_BUFFER_FLUSH_INTERVAL", 1.0)),
+        max_retries=int(os.getenv("RANKING_BUFFER_MAX_RETRIES", 10))
+    )
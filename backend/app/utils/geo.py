@@ -0,0 +1,106 @@
+# backend/app/utils/geo.py
+import math
+
+# Geohash alphabet; each character adds 5 bits, alternating longitude
+# and latitude starting with longitude
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(_BASE32)}
+
+# Precision stored on posts (~4.8m x 4.8m cells), queries use a prefix
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_M = 6371008.8
+_METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+def encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (lng, lng_range) if even else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            bounds[0] = mid
+        else:
+            bits <<= 1
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+def decode_bounds(geohash: str):
+    # (min_lat, max_lat, min_lng, max_lng) of the cell
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bounds = lng_range if even else lat_range
+            mid = (bounds[0] + bounds[1]) / 2
+            if (value >> shift) & 1:
+                bounds[0] = mid
+            else:
+                bounds[1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+def cell_size(precision: int):
+    # (height, width) of a cell in degrees
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+def neighbours(geohash: str):
+    # The cell itself plus the up to eight cells around it
+    min_lat, max_lat, min_lng, max_lng = decode_bounds(geohash)
+    height = max_lat - min_lat
+    width = max_lng - min_lng
+    center_lat = (min_lat + max_lat) / 2
+    center_lng = (min_lng + max_lng) / 2
+
+    cells = set()
+    for dy in (-1, 0, 1):
+        lat = center_lat + dy * height
+        if lat < -90 or lat > 90:
+            continue
+        for dx in (-1, 0, 1):
+            # Wrap around the antimeridian
+            lng = (center_lng + dx * width + 180) % 360 - 180
+            cells.add(encode(lat, lng, len(geohash)))
+    return sorted(cells)
+
+def covering_cells(lat: float, lng: float, radius_m: float):
+    """Geohash prefixes whose cells together cover the circle.
+
+    Picks the finest precision whose cells are at least radius_m on each
+    side, so the circle never reaches past the 3x3 block around the
+    center cell. Returns an empty list when no precision is coarse enough.
+    """
+    # Width of a degree of longitude shrinks towards the poles; use the
+    # edge of the circle closest to a pole
+    edge_lat = min(abs(lat) + radius_m / _METERS_PER_DEGREE, 90.0)
+    lng_scale = math.cos(math.radians(edge_lat))
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        if (height * _METERS_PER_DEGREE >= radius_m
+                and width * _METERS_PER_DEGREE * lng_scale >= radius_m):
+            return neighbours(encode(lat, lng, precision))
+    return []
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = (math.sin(d_phi / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
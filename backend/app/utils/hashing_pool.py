@@ -0,0 +1,89 @@
+# backend/app/utils/hashing_pool.py
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from prometheus_client import Counter, Gauge
+from utils.security import verify_password, get_password_hash
+
+HASHING_POOL_WORKERS = int(os.getenv("HASHING_POOL_WORKERS", 2))
+# Jobs allowed to wait for a worker before new ones are turned away
+HASHING_POOL_MAX_QUEUE = int(os.getenv("HASHING_POOL_MAX_QUEUE", 32))
+# Seconds suggested to clients in Retry-After when saturated
+HASHING_POOL_RETRY_AFTER = int(os.getenv("HASHING_POOL_RETRY_AFTER", 1))
+
+HASHING_POOL_IN_FLIGHT = Gauge(
+    "hashing_pool_in_flight", "Password hash jobs running or queued"
+)
+HASHING_POOL_QUEUE_DEPTH = Gauge(
+    "hashing_pool_queue_depth", "Password hash jobs waiting for a worker"
+)
+HASHING_POOL_REJECTED = Counter(
+    "hashing_pool_rejected_total", "Password hash jobs rejected because the pool was full"
+)
+
+class HashingPoolBusy(Exception):
+    def __init__(self, retry_after: int = HASHING_POOL_RETRY_AFTER):
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+class HashingPool:
+    # Runs PBKDF2 in worker processes so request threads don't burn the
+    # GIL, with a hard cap on how much work can pile up
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.capacity = workers + max_queue
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        # Created lazily so importing the app doesn't fork workers
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            HASHING_POOL_REJECTED.inc()
+            raise HashingPoolBusy()
+
+        self._track(1)
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    async def run(self, fn, *args):
+        # Await the worker process without blocking the event loop
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _release(self):
+        self._track(-1)
+        self._slots.release()
+
+    def _track(self, change: int):
+        with self._lock:
+            self._in_flight += change
+            in_flight = self._in_flight
+        HASHING_POOL_IN_FLIGHT.set(in_flight)
+        HASHING_POOL_QUEUE_DEPTH.set(max(0, in_flight - self.workers))
+
+hashing_pool = HashingPool(HASHING_POOL_WORKERS, HASHING_POOL_MAX_QUEUE)
+
+async def verify_password_pooled(plain_password, hashed_password):
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_pooled(password):
+    return await hashing_pool.run(get_password_hash, password)
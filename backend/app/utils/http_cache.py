@@ -0,0 +1,153 @@
+# backend/app/utils/http_cache.py
+import asyncio
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from prometheus_client import Counter
+from utils.cache import TTLCache
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib encoder
+    orjson = None
+
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 30))
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", 2048))
+
+RESPONSE_CACHE_HITS = Counter("response_cache_hits_total", "Responses served from the cache")
+RESPONSE_CACHE_MISSES = Counter("response_cache_misses_total", "Responses built from the database")
+RESPONSE_CACHE_COALESCED = Counter(
+    "response_cache_coalesced_total", "Cache misses that waited on an identical in-flight build"
+)
+RESPONSE_NOT_MODIFIED = Counter("response_not_modified_total", "Conditional GETs answered with 304")
+
+# Invalidation scopes: every listing, or everything about one post
+FEED_SCOPE = "feed"
+# Urgency leaderboards, also rebuilt by the periodic recompute
+LEADERBOARD_SCOPE = "leaderboard"
+
+def post_scope(post_id: int) -> str:
+    return f"post:{post_id}"
+
+def _whole_second_ceiling(value: datetime) -> datetime:
+    # HTTP dates have whole seconds. Rounding up keeps Last-Modified at or
+    # after the real change, and lets If-Modified-Since echo it back exactly.
+    if value.microsecond:
+        value = value.replace(microsecond=0) + timedelta(seconds=1)
+    return value
+
+class CachedResponse:
+    __slots__ = ("body", "headers", "etag", "last_modified")
+
+    def __init__(self, body: bytes, headers: dict, last_modified: datetime):
+        self.body = body
+        self.headers = headers
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.last_modified = _whole_second_ceiling(last_modified)
+
+class ResponseCache:
+    # Rendered response bodies keyed by request, tagged with the scopes
+    # whose writes make them stale. Invalidating a scope bumps its
+    # version, so old entries are never looked up again.
+    def __init__(self, max_size: int = RESPONSE_CACHE_MAX_SIZE, ttl: float = RESPONSE_CACHE_TTL_SECONDS):
+        self._entries = TTLCache(max_size=max_size, ttl=ttl)
+        self._versions = {}
+        self._inflight = {}
+        self._started = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def invalidate(self, *scopes: str):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        for scope in scopes:
+            version, _ = self._versions.get(scope, (0, None))
+            self._versions[scope] = (version + 1, now)
+
+    def clear(self):
+        self._entries.clear()
+        self.invalidate(*list(self._versions))
+
+    async def get_or_build(self, key, scopes, builder, refresh: bool = False) -> CachedResponse:
+        # builder() returns (body_bytes, extra_headers) and is awaited at
+        # most once per key at a time; concurrent misses share its result.
+        # refresh skips the lookup and replaces whatever entry is there.
+        states = [self._versions.get(scope, (0, self._started)) for scope in scopes]
+        versioned_key = (key, tuple(version for version, _ in states))
+
+        if not refresh:
+            entry = self._entries.get(versioned_key)
+            if entry is not None:
+                RESPONSE_CACHE_HITS.inc()
+                return entry
+
+            inflight = self._inflight.get(versioned_key)
+            if inflight is not None:
+                RESPONSE_CACHE_COALESCED.inc()
+                return await asyncio.shield(inflight)
+
+        RESPONSE_CACHE_MISSES.inc()
+        future = asyncio.get_running_loop().create_future()
+        # Mark exceptions retrieved so a failed build with no waiters is quiet
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[versioned_key] = future
+        try:
+            body, headers = await builder()
+            last_modified = max(modified or self._started for _, modified in states)
+            entry = CachedResponse(body, headers, last_modified)
+            self._entries.set(versioned_key, entry)
+            future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(versioned_key, None)
+
+response_cache = ResponseCache()
+
+def render_json(data) -> bytes:
+    # orjson encodes dicts, lists, datetimes and enums natively; anything
+    # else (pydantic models, Decimals) goes through jsonable_encoder
+    if orjson is not None:
+        return orjson.dumps(data, default=jsonable_encoder)
+    return json.dumps(jsonable_encoder(data), separators=(",", ":")).encode()
+
+def json_response(data, headers=None) -> Response:
+    # Uncached listings: already response-shaped data, rendered once
+    return Response(content=render_json(data), media_type="application/json", headers=headers)
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    # The ETag decides when the client sent one; the date, having only
+    # whole seconds, can miss a change made within the same second
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags or f"W/{entry.etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return entry.last_modified <= since
+    return False
+
+def conditional_response(request: Request, entry: CachedResponse) -> Response:
+    headers = dict(entry.headers)
+    headers["ETag"] = entry.etag
+    headers["Last-Modified"] = format_datetime(entry.last_modified, usegmt=True)
+    # Clients may keep the body but must revalidate before reusing it
+    headers["Cache-Control"] = "no-cache"
+
+    if _not_modified(request, entry):
+        RESPONSE_NOT_MODIFIED.inc()
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,54 @@
+# backend/app/utils/log.py
+import json
+import logging
+import os
+import random
+import sys
+from datetime import datetime, timezone
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # 'json' or 'text'
+# Share of high-volume events (per request, per auth failure) that are
+# logged; warnings and errors are always kept
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 0.01))
+
+class JsonFormatter(logging.Formatter):
+    # One JSON object per line: timestamp, level, logger, event and the
+    # event's fields
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        message = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            message += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return message
+
+def configure_logging():
+    handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(TextFormatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(LOG_LEVEL)
+
+def log_event(logger: logging.Logger, level: int, event: str, sample_rate: float = 1.0, **fields):
+    # Structured log line; below WARNING only a sample_rate share is kept
+    if level < logging.WARNING and sample_rate < 1.0 and random.random() >= sample_rate:
+        return
+    if sample_rate < 1.0:
+        fields["sample_rate"] = sample_rate
+    logger.log(level, event, extra={"fields": fields})
@@ -0,0 +1,38 @@
+# backend/app/utils/pagination.py
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+
+# Response header carrying the opaque cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values):
+    # Cursor is an opaque base64 blob over the sort key of the last row
+    encoded = []
+    for value in values:
+        if isinstance(value, datetime):
+            encoded.append({"dt": value.isoformat()})
+        elif isinstance(value, Decimal):
+            encoded.append(float(value))
+        else:
+            encoded.append(value)
+    raw = json.dumps(encoded, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        encoded = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = []
+        for value in encoded:
+            if isinstance(value, dict):
+                values.append(datetime.fromisoformat(value["dt"]))
+            else:
+                values.append(value)
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+
+    if len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
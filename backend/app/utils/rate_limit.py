@@ -0,0 +1,155 @@
+# backend/app/utils/rate_limit.py
+import logging
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from prometheus_client import Counter
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # redis is optional; only needed for RATE_LIMIT_STORE=redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+# "memory" keeps buckets per process; "redis" shares them between workers
+RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", "memory")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+# Buckets kept by the memory store; the least recently used go first
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+
+RATE_LIMIT_THROTTLED = Counter(
+    "rate_limit_throttled_total", "Requests rejected by a rate limit budget", ["budget"]
+)
+RATE_LIMIT_STORE_ERRORS = Counter(
+    "rate_limit_store_errors_total", "Rate limit checks let through because the store failed"
+)
+
+class RateLimited(Exception):
+    def __init__(self, budget: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for {budget}")
+        self.budget = budget
+        # Whole seconds, as sent in Retry-After
+        self.retry_after = max(1, math.ceil(retry_after))
+
+class Budget:
+    # Token bucket: bursts of up to `requests`, refilled evenly so that
+    # `requests` more are allowed every `seconds`
+    def __init__(self, name: str, requests: int, seconds: float):
+        self.name = name
+        self.capacity = requests
+        self.refill_rate = requests / seconds
+
+    @classmethod
+    def from_env(cls, name: str, default: str):
+        # RATE_LIMIT_<NAME>="<requests>/<seconds>", e.g. "10/60"
+        spec = os.getenv(f"RATE_LIMIT_{name.upper()}", default)
+        requests, seconds = spec.split("/")
+        return cls(name, int(requests), float(seconds))
+
+class RateLimitStore(ABC):
+    # take() removes `cost` tokens from the bucket at key and returns 0, or
+    # leaves it alone and returns the seconds until that many are available
+    @abstractmethod
+    async def take(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> float:
+        ...
+
+    async def close(self):
+        pass
+
+class MemoryRateLimitStore(RateLimitStore):
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    async def take(self, key, capacity, refill_rate, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / refill_rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # An evicted bucket comes back full, which only errs towards allowing
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+# Same refill as the memory store, done atomically inside Redis with the
+# server's clock so every worker sees one bucket per key
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+class RedisRateLimitStore(RateLimitStore):
+    def __init__(self, url: str = RATE_LIMIT_REDIS_URL, prefix: str = "ratelimit:"):
+        if redis is None:
+            raise RuntimeError("RATE_LIMIT_STORE=redis needs the redis package installed")
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key, capacity, refill_rate, cost=1):
+        wait = await self._take(keys=[self.prefix + key], args=[capacity, refill_rate, cost])
+        return float(wait)
+
+    async def close(self):
+        await self._client.close()
+
+class RateLimiter:
+    def __init__(self, store: RateLimitStore, enabled: bool = True):
+        self.store = store
+        self.enabled = enabled
+
+    async def hit(self, budget: Budget, key: str, cost: int = 1):
+        # Raises RateLimited when the caller's bucket for this budget is empty
+        if not self.enabled:
+            return
+        try:
+            wait = await self.store.take(f"{budget.name}:{key}", budget.capacity, budget.refill_rate, cost)
+        except Exception:
+            # A broken shared store must not take the API down with it
+            RATE_LIMIT_STORE_ERRORS.inc()
+            logger.warning("Rate limit store failed, allowing request", exc_info=True)
+            return
+        if wait > 0:
+            RATE_LIMIT_THROTTLED.labels(budget=budget.name).inc()
+            raise RateLimited(budget.name, wait)
+
+    async def close(self):
+        await self.store.close()
+
+def create_rate_limit_store() -> RateLimitStore:
+    if RATE_LIMIT_STORE == "memory":
+        return MemoryRateLimitStore()
+    if RATE_LIMIT_STORE == "redis":
+        return RedisRateLimitStore()
+    raise ValueError(f"Unknown RATE_LIMIT_STORE: {RATE_LIMIT_STORE}")
+
+rate_limiter = RateLimiter(create_rate_limit_store(), enabled=RATE_LIMIT_ENABLED)
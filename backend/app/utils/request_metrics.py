@@ -0,0 +1,107 @@
+# backend/app/utils/request_metrics.py
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+from starlette.routing import Match
+from utils.log import log_event, LOG_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# Requests issuing more statements than this are logged as likely N+1s
+SQL_QUERY_WARN_THRESHOLD = int(os.getenv("SQL_QUERY_WARN_THRESHOLD", 20))
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency by route",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_QUERIES = Histogram(
+    "http_request_sql_queries", "SQL statements issued per request",
+    ["method", "route"], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+)
+HTTP_REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_seconds", "Total SQL time per request",
+    ["method", "route"]
+)
+SQL_QUERY_SECONDS = Histogram("sql_query_duration_seconds", "Latency of single SQL statements")
+SQL_QUERY_THRESHOLD_EXCEEDED = Counter(
+    "http_request_sql_threshold_exceeded_total",
+    "Requests that issued more SQL statements than SQL_QUERY_WARN_THRESHOLD",
+    ["method", "route"]
+)
+
+class RequestStats:
+    __slots__ = ("queries", "sql_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+
+# Stats of the request being served. The object is mutated, never
+# replaced, so statements run from SQLAlchemy's greenlets still count.
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def instrument_engine(sync_engine):
+    # Time every statement on the engine (AsyncEngine.sync_engine) and
+    # charge it to the current request, if any
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        SQL_QUERY_SECONDS.observe(elapsed)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.sql_seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+def start_request() -> RequestStats:
+    stats = RequestStats()
+    _current_stats.set(stats)
+    return stats
+
+def route_label(request) -> str:
+    # Route template rather than the raw path, so labels stay bounded
+    route = request.scope.get("route")
+    if route is None:
+        for candidate in request.app.router.routes:
+            match, _ = candidate.matches(request.scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+def finish_request(request, status_code: int, stats: RequestStats, elapsed: float):
+    method = request.method
+    route = route_label(request)
+
+    HTTP_REQUEST_SECONDS.labels(method=method, route=route, status=str(status_code)).observe(elapsed)
+    HTTP_REQUEST_QUERIES.labels(method=method, route=route).observe(stats.queries)
+    HTTP_REQUEST_SQL_SECONDS.labels(method=method, route=route).observe(stats.sql_seconds)
+
+    fields = {
+        "method": method,
+        "route": route,
+        "status": status_code,
+        "duration_ms": round(elapsed * 1000, 2),
+        "queries": stats.queries,
+        "sql_ms": round(stats.sql_seconds * 1000, 2),
+    }
+    if stats.queries > SQL_QUERY_WARN_THRESHOLD:
+        SQL_QUERY_THRESHOLD_EXCEEDED.labels(method=method, route=route).inc()
+        log_event(logger, logging.WARNING, "request.too_many_queries",
+                  threshold=SQL_QUERY_WARN_THRESHOLD, **fields)
+    else:
+        log_event(logger, logging.INFO, "request", sample_rate=LOG_SAMPLE_RATE, **fields)
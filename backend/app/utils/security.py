@@ -2,8 +2,11 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import jwt
+from jose import jwt, JWTError
+import hashlib
+import logging
 import os
+import secrets
 from dotenv import load_dotenv
 
 # Get project root to load .env reliably
@@ -14,8 +17,14 @@ load_dotenv(os.path.join(ROOT_DIR, ".env"))
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
-print(f"DEBUG: security.py loaded SECRET_KEY={'set' if SECRET_KEY else 'NOT SET'}, ALGORITHM={ALGORITHM}")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 30))
+# A used refresh token presented again within this many seconds is taken
+# for another tab refreshing at the same moment, not for a stolen copy
+REFRESH_REUSE_GRACE_SECONDS = int(os.getenv("REFRESH_REUSE_GRACE_SECONDS", 30))
+
+if not SECRET_KEY:
+    logging.getLogger(__name__).warning("SECRET_KEY is not set; tokens cannot be signed or verified")
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
@@ -34,4 +43,24 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+def create_refresh_token() -> str:
+    # Opaque and random; nothing about the user can be read from it
+    return secrets.token_urlsafe(32)
+
+def hash_refresh_token(token: str) -> str:
+    # 256 random bits need no slow hash: SHA-256 keeps the stored value
+    # useless to a reader of the table and the lookup a single index probe
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def token_subject(authorization: Optional[str]) -> Optional[int]:
+    # User id from an "Authorization: Bearer <jwt>" header value, or None.
+    # The signature is checked, so the id can be trusted for routing.
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM])
+        return int(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
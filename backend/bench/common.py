@@ -0,0 +1,103 @@
+# backend/bench/common.py
+# Shared helpers for the benchmark scripts; stdlib only so they run
+# against any deployment without extra installs
+import json
+import struct
+import time
+import uuid
+import zlib
+import urllib.error
+import urllib.request
+
+DEFAULT_BASE_URL = "http://localhost:8000"
+
+# Accounts created by seed.py; the suite logs in as these
+BENCH_PASSWORD = "benchpassword123"
+
+def bench_phone(index):
+    return f"+1555{index:07d}"
+
+def bench_username(index):
+    return f"bench_user_{index}"
+
+def request(base_url, method, path, body=None, token=None, headers=None, data=None):
+    # Returns (status, seconds, response headers, raw body). body is sent
+    # as JSON; data is sent as-is with whatever Content-Type headers set.
+    all_headers = dict(headers or {})
+    if body is not None:
+        data = json.dumps(body).encode()
+        all_headers["Content-Type"] = "application/json"
+    if token:
+        all_headers["Authorization"] = f"Bearer {token}"
+
+    req = urllib.request.Request(base_url + path, data=data, method=method, headers=all_headers)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req) as response:
+            payload = response.read()
+            return response.status, time.perf_counter() - started, dict(response.headers), payload
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        return e.code, time.perf_counter() - started, dict(e.headers), payload
+
+def header(headers, name):
+    # Response header lookup regardless of the case the server used
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+def login(base_url, phone_number, password):
+    status, _, _, payload = request(
+        base_url, "POST", "/auth/login",
+        body={"phone_number": phone_number, "password": password}
+    )
+    if status != 200:
+        raise RuntimeError(f"Login failed with {status}: {payload[:200]!r}")
+    return json.loads(payload)["access_token"]
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(latencies, elapsed):
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+def multipart(fields, files):
+    # (body, content type) for a multipart/form-data upload; files maps a
+    # field name to (filename, content type, bytes)
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, (filename, content_type, payload) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n".encode() + payload + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+def solid_png(width, height, rgb):
+    # Small valid PNG of one colour, so uploads need no image files
+    def chunk(kind, payload):
+        return (struct.pack(">I", len(payload)) + kind + payload
+                + struct.pack(">I", zlib.crc32(kind + payload) & 0xFFFFFFFF))
+
+    row = b"\x00" + bytes(rgb) * width
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height))
+            + chunk(b"IEND", b""))
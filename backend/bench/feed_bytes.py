@@ -0,0 +1,54 @@
+# backend/bench/feed_bytes.py
+# Bytes a browser downloads for the media on one feed page: the full
+# originals versus the thumbnails the feed now renders.
+#
+#   python feed_bytes.py --phone +9999999999 --password testpassword123
+import argparse
+import json
+from common import DEFAULT_BASE_URL, request, login
+
+def media_size(url):
+    # Download instead of HEAD so servers without Content-Length still count
+    status, _, _, payload = request(url, "GET", "")
+    return len(payload) if status == 200 else 0
+
+def run(base_url, phone, password, limit):
+    token = login(base_url, phone, password)
+    status, _, _, payload = request(base_url, "GET", f"/posts/?limit={limit}", token=token)
+    if status != 200:
+        raise RuntimeError(f"Feed request failed with {status}")
+    posts = json.loads(payload)
+
+    original_bytes = 0
+    feed_bytes = 0
+    images = 0
+    for post in posts:
+        if post.get("media_type") != "image" or not post.get("media_url"):
+            continue
+        images += 1
+        original = media_size(post["media_url"])
+        original_bytes += original
+        if post.get("thumbnail_url"):
+            feed_bytes += media_size(post["thumbnail_url"])
+        else:
+            feed_bytes += original
+
+    json_bytes = len(payload)
+    return {
+        "posts": len(posts),
+        "images": images,
+        "json_bytes": json_bytes,
+        "before_bytes": json_bytes + original_bytes,
+        "after_bytes": json_bytes + feed_bytes,
+        "saved_pct": round(100 * (1 - feed_bytes / original_bytes), 1) if original_bytes else 0.0,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--phone", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.base_url, args.phone, args.password, args.limit), indent=2))
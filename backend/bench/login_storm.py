@@ -0,0 +1,66 @@
+# backend/bench/login_storm.py
+# Login throughput and feed latency while a burst of logins runs.
+#
+#   python login_storm.py --phone +9999999999 --password testpassword123
+import argparse
+import json
+import threading
+import time
+from common import DEFAULT_BASE_URL, request, login, summarize
+
+def run(base_url, phone, password, login_threads, feed_threads, duration):
+    token = login(base_url, phone, password)
+    stop_at = time.perf_counter() + duration
+
+    results = {"login": [], "login_503": 0, "feed": []}
+    lock = threading.Lock()
+
+    def login_worker():
+        while time.perf_counter() < stop_at:
+            status, elapsed, _, _ = request(
+                base_url, "POST", "/auth/login",
+                body={"phone_number": phone, "password": password}
+            )
+            with lock:
+                if status == 200:
+                    results["login"].append(elapsed)
+                elif status == 503:
+                    results["login_503"] += 1
+
+    def feed_worker():
+        while time.perf_counter() < stop_at:
+            status, elapsed, _, _ = request(base_url, "GET", "/posts/?limit=20", token=token)
+            if status == 200:
+                with lock:
+                    results["feed"].append(elapsed)
+
+    threads = [threading.Thread(target=login_worker) for _ in range(login_threads)]
+    threads += [threading.Thread(target=feed_worker) for _ in range(feed_threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "login": summarize(results["login"], elapsed),
+        "login_rejected_503": results["login_503"],
+        "feed": summarize(results["feed"], elapsed),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--phone", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--login-threads", type=int, default=32)
+    parser.add_argument("--feed-threads", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+
+    report = run(
+        args.base_url, args.phone, args.password,
+        args.login_threads, args.feed_threads, args.duration
+    )
+    print(json.dumps(report, indent=2))
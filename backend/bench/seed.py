@@ -0,0 +1,138 @@
+# backend/bench/seed.py
+# Fill a database with benchmark users, posts and rankings. Uses the app's
+# models and DATABASE_URL (SQLite or PostgreSQL), so run it with the app's
+# requirements installed and before starting the server:
+#
+#   DATABASE_URL=sqlite:///./bench.db python seed.py --reset --users 200 --posts 2000 --rankings 20000
+#
+# Users are bench_user_<n> with phone bench_phone(n) and BENCH_PASSWORD,
+# numbered from 1. Seeding is deterministic for a given --seed.
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from sqlalchemy import insert, select, func
+from common import BENCH_PASSWORD, bench_phone, bench_username
+from database import engine, SessionLocal, Base
+from models.user import User
+from models.post import Post
+from models.ranking import Ranking
+from services.ranking_service import RankingService
+from services.user_stats_service import UserStatsService
+from utils.security import get_password_hash
+from utils import geo
+
+BATCH_SIZE = 1000
+
+# Area the seeded posts are scattered over, for the nearby feed
+CENTER_LAT = 27.7172
+CENTER_LNG = 85.3240
+SPREAD_DEGREES = 0.1
+
+async def insert_batched(db, model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        await db.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+async def seed(users, posts, rankings, reset, seed_value):
+    rng = random.Random(seed_value)
+
+    async with engine.begin() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with SessionLocal() as db:
+        # Continue numbering after bench users from an earlier run
+        first_user = await db.scalar(
+            select(func.count(User.id)).where(User.username.like("bench_user_%"))
+        )
+        # Rows from an earlier run are left alone; only new ones get votes
+        last_user_id = (await db.scalar(select(func.max(User.id)))) or 0
+        last_post_id = (await db.scalar(select(func.max(Post.id)))) or 0
+
+        # PBKDF2 is slow by design; every bench user shares one hash
+        hashed = get_password_hash(BENCH_PASSWORD)
+        await insert_batched(db, User, [
+            {
+                "username": bench_username(first_user + index),
+                "phone_number": bench_phone(first_user + index),
+                "hashed_password": hashed,
+                "national_id": f"BENCH{first_user + index:07d}",
+            }
+            for index in range(1, users + 1)
+        ])
+        result = await db.execute(select(User.id).where(User.id > last_user_id))
+        user_ids = [row[0] for row in result.all()]
+
+        now = datetime.now(timezone.utc)
+        post_rows = []
+        for index in range(posts):
+            lat = CENTER_LAT + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES)
+            lng = CENTER_LNG + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES)
+            post_rows.append({
+                "text": f"Bench issue {index}: {rng.choice(ISSUES)} near {rng.choice(PLACES)}",
+                "user_id": rng.choice(user_ids),
+                "latitude": lat,
+                "longitude": lng,
+                "geohash": geo.encode(lat, lng),
+                "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 30)),
+            })
+        await insert_batched(db, Post, post_rows)
+        result = await db.execute(select(Post.id, Post.user_id).where(Post.id > last_post_id))
+        post_owners = dict(result.all())
+        post_ids = list(post_owners)
+
+        # Unique (user, post) pairs, never on the voter's own post
+        pairs = set()
+        attempts = 0
+        while len(pairs) < rankings and attempts < rankings * 10:
+            attempts += 1
+            user_id = rng.choice(user_ids)
+            post_id = rng.choice(post_ids)
+            if post_owners[post_id] != user_id:
+                pairs.add((user_id, post_id))
+        await insert_batched(db, Ranking, [
+            {
+                "user_id": user_id,
+                "post_id": post_id,
+                "rank_value": rng.randint(1, 3),
+                "ranked_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 30)),
+            }
+            for user_id, post_id in sorted(pairs)
+        ])
+        await db.commit()
+
+        # Counters and averages in set-based passes
+        await RankingService.rebuild_post_aggregates(db)
+        await UserStatsService.rebuild(db)
+        await db.commit()
+
+    await engine.dispose()
+    return {"users": users, "posts": posts, "rankings": len(pairs)}
+
+ISSUES = [
+    "broken streetlight", "pothole", "overflowing garbage", "water leak",
+    "blocked drain", "fallen tree", "damaged footpath", "power outage",
+]
+PLACES = ["the school", "the market", "the bus stop", "the temple", "the river", "the hospital"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--rankings", type=int, default=20000)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report = asyncio.run(seed(args.users, args.posts, args.rankings, args.reset, args.seed))
+    report["seconds"] = round(time.perf_counter() - started, 1)
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,145 @@
+# backend/bench/serialize.py
+# CPU time and peak allocations to build one feed page, for the old path (ORM
+# objects validated into PostResponse, then jsonable_encoder) versus the
+# listing path (column rows to dicts, rendered with orjson). Runs
+# in-process against an in-memory SQLite database, so it needs the app's
+# requirements installed but no server.
+#
+#   python serialize.py --posts 100 --iterations 500
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from database import Base
+from models.post import Post
+from models.ranking import Ranking
+from models.user import User
+from schemas.post import PostResponse
+from services.post_service import post_listing_query, post_row_to_dict
+from utils.http_cache import render_json
+
+def seed(engine, count):
+    now = datetime.now(timezone.utc)
+    with Session(engine) as db:
+        user = User(username="bench", phone_number="+10000000000", hashed_password="x", national_id="0")
+        voters = [
+            User(username=f"voter{n}", phone_number=f"+1000000000{n + 1}", hashed_password="x", national_id="0")
+            for n in range(3)
+        ]
+        db.add_all([user, *voters])
+        db.flush()
+        for index in range(count):
+            # Zero to three real votes per post, with aggregates to match
+            votes = [(index + n) % 3 + 1 for n in range(index % 4)]
+            post = Post(
+                text=f"Broken streetlight number {index} on the main road, dark at night",
+                media_url=f"https://example.com/media/{index}.jpg",
+                media_type="image",
+                media_status="ready",
+                thumbnail_url=f"https://example.com/media/{index}-320.webp",
+                media_variants={"webp": {"320": "https://example.com/a.webp"}},
+                latitude=27.7 + index / 1000,
+                longitude=85.3 + index / 1000,
+                user_id=user.id,
+                created_at=now - timedelta(minutes=index),
+                total_rankings=len(votes),
+                average_rank=round(sum(votes) / len(votes), 2) if votes else 0.0,
+                rank_1_count=votes.count(1),
+                rank_2_count=votes.count(2),
+                rank_3_count=votes.count(3),
+            )
+            post.rankings = [
+                Ranking(user_id=voter.id, rank_value=value) for voter, value in zip(voters, votes)
+            ]
+            db.add(post)
+        db.commit()
+
+def _validate(post):
+    # PostResponse from an ORM object under pydantic v2 or v1
+    if hasattr(PostResponse, "model_validate"):
+        return PostResponse.model_validate(post, from_attributes=True)
+    return PostResponse.from_orm(post)
+
+def orm_page(engine, limit):
+    # Listing as it was: full ORM objects, owner patched on, one pydantic
+    # model per post, then the generic encoder
+    with Session(engine) as db:
+        rows = db.execute(
+            select(Post, User.username).join(User, Post.user_id == User.id)
+            .order_by(Post.created_at.desc(), Post.id.desc()).limit(limit)
+        ).all()
+        posts = []
+        for post, owner_username in rows:
+            post.owner_username = owner_username
+            posts.append(post)
+        data = jsonable_encoder([_validate(post) for post in posts])
+        return json.dumps(data, separators=(",", ":")).encode()
+
+def row_page(engine, limit):
+    with Session(engine) as db:
+        rows = db.execute(
+            post_listing_query().order_by(Post.created_at.desc(), Post.id.desc()).limit(limit)
+        ).all()
+        return render_json([post_row_to_dict(row) for row in rows])
+
+def measure(build, engine, limit, iterations):
+    for _ in range(10):
+        build(engine, limit)
+
+    started = time.process_time()
+    for _ in range(iterations):
+        build(engine, limit)
+    cpu = (time.process_time() - started) / iterations
+
+    # Peak memory allocated while building one page, measured separately
+    # so tracing doesn't skew the CPU numbers
+    samples = min(iterations, 50)
+    peak_bytes = 0
+    tracemalloc.start()
+    for _ in range(samples):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        build(engine, limit)
+        peak_bytes += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return {
+        "cpu_ms": round(cpu * 1000, 3),
+        "peak_alloc_kib": round(peak_bytes / samples / 1024, 1),
+    }
+
+def run(posts, iterations):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    seed(engine, posts)
+
+    # Both paths must produce the same response
+    if json.loads(orm_page(engine, posts)) != json.loads(row_page(engine, posts)):
+        raise RuntimeError("ORM and row listings differ")
+
+    before = measure(orm_page, engine, posts, iterations)
+    after = measure(row_page, engine, posts, iterations)
+    return {
+        "posts": posts,
+        "before": before,
+        "after": after,
+        "cpu_saved_pct": round(100 * (1 - after["cpu_ms"] / before["cpu_ms"]), 1),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.posts, args.iterations), indent=2))
@@ -0,0 +1,218 @@
+# backend/bench/suite.py
+# End-to-end load test: signup, login, feed paging, single and batch
+# votes and post creation, one scenario at a time, each reporting
+# throughput and p50/p95/p99 latency.
+#
+# Seed the database with seed.py, start the server with local media
+# storage so uploads never leave the machine and rate limits off (every
+# request comes from one address), then save a baseline:
+#
+#   STORAGE_BACKEND=local RATE_LIMIT_ENABLED=false uvicorn main:app --port 8000
+#   python suite.py --save-baseline baseline.json
+#
+# Later runs compare against it and exit non-zero on a regression:
+#
+#   python suite.py --baseline baseline.json --tolerance 0.15
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from common import (
+    DEFAULT_BASE_URL, BENCH_PASSWORD, request, login, summarize, header,
+    bench_phone, multipart, solid_png
+)
+
+SCENARIOS = ("signup", "login", "feed", "vote", "batch", "create_post")
+FEED_PAGE_SIZE = 20
+FEED_MAX_PAGES = 5
+BATCH_SIZE = 20
+
+class Context:
+    def __init__(self, base_url, users):
+        self.base_url = base_url
+        self.users = users
+        # (token, ids of posts that user may vote on) per driving user
+        self.sessions = []
+
+    def prepare(self, logins):
+        # Log in a handful of seeded users; each one's feed already
+        # leaves out their own posts, so votes on it never get a 400
+        for index in range(1, min(logins, self.users) + 1):
+            token = login(self.base_url, bench_phone(index), BENCH_PASSWORD)
+            status, _, _, payload = request(self.base_url, "GET", "/posts/?limit=100", token=token)
+            if status != 200:
+                raise RuntimeError(f"Feed request failed with {status}")
+            post_ids = [post["id"] for post in json.loads(payload)]
+            if not post_ids:
+                raise RuntimeError("The feed is empty; run seed.py first")
+            self.sessions.append((token, post_ids))
+
+def signup(ctx, rng):
+    # Fresh account every time; phone numbers outside the seeded range
+    suffix = uuid.uuid4().int % 10 ** 9
+    return [request(ctx.base_url, "POST", "/auth/signup", body={
+        "username": f"bench_signup_{uuid.uuid4().hex[:12]}",
+        "phone_number": f"+1666{suffix:09d}",
+        "password": BENCH_PASSWORD,
+        "national_id": f"SIGNUP{suffix:09d}",
+    })]
+
+def login_once(ctx, rng):
+    index = rng.randint(1, ctx.users)
+    return [request(ctx.base_url, "POST", "/auth/login", body={
+        "phone_number": bench_phone(index),
+        "password": BENCH_PASSWORD,
+    })]
+
+def feed(ctx, rng):
+    # Page through the feed with the cursor, like infinite scroll does
+    token, _ = rng.choice(ctx.sessions)
+    results = []
+    path = f"/posts/?limit={FEED_PAGE_SIZE}"
+    for _ in range(FEED_MAX_PAGES):
+        result = request(ctx.base_url, "GET", path, token=token)
+        results.append(result)
+        cursor = header(result[2], "X-Next-Cursor")
+        if result[0] != 200 or not cursor:
+            break
+        path = f"/posts/?limit={FEED_PAGE_SIZE}&cursor={cursor}"
+    return results
+
+def vote(ctx, rng):
+    token, post_ids = rng.choice(ctx.sessions)
+    return [request(ctx.base_url, "POST", "/rankings/", token=token, body={
+        "post_id": rng.choice(post_ids),
+        "rank_value": rng.randint(1, 3),
+    })]
+
+def batch(ctx, rng):
+    token, post_ids = rng.choice(ctx.sessions)
+    return [request(
+        ctx.base_url, "POST", "/rankings/batch", token=token,
+        body={"post_ids": rng.sample(post_ids, min(BATCH_SIZE, len(post_ids)))}
+    )]
+
+def create_post(ctx, rng):
+    # Random colour so every upload is new media, not a dedup hit
+    image = solid_png(64, 64, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    data, content_type = multipart(
+        {"text": f"Bench upload {uuid.uuid4().hex[:8]}"},
+        {"media_file": ("bench.png", "image/png", image)}
+    )
+    token, _ = rng.choice(ctx.sessions)
+    return [request(
+        ctx.base_url, "POST", "/posts/", token=token,
+        data=data, headers={"Content-Type": content_type}
+    )]
+
+ACTIONS = {
+    "signup": signup,
+    "login": login_once,
+    "feed": feed,
+    "vote": vote,
+    "batch": batch,
+    "create_post": create_post,
+}
+
+def run_scenario(ctx, name, concurrency, duration, seed):
+    action = ACTIONS[name]
+    stop_at = time.perf_counter() + duration
+    latencies = []
+    errors = {}
+    lock = threading.Lock()
+
+    def worker(worker_seed):
+        rng = random.Random(worker_seed)
+        while time.perf_counter() < stop_at:
+            for status, elapsed, _, _ in action(ctx, rng):
+                with lock:
+                    if status in (200, 202):
+                        latencies.append(elapsed)
+                    else:
+                        errors[status] = errors.get(status, 0) + 1
+
+    threads = [threading.Thread(target=worker, args=(seed + index,)) for index in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    report = summarize(latencies, elapsed)
+    report["errors"] = {str(status): count for status, count in sorted(errors.items())}
+    return report
+
+def compare(report, baseline, tolerance):
+    # Regressions: throughput down, or a latency percentile up, by more
+    # than the tolerance compared to the saved baseline
+    regressions = []
+    for name, current in report["scenarios"].items():
+        saved = baseline.get("scenarios", {}).get(name)
+        if not saved:
+            continue
+        if saved["rps"] and current["rps"] < saved["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {current['rps']} < baseline {saved['rps']}")
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if saved[key] and current[key] > saved[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {current[key]} > baseline {saved[key]}")
+        if current["errors"] and not saved.get("errors"):
+            regressions.append(f"{name}: errors {current['errors']}")
+    return regressions
+
+def run(args):
+    ctx = Context(args.base_url, args.users)
+    ctx.prepare(args.logins)
+
+    report = {
+        "config": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "users": args.users,
+        },
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        report["scenarios"][name] = run_scenario(ctx, name, args.concurrency, args.duration, args.seed)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--users", type=int, default=200, help="Seeded users to log in as")
+    parser.add_argument("--logins", type=int, default=10, help="Seeded users driving the load")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per scenario")
+    parser.add_argument(
+        "--scenarios", type=lambda value: value.split(","), default=list(SCENARIOS),
+        help="Comma-separated subset of " + ",".join(SCENARIOS)
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", help="Compare against this saved report")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    parser.add_argument("--save-baseline", help="Write this run's report here")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:", file=sys.stderr)
+            for regression in regressions:
+                print("  " + regression, file=sys.stderr)
+            sys.exit(1)
@@ -0,0 +1,77 @@
+# backend/bench/throughput.py
+# Requests per second and latency for feed reads and votes.
+#
+# Run it once against a server started from the commit before the async
+# database layer and once against the current tree, with the same data,
+# to compare the two stacks:
+#
+#   python throughput.py --phone +9999999999 --password testpassword123
+import argparse
+import json
+import random
+import threading
+import time
+from common import DEFAULT_BASE_URL, request, login, summarize
+
+def run(base_url, phone, password, concurrency, duration, vote_ratio):
+    token = login(base_url, phone, password)
+
+    # Vote on posts the user can see in the feed (never their own)
+    status, _, _, payload = request(base_url, "GET", "/posts/?limit=100", token=token)
+    if status != 200:
+        raise RuntimeError(f"Feed request failed with {status}")
+    post_ids = [post["id"] for post in json.loads(payload)]
+    if not post_ids:
+        raise RuntimeError("The feed is empty; seed some posts by other users first")
+
+    stop_at = time.perf_counter() + duration
+    results = {"feed": [], "vote": [], "errors": 0}
+    lock = threading.Lock()
+
+    def worker():
+        rng = random.Random()
+        while time.perf_counter() < stop_at:
+            if rng.random() < vote_ratio:
+                kind = "vote"
+                status, elapsed, _, _ = request(
+                    base_url, "POST", "/rankings/", token=token,
+                    body={"post_id": rng.choice(post_ids), "rank_value": rng.randint(1, 3)}
+                )
+            else:
+                kind = "feed"
+                status, elapsed, _, _ = request(base_url, "GET", "/posts/?limit=20", token=token)
+            with lock:
+                if status in (200, 202):
+                    results[kind].append(elapsed)
+                else:
+                    results["errors"] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "feed": summarize(results["feed"], elapsed),
+        "vote": summarize(results["vote"], elapsed),
+        "errors": results["errors"],
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--phone", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--vote-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run(
+        args.base_url, args.phone, args.password,
+        args.concurrency, args.duration, args.vote_ratio
+    )
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,41 @@
+# backend/tests/conftest.py
+import os
+import sys
+import tempfile
+
+# The app reads its settings at import time, so point it at a throwaway
+# SQLite database before any test imports it
+_TMP_DIR = tempfile.mkdtemp(prefix="community-help-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_TMP_DIR, 'test.db')}",
+    "SECRET_KEY": "test-secret-key",
+    "ALGORITHM": "HS256",
+    "STORAGE_BACKEND": "local",
+    "LOCAL_MEDIA_ROOT": os.path.join(_TMP_DIR, "media"),
+    "RATE_LIMIT_ENABLED": "false",
+    "LEADERBOARD_RECOMPUTE_INTERVAL": "3600",
+    "LOG_LEVEL": "WARNING",
+})
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import pytest
+from fastapi.testclient import TestClient
+
+PASSWORD = "Password123!"
+
+@pytest.fixture(scope="session")
+def api():
+    # One app start for the whole run; tests keep apart by using their own users
+    from main import app
+    with TestClient(app) as client:
+        yield client
+
+def signup_and_login(client, username, phone):
+    client.post("/auth/signup", json={
+        "username": username, "phone_number": phone,
+        "password": PASSWORD, "national_id": "1234567",
+    })
+    response = client.post("/auth/login", json={"phone_number": phone, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
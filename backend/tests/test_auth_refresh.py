@@ -0,0 +1,31 @@
+# backend/tests/test_auth_refresh.py
+from conftest import signup_and_login
+from services import auth_service
+
+def _refresh(client, refresh_token):
+    return client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+def test_concurrent_reuse_keeps_the_session(api):
+    # Two tabs sharing one token refresh together: the slower one is
+    # refused, but the pair issued to the faster one keeps working
+    tokens = signup_and_login(api, "refreshtabs", "+15550000101")
+    first = _refresh(api, tokens["refresh_token"])
+    second = _refresh(api, tokens["refresh_token"])
+    assert first.status_code == 200
+    assert second.status_code == 401
+    assert _refresh(api, first.json()["refresh_token"]).status_code == 200
+
+def test_late_reuse_revokes_the_family(api, monkeypatch):
+    tokens = signup_and_login(api, "refreshreuse", "+15550000102")
+    rotated = _refresh(api, tokens["refresh_token"])
+    assert rotated.status_code == 200
+
+    # Pretend the old token comes back well after it was exchanged
+    monkeypatch.setattr(auth_service, "REFRESH_REUSE_GRACE_SECONDS", -60)
+    assert _refresh(api, tokens["refresh_token"]).status_code == 401
+    assert _refresh(api, rotated.json()["refresh_token"]).status_code == 401
+
+def test_logout_revokes_the_refresh_token(api):
+    tokens = signup_and_login(api, "refreshlogout", "+15550000103")
+    assert api.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+    assert _refresh(api, tokens["refresh_token"]).status_code == 401
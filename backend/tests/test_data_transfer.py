@@ -0,0 +1,124 @@
+# backend/tests/test_data_transfer.py
+import asyncio
+import csv
+import io
+import json
+import os
+import pytest
+from sqlalchemy import update
+from conftest import PASSWORD, signup_and_login
+from database import _create_engine
+from models.user import User
+from services.user_stats_service import UserStatsService
+
+async def _make_admin(username):
+    engine = _create_engine(os.environ["DATABASE_URL"])
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(update(User).where(User.username == username).values(is_admin=True))
+    finally:
+        await engine.dispose()
+
+@pytest.fixture(scope="module")
+def admin(api):
+    # Promoted before the first authenticated request, so no cached user
+    api.post("/auth/signup", json={
+        "username": "dataadmin", "phone_number": "+15550000201",
+        "password": PASSWORD, "national_id": "1234567",
+    })
+    asyncio.run(_make_admin("dataadmin"))
+    tokens = signup_and_login(api, "dataadmin", "+15550000201")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    admin_id = api.get("/auth/me", headers=headers).json()["id"]
+    return headers, admin_id
+
+def _upload(api, headers, table, body, data_format="ndjson"):
+    return api.post(
+        f"/data/import/{table}", params={"format": data_format},
+        files={"file": (f"{table}.{data_format}", body)}, headers=headers
+    )
+
+def test_import_then_export_round_trip(api, admin):
+    headers, admin_id = admin
+    voter = signup_and_login(api, "datavoter", "+15550000202")
+    voter_id = api.get("/auth/me", headers={"Authorization": f"Bearer {voter['access_token']}"}).json()["id"]
+
+    posts = "\n".join(json.dumps(post) for post in [
+        {"id": 9001, "user_id": admin_id, "text": "imported leak", "created_at": "2024-01-02T03:04:05Z"},
+        {"id": 9002, "user_id": admin_id, "text": "imported pothole", "latitude": 27.7, "longitude": 85.3},
+    ])
+    response = _upload(api, headers, "posts", posts)
+    assert response.json() == {"table": "posts", "imported": 2}
+
+    rankings = "user_id,post_id,rank_value\n" + f"{voter_id},9001,3\n{admin_id},9002,1\n"
+    response = _upload(api, headers, "rankings", rankings, "csv")
+    assert response.json() == {"table": "rankings", "imported": 2}
+
+    response = api.get("/data/export/posts", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200
+    exported = {int(row["id"]): row for row in csv.DictReader(io.StringIO(response.text))}
+    assert exported[9001]["rank_3_count"] == "1"
+    assert float(exported[9001]["average_rank"]) == 3.0
+    assert exported[9002]["total_rankings"] == "1"
+
+    response = api.get("/data/export/rankings", headers=headers)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert {(line["post_id"], line["rank_value"]) for line in lines} >= {(9001, 3), (9002, 1)}
+
+    dashboard = api.get("/users/me/dashboard", headers=headers).json()
+    assert dashboard["posts_count"] >= 2
+    assert dashboard["votes_received"] >= 2
+
+def test_bad_record_imports_nothing(api, admin):
+    headers, admin_id = admin
+    posts = (
+        json.dumps({"id": 9101, "user_id": admin_id, "text": "fine"}) + "\n"
+        + json.dumps({"id": 9102, "user_id": admin_id}) + "\n"
+    )
+    response = _upload(api, headers, "posts", posts)
+    assert response.status_code == 400
+    assert "Record 2" in response.json()["detail"]
+
+    response = api.get("/data/export/posts", headers=headers)
+    ids = {json.loads(line)["id"] for line in response.text.splitlines()}
+    assert 9101 not in ids
+
+def test_media_and_location_follow_the_api_rules(api, admin):
+    headers, admin_id = admin
+    bad_records = (
+        {"media_url": "https://example.com/a.gif", "media_type": "gif"},
+        {"media_url": "https://example.com/a.jpg"},
+        {"latitude": 91, "longitude": 0},
+    )
+    for fields in bad_records:
+        posts = json.dumps({"id": 9301, "user_id": admin_id, "text": "bad", **fields}) + "\n"
+        response = _upload(api, headers, "posts", posts)
+        assert response.status_code == 400, fields
+        assert response.json()["detail"].startswith("Record 1:")
+
+def test_conflicting_rows_are_rejected(api, admin):
+    headers, admin_id = admin
+    posts = json.dumps({"id": 9201, "user_id": admin_id, "text": "once"}) + "\n"
+    assert _upload(api, headers, "posts", posts).status_code == 200
+    assert _upload(api, headers, "posts", posts).status_code == 409
+
+def test_export_needs_an_admin(api):
+    tokens = signup_and_login(api, "datanobody", "+15550000203")
+    response = api.get("/data/export/posts", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert response.status_code == 403
+
+def test_failed_stats_rebuild_rolls_back_the_load(api, admin, monkeypatch):
+    headers, admin_id = admin
+
+    async def broken_rebuild(db):
+        raise RuntimeError("stats rebuild failed")
+
+    monkeypatch.setattr(UserStatsService, "rebuild", broken_rebuild)
+    posts = json.dumps({"id": 9301, "user_id": admin_id, "text": "half loaded"}) + "\n"
+    with pytest.raises(RuntimeError):
+        _upload(api, headers, "posts", posts)
+    monkeypatch.undo()
+
+    response = api.get("/data/export/posts", headers=headers)
+    ids = {json.loads(line)["id"] for line in response.text.splitlines()}
+    assert 9301 not in ids
@@ -0,0 +1,61 @@
+# backend/tests/test_feed_pagination.py
+import pytest
+from conftest import signup_and_login
+
+POSTS = 7
+PAGE_SIZE = 2
+MAX_PAGES = 100
+
+def _auth(tokens):
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+@pytest.fixture(scope="module")
+def client(api):
+    author = _auth(signup_and_login(api, "pageauthor", "+15550000001"))
+    reader = _auth(signup_and_login(api, "pagereader", "+15550000002"))
+    # Created within the same second or two, as server-stamped rows
+    post_ids = []
+    for number in range(POSTS):
+        response = api.post("/posts/", data={"text": f"post {number}"}, headers=author)
+        assert response.status_code == 200, response.text
+        post_ids.append(response.json()["id"])
+    # Some votes so the priority and most_ranked keys differ, with ties
+    for post_id, rank_value in zip(post_ids, (3, 3, 1, 2)):
+        response = api.post(
+            "/rankings/", json={"post_id": post_id, "rank_value": rank_value}, headers=reader
+        )
+        assert response.status_code == 200, response.text
+    yield api, author, reader, post_ids
+
+def _walk(client, path, headers, params):
+    # Follow X-Next-Cursor until the last page
+    ids, cursor = [], None
+    for _ in range(MAX_PAGES):
+        page_params = dict(params, limit=PAGE_SIZE)
+        if cursor:
+            page_params["cursor"] = cursor
+        response = client.get(path, params=page_params, headers=headers)
+        assert response.status_code == 200, response.text
+        ids.extend(post["id"] for post in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+    pytest.fail(f"{path} {params} never reached its last page: {ids}")
+
+@pytest.mark.parametrize("sort", ["newest", "oldest", "priority", "most_ranked"])
+def test_feed_pages_through_every_post_once(client, sort):
+    client, _, reader, post_ids = client
+    ids = _walk(client, "/posts/", reader, {"sort": sort})
+    # Other tests' posts may be in the feed too; each post appears once
+    assert len(ids) == len(set(ids))
+    ours = [post_id for post_id in ids if post_id in post_ids]
+    assert sorted(ours) == sorted(post_ids)
+    if sort == "oldest":
+        assert ours == sorted(ours)
+    elif sort == "newest":
+        assert ours == sorted(ours, reverse=True)
+
+def test_my_posts_pages_through_every_post_once(client):
+    client, author, _, post_ids = client
+    ids = _walk(client, "/posts/my-posts", author, {})
+    assert ids == sorted(post_ids, reverse=True)
@@ -0,0 +1,25 @@
+# backend/tests/test_http_cache.py
+from datetime import datetime, timezone
+from starlette.requests import Request
+from utils.http_cache import CachedResponse, conditional_response
+
+def _request(**headers):
+    return Request({
+        "type": "http", "method": "GET", "path": "/posts/",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+def test_last_modified_round_trips_through_if_modified_since():
+    entry = CachedResponse(b"[]", {}, datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc))
+    first = conditional_response(_request(), entry)
+    assert first.status_code == 200
+    assert first.headers["last-modified"] == "Fri, 02 Jan 2026 03:04:06 GMT"
+
+    again = conditional_response(_request(if_modified_since=first.headers["last-modified"]), entry)
+    assert again.status_code == 304
+
+    # A stale ETag wins over a matching date
+    changed = conditional_response(_request(
+        if_none_match='"stale"', if_modified_since=first.headers["last-modified"]
+    ), entry)
+    assert changed.status_code == 200
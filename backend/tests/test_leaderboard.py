@@ -0,0 +1,101 @@
+# backend/tests/test_leaderboard.py
+import asyncio
+import os
+from sqlalchemy import select
+from database import _create_engine, _sessionmaker
+from models.post import Post
+from models.post_urgency import PostUrgency
+from models.ranking import Ranking
+from models.user import User
+from schemas.post import LeaderboardPeriod
+from services.leaderboard import Leaderboard, PERIODS
+
+async def _run():
+    engine = _create_engine(os.environ["DATABASE_URL"])
+    sessions = _sessionmaker(engine)
+    board = Leaderboard(session_factory=sessions)
+    try:
+        async with sessions() as db:
+            owner = User(username="boardowner", phone_number="+15550000301",
+                         hashed_password="x", national_id="1234567")
+            voter = User(username="boardvoter", phone_number="+15550000302",
+                         hashed_password="x", national_id="1234567")
+            db.add_all([owner, voter])
+            await db.flush()
+            post = Post(text="brand new", user_id=owner.id)
+            db.add(post)
+            await db.commit()
+            post_id, voter_id = post.id, voter.id
+
+        await board.recompute()
+
+        # First vote on the new post, nudged in as the API does
+        async with sessions() as db:
+            db.add(Ranking(user_id=voter_id, post_id=post_id, rank_value=3))
+            await board.nudge(db, [(post_id, 3, None)])
+            await db.commit()
+
+        # Recompute whose vote snapshot was read just before that vote
+        score_rows = board._score_rows
+        def without_new_vote(votes, reference_at):
+            rows_by_period = score_rows(votes, reference_at)
+            return {
+                period: [row for row in rows if row["post_id"] != post_id]
+                for period, rows in rows_by_period.items()
+            }
+        board._score_rows = without_new_vote
+        await board.recompute()
+
+        async with sessions() as db:
+            return set((await db.scalars(
+                select(PostUrgency.period).where(PostUrgency.post_id == post_id)
+            )).all())
+    finally:
+        await engine.dispose()
+
+def test_recompute_keeps_rows_nudged_meanwhile(api):
+    periods = asyncio.run(_run())
+    assert periods == {period.value for period in PERIODS}
+
+async def _run_other_worker():
+    engine = _create_engine(os.environ["DATABASE_URL"])
+    sessions = _sessionmaker(engine)
+    # Two workers: one has recomputed, the other never has
+    recomputing = Leaderboard(session_factory=sessions)
+    other = Leaderboard(session_factory=sessions)
+    try:
+        async with sessions() as db:
+            owner = User(username="workerowner", phone_number="+15550000303",
+                         hashed_password="x", national_id="1234567")
+            voters = [
+                User(username=f"workervoter{i}", phone_number=f"+1555000031{i}",
+                     hashed_password="x", national_id="1234567")
+                for i in range(2)
+            ]
+            db.add_all([owner, *voters])
+            await db.flush()
+            post = Post(text="two workers", user_id=owner.id)
+            db.add(post)
+            await db.flush()
+            db.add(Ranking(user_id=voters[0].id, post_id=post.id, rank_value=2))
+            await db.commit()
+            post_id, voter_id = post.id, voters[1].id
+
+        await recomputing.recompute()
+
+        async with sessions() as db:
+            db.add(Ranking(user_id=voter_id, post_id=post_id, rank_value=3))
+            await other.nudge(db, [(post_id, 3, None)])
+            await db.commit()
+
+        async with sessions() as db:
+            entries = await Leaderboard.top(db, LeaderboardPeriod.DAY, 100)
+        return {entry[0]["id"]: entry for entry in entries}[post_id]
+    finally:
+        await engine.dispose()
+
+def test_nudge_from_another_worker_uses_stored_reference(api):
+    _, score, vote_count = asyncio.run(_run_other_worker())
+    assert vote_count == 2
+    # Both votes are seconds old, so they still weigh almost fully
+    assert abs(score - 5) < 0.01
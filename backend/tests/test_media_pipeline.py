@@ -0,0 +1,28 @@
+# backend/tests/test_media_pipeline.py
+import os
+import subprocess
+import sys
+from services import media_pipeline
+
+def test_spool_files_are_claimed_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_pipeline, "MEDIA_SPOOL_DIR", str(tmp_path))
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+
+    (tmp_path / "post-1.jpg").write_bytes(b"one")
+    (tmp_path / f"post-2.claimed-{exited.pid}.png").write_bytes(b"two")
+    (tmp_path / f"post-3.claimed-{os.getpid()}.jpg").write_bytes(b"three")
+
+    path, busy = media_pipeline._claim_spool(1)
+    assert path == str(tmp_path / f"post-1.claimed-{os.getpid()}.jpg") and not busy
+    assert open(path, "rb").read() == b"one"
+    # Already ours, so nobody else may take it again
+    assert media_pipeline._claim_spool(1) == (None, True)
+
+    # A claim left by a process that is gone is taken over
+    path, busy = media_pipeline._claim_spool(2)
+    assert path == str(tmp_path / f"post-2.claimed-{os.getpid()}.png") and not busy
+
+    assert media_pipeline._claim_spool(3) == (None, True)
+    # Nothing spooled at all: the caller marks the post failed
+    assert media_pipeline._claim_spool(4) == (None, False)
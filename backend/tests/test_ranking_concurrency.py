@@ -0,0 +1,84 @@
+# backend/tests/test_ranking_concurrency.py
+import asyncio
+import os
+import random
+from sqlalchemy import select, func
+from database import _create_engine, _sessionmaker
+from models.post import Post
+from models.ranking import Ranking
+from models.user import User
+from services.ranking_service import RankingService, RANK_VALUES
+
+VOTERS = 20
+VOTES_PER_VOTER = 3
+
+async def _vote(sessions, user_id, post_id, rank_value):
+    async with sessions() as db:
+        await RankingService.add_or_update_ranking(db, user_id, post_id, rank_value)
+
+async def _run(seed):
+    # Own engine, bound to this event loop rather than the app's
+    engine = _create_engine(os.environ["DATABASE_URL"])
+    sessions = _sessionmaker(engine)
+    try:
+        async with sessions() as db:
+            users = [
+                User(username=f"race{seed}_{n}", phone_number=f"+1666{seed:03d}{n:04d}",
+                     hashed_password="x", national_id="1234567")
+                for n in range(VOTERS + 1)
+            ]
+            db.add_all(users)
+            await db.flush()
+            post = Post(text="race target", user_id=users[0].id)
+            db.add(post)
+            await db.commit()
+            voter_ids = [user.id for user in users[1:]]
+            post_id = post.id
+
+        # Every voter's first vote and changes of it, all at once, so the
+        # same vote is inserted and changed by parallel requests
+        rng = random.Random(seed)
+        votes = [
+            _vote(sessions, user_id, post_id, rng.choice(RANK_VALUES))
+            for user_id in voter_ids
+            for _ in range(VOTES_PER_VOTER)
+        ]
+        rng.shuffle(votes)
+        await asyncio.gather(*votes)
+
+        async with sessions() as db:
+            post = await db.get(Post, post_id)
+            actual = dict((await db.execute(
+                select(Ranking.rank_value, func.count())
+                .where(Ranking.post_id == post_id)
+                .group_by(Ranking.rank_value)
+            )).all())
+        return post, actual
+    finally:
+        await engine.dispose()
+
+def test_counters_match_rankings_under_parallel_votes(api):
+    # api: app started, so the tables exist
+    for seed in range(3):
+        post, actual = asyncio.run(_run(seed))
+        for value in RANK_VALUES:
+            assert getattr(post, f"rank_{value}_count") == actual.get(value, 0)
+        assert post.total_rankings == sum(actual.values()) == VOTERS
+        weighted = sum(value * count for value, count in actual.items())
+        assert post.average_rank == round(weighted / VOTERS, 2)
+
+async def _delta_on_missing_post():
+    engine = _create_engine(os.environ["DATABASE_URL"])
+    sessions = _sessionmaker(engine)
+    try:
+        async with sessions() as db:
+            missing_id = (await db.scalar(select(func.max(Post.id))) or 0) + 1000
+            try:
+                await RankingService._apply_post_delta(db, missing_id, {1: 1})
+            except ValueError as e:
+                return str(e)
+    finally:
+        await engine.dispose()
+
+def test_delta_on_deleted_post_is_not_found(api):
+    assert asyncio.run(_delta_on_missing_post()) == "Post not found"
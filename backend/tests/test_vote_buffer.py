@@ -0,0 +1,54 @@
+# backend/tests/test_vote_buffer.py
+import asyncio
+import os
+from sqlalchemy import select
+from database import _create_engine, _sessionmaker
+from models.post import Post
+from models.ranking import Ranking
+from models.user import User
+from services.vote_buffer import VoteBuffer
+
+async def _run():
+    engine = _create_engine(os.environ["DATABASE_URL"])
+    sessions = _sessionmaker(engine)
+    buffer = VoteBuffer(session_factory=sessions, max_retries=2)
+    try:
+        async with sessions() as db:
+            owner = User(username="bufferowner", phone_number="+15550000401",
+                         hashed_password="x", national_id="1234567")
+            voter = User(username="buffervoter", phone_number="+15550000402",
+                         hashed_password="x", national_id="1234567")
+            db.add_all([owner, voter])
+            await db.flush()
+            post = Post(text="buffered", user_id=owner.id)
+            hidden = Post(text="hidden", user_id=owner.id, is_hidden=True)
+            db.add_all([post, hidden])
+            await db.commit()
+            voter_id, post_id, hidden_id = voter.id, post.id, hidden.id
+
+        buffer.add(voter_id, post_id, 2)
+        buffer.add(voter_id, hidden_id, 3)
+        # No such user: the foreign key rejects this vote alone
+        buffer.add(999999, post_id, 1)
+
+        written = [await buffer.flush()]
+        depth_after_first = buffer.depth()
+        written.append(await buffer.flush())
+
+        async with sessions() as db:
+            votes = (await db.execute(
+                select(Ranking.user_id, Ranking.post_id, Ranking.rank_value).where(
+                    Ranking.post_id.in_([post_id, hidden_id])
+                )
+            )).all()
+        return written, depth_after_first, buffer.depth(), votes, (voter_id, post_id)
+    finally:
+        await engine.dispose()
+
+def test_flush_isolates_and_drops_rejected_votes(api):
+    written, depth_after_first, depth, votes, (voter_id, post_id) = asyncio.run(_run())
+    # The good vote and the skipped vote on the hidden post go through
+    assert written == [2, 0]
+    # The rejected vote is retried once, then dropped
+    assert depth_after_first == 1 and depth == 0
+    assert votes == [(voter_id, post_id, 2)]
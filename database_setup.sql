@@ -12,6 +12,7 @@ CREATE TABLE users (
     hashed_password TEXT NOT NULL,
     national_id VARCHAR(50) NOT NULL,
     is_active BOOLEAN DEFAULT TRUE,
+    is_admin BOOLEAN NOT NULL DEFAULT FALSE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -21,11 +22,35 @@ CREATE TABLE posts (
     text TEXT NOT NULL,
     media_url TEXT,
     media_type VARCHAR(10),
+    media_status VARCHAR(10),
+    media_hash VARCHAR(64),
+    thumbnail_url TEXT,
+    media_variants JSONB,
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
+    geohash VARCHAR(12),
+    is_hidden BOOLEAN NOT NULL DEFAULT FALSE,
     user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
-    total_rankings INTEGER DEFAULT 0,
-    average_rank DECIMAL(3,2) DEFAULT 0.00,
+    total_rankings INTEGER NOT NULL DEFAULT 0,
+    average_rank DECIMAL(3,2) NOT NULL DEFAULT 0.00,
+    rank_1_count INTEGER NOT NULL DEFAULT 0,
+    rank_2_count INTEGER NOT NULL DEFAULT 0,
+    rank_3_count INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE
+    updated_at TIMESTAMP WITH TIME ZONE,
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) STORED
+);
+
+-- Stored media, shared by every post that uploaded the same bytes
+CREATE TABLE media_assets (
+    id SERIAL PRIMARY KEY,
+    content_hash VARCHAR(64) UNIQUE NOT NULL,
+    storage_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    resource_type VARCHAR(10) NOT NULL,
+    variants JSONB,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Rankings table with unique constraint
@@ -38,38 +63,59 @@ CREATE TABLE rankings (
     UNIQUE(user_id, post_id)
 );
 
+-- Time-decayed urgency per post for the 24h / 7d / all-time leaderboards,
+-- recomputed periodically by the API and nudged on every vote
+CREATE TABLE post_urgency (
+    post_id INTEGER REFERENCES posts(id) ON DELETE CASCADE,
+    period VARCHAR(8) NOT NULL,
+    score DOUBLE PRECISION NOT NULL DEFAULT 0,
+    vote_count INTEGER NOT NULL DEFAULT 0,
+    computed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (post_id, period)
+);
+
+-- Per-user dashboard counters, kept current by the API on every post and
+-- vote write (rebuilt from posts and rankings when the table is empty)
+CREATE TABLE user_stats (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    posts_count INTEGER NOT NULL DEFAULT 0,
+    votes_received INTEGER NOT NULL DEFAULT 0,
+    votes_cast INTEGER NOT NULL DEFAULT 0,
+    high_priority_posts INTEGER NOT NULL DEFAULT 0,
+    medium_priority_posts INTEGER NOT NULL DEFAULT 0,
+    low_priority_posts INTEGER NOT NULL DEFAULT 0
+);
+
+-- Refresh tokens, stored as SHA-256 digests. Each refresh marks the token
+-- used and issues the next in its family; a used token presented again
+-- revokes the whole family.
+CREATE TABLE refresh_tokens (
+    id SERIAL PRIMARY KEY,
+    token_hash VARCHAR(64) UNIQUE NOT NULL,
+    family_id VARCHAR(32) NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    used_at TIMESTAMP WITH TIME ZONE,
+    revoked_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Indexes for performance
-CREATE INDEX idx_posts_user_id ON posts(user_id);
+CREATE INDEX ix_posts_user_id_created_at_id ON posts(user_id, created_at, id);
 CREATE INDEX idx_posts_created_at ON posts(created_at DESC);
+CREATE INDEX ix_posts_created_at_id ON posts(created_at, id);
+CREATE INDEX ix_posts_average_rank_created_at_id ON posts(average_rank, created_at, id);
+CREATE INDEX ix_posts_total_rankings_created_at_id ON posts(total_rankings, created_at, id);
+CREATE INDEX ix_posts_media_hash ON posts(media_hash);
+CREATE INDEX ix_posts_geohash ON posts(geohash varchar_pattern_ops);
+CREATE INDEX ix_posts_search_vector ON posts USING GIN (search_vector);
 CREATE INDEX idx_rankings_post_id ON rankings(post_id);
-CREATE INDEX idx_rankings_user_id ON rankings(user_id);
+CREATE INDEX ix_rankings_user_id_id ON rankings(user_id, id);
 CREATE INDEX idx_users_phone ON users(phone_number);
+CREATE INDEX ix_refresh_tokens_family_id ON refresh_tokens(family_id);
+CREATE INDEX ix_refresh_tokens_user_id ON refresh_tokens(user_id);
+CREATE INDEX ix_post_urgency_period_score ON post_urgency(period, score);
 
--- Function to update post rankings
-CREATE OR REPLACE FUNCTION update_post_rankings()
-RETURNS TRIGGER AS $$
-BEGIN
-    -- Update the post's ranking aggregates
-    UPDATE posts p
-    SET 
-        total_rankings = (
-            SELECT COUNT(*) 
-            FROM rankings r 
-            WHERE r.post_id = p.id
-        ),
-        average_rank = (
-            SELECT AVG(r.rank_value)::DECIMAL(3,2)
-            FROM rankings r 
-            WHERE r.post_id = p.id
-        )
-    WHERE p.id = NEW.post_id;
-    
-    RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
--- Trigger for rankings
-CREATE TRIGGER update_post_rankings_trigger
-AFTER INSERT OR UPDATE OR DELETE ON rankings
-FOR EACH ROW
-EXECUTE FUNCTION update_post_rankings();
\ No newline at end of file
+-- Post ranking aggregates (total_rankings, average_rank, rank_N_count)
+-- are maintained incrementally by the API on every vote, so there is no
+-- per-row recount trigger on rankings.
@@ -0,0 +1,135 @@
+-- database_upgrade.sql
+-- Brings a database created from an earlier database_setup.sql up to the
+-- current schema. Every statement is idempotent, so it is safe to run
+-- again, and on a database that is already current.
+--
+--   psql -U postgres -d community_help -f database_upgrade.sql
+
+BEGIN;
+
+-- Users: moderators
+ALTER TABLE users ADD COLUMN IF NOT EXISTS is_admin BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Posts: background media, shared assets and variants
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS media_status VARCHAR(10);
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS media_hash VARCHAR(64);
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS thumbnail_url TEXT;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS media_variants JSONB;
+-- Posts: location for the nearby feed
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS geohash VARCHAR(12);
+-- Posts: moderation
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS is_hidden BOOLEAN NOT NULL DEFAULT FALSE;
+-- Posts: per-value ranking counters, filled by the recount below
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS rank_1_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS rank_2_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS rank_3_count INTEGER NOT NULL DEFAULT 0;
+-- Posts: full-text search
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) STORED;
+
+CREATE TABLE IF NOT EXISTS media_assets (
+    id SERIAL PRIMARY KEY,
+    content_hash VARCHAR(64) UNIQUE NOT NULL,
+    storage_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    resource_type VARCHAR(10) NOT NULL,
+    variants JSONB,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS post_urgency (
+    post_id INTEGER REFERENCES posts(id) ON DELETE CASCADE,
+    period VARCHAR(8) NOT NULL,
+    score DOUBLE PRECISION NOT NULL DEFAULT 0,
+    vote_count INTEGER NOT NULL DEFAULT 0,
+    computed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (post_id, period)
+);
+
+-- Left empty here; the API fills it from posts and rankings on startup
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    posts_count INTEGER NOT NULL DEFAULT 0,
+    votes_received INTEGER NOT NULL DEFAULT 0,
+    votes_cast INTEGER NOT NULL DEFAULT 0,
+    high_priority_posts INTEGER NOT NULL DEFAULT 0,
+    medium_priority_posts INTEGER NOT NULL DEFAULT 0,
+    low_priority_posts INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id SERIAL PRIMARY KEY,
+    token_hash VARCHAR(64) UNIQUE NOT NULL,
+    family_id VARCHAR(32) NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    used_at TIMESTAMP WITH TIME ZONE,
+    revoked_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexes; the two dropped ones are covered by composite replacements
+DROP INDEX IF EXISTS idx_posts_user_id;
+DROP INDEX IF EXISTS idx_rankings_user_id;
+CREATE INDEX IF NOT EXISTS ix_posts_user_id_created_at_id ON posts(user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_posts_created_at_id ON posts(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_posts_average_rank_created_at_id ON posts(average_rank, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_posts_total_rankings_created_at_id ON posts(total_rankings, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_posts_media_hash ON posts(media_hash);
+CREATE INDEX IF NOT EXISTS ix_posts_geohash ON posts(geohash varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_rankings_post_id ON rankings(post_id);
+CREATE INDEX IF NOT EXISTS ix_rankings_user_id_id ON rankings(user_id, id);
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_family_id ON refresh_tokens(family_id);
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_user_id ON refresh_tokens(user_id);
+CREATE INDEX IF NOT EXISTS ix_post_urgency_period_score ON post_urgency(period, score);
+
+-- Deleting a post or user removes what hangs off it in the database
+ALTER TABLE posts DROP CONSTRAINT IF EXISTS posts_user_id_fkey;
+ALTER TABLE posts ADD CONSTRAINT posts_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+ALTER TABLE rankings DROP CONSTRAINT IF EXISTS rankings_user_id_fkey;
+ALTER TABLE rankings ADD CONSTRAINT rankings_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+ALTER TABLE rankings DROP CONSTRAINT IF EXISTS rankings_post_id_fkey;
+ALTER TABLE rankings ADD CONSTRAINT rankings_post_id_fkey
+    FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE;
+
+-- The API now keeps the aggregates current on every vote; the old
+-- per-row recount trigger would only repeat that work
+DROP TRIGGER IF EXISTS update_post_rankings_trigger ON rankings;
+DROP FUNCTION IF EXISTS update_post_rankings();
+
+-- One set-based recount of every post's counters from its rankings, the
+-- same as RankingService.rebuild_post_aggregates
+UPDATE posts p SET
+    rank_1_count = counts.rank_1,
+    rank_2_count = counts.rank_2,
+    rank_3_count = counts.rank_3,
+    total_rankings = counts.total,
+    average_rank = counts.average
+FROM (
+    SELECT
+        posts.id AS post_id,
+        COUNT(r.id) FILTER (WHERE r.rank_value = 1) AS rank_1,
+        COUNT(r.id) FILTER (WHERE r.rank_value = 2) AS rank_2,
+        COUNT(r.id) FILTER (WHERE r.rank_value = 3) AS rank_3,
+        COUNT(r.id) AS total,
+        COALESCE(ROUND(AVG(r.rank_value)::NUMERIC, 2), 0) AS average
+    FROM posts
+    LEFT JOIN rankings r ON r.post_id = posts.id
+    GROUP BY posts.id
+) counts
+WHERE p.id = counts.post_id;
+
+-- Every post has its aggregates now; keyset paging sorts on them and
+-- can't step past NULLs
+ALTER TABLE posts ALTER COLUMN total_rankings SET DEFAULT 0;
+ALTER TABLE posts ALTER COLUMN total_rankings SET NOT NULL;
+ALTER TABLE posts ALTER COLUMN average_rank SET DEFAULT 0.00;
+ALTER TABLE posts ALTER COLUMN average_rank SET NOT NULL;
+
+COMMIT;
@@ -46,6 +46,17 @@ document.addEventListener('DOMContentLoaded', function() {
                 formData.append('media_file', mediaFile);
             }
             
+            if (document.getElementById('attachLocation')?.checked) {
+                try {
+                    const position = await getCurrentPosition();
+                    formData.append('latitude', position.coords.latitude);
+                    formData.append('longitude', position.coords.longitude);
+                } catch (error) {
+                    showMessage('Could not read your location: ' + error.message, 'error');
+                    return;
+                }
+            }
+            
             try {
                 const result = await API.createPost(formData);
                 showMessage('Post created successfully!', 'success');
@@ -77,4 +88,14 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         });
     }
-});
\ No newline at end of file
+});
+
+function getCurrentPosition() {
+    return new Promise((resolve, reject) => {
+        if (!navigator.geolocation) {
+            reject(new Error('Geolocation is not supported by this browser'));
+            return;
+        }
+        navigator.geolocation.getCurrentPosition(resolve, reject, { timeout: 10000 });
+    });
+}
@@ -1,13 +1,20 @@
 // frontend/js/api.js
 const API_BASE_URL = 'http://localhost:8000';
 
+// One refresh at a time; concurrent 401s wait on the same one
+let refreshPromise = null;
+
 class API {
-    static async request(endpoint, options = {}) {
+    // With withCursor the result is { items, nextCursor } for paged lists
+    static async request(endpoint, { withCursor = false, retried = false, ...options } = {}) {
         const token = localStorage.getItem('token');
         const headers = {
-            'Content-Type': 'application/json',
             ...options.headers
         };
+        // FormData sets its own multipart Content-Type
+        if (!(options.body instanceof FormData)) {
+            headers['Content-Type'] = 'application/json';
+        }
 
         if (token) {
             headers['Authorization'] = `Bearer ${token}`;
@@ -22,8 +29,12 @@ class API {
             const response = await fetch(`${API_BASE_URL}${endpoint}`, config);
             
             if (response.status === 401) {
-                // Token expired or invalid
+                // Access token expired: renew it once and replay the request
+                if (!retried && localStorage.getItem('refresh_token') && await this.refreshSession(token)) {
+                    return this.request(endpoint, { withCursor, retried: true, ...options });
+                }
                 localStorage.removeItem('token');
+                localStorage.removeItem('refresh_token');
                 localStorage.removeItem('user');
                 window.location.href = 'login.html';
                 return;
@@ -35,6 +46,9 @@ class API {
                 throw new Error(data.detail || 'Request failed');
             }
 
+            if (withCursor) {
+                return { items: data, nextCursor: response.headers.get('X-Next-Cursor') };
+            }
             return data;
         } catch (error) {
             console.error('API Error:', error);
@@ -57,29 +71,87 @@ class API {
         });
     }
 
+    static refreshSession(staleToken) {
+        if (!refreshPromise) {
+            // Tabs share one refresh token; the lock makes them take turns
+            const renew = () => this.renewTokens(staleToken);
+            const renewal = navigator.locks ? navigator.locks.request('refresh-session', renew) : renew();
+            refreshPromise = renewal.finally(() => {
+                refreshPromise = null;
+            });
+        }
+        return refreshPromise;
+    }
+
+    static async renewTokens(staleToken) {
+        if (localStorage.getItem('token') !== staleToken) {
+            // Another tab renewed the session while this one waited
+            return true;
+        }
+        const refreshToken = localStorage.getItem('refresh_token');
+        const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ refresh_token: refreshToken })
+        });
+        if (response.ok) {
+            const result = await response.json();
+            localStorage.setItem('token', result.access_token);
+            localStorage.setItem('refresh_token', result.refresh_token);
+            return true;
+        }
+        // Without Web Locks two tabs can still send the same token; the
+        // server turns the slower one away without revoking the session,
+        // and by then the faster one has stored the new pair
+        return localStorage.getItem('refresh_token') !== refreshToken;
+    }
+
+    static async logout() {
+        const refreshToken = localStorage.getItem('refresh_token');
+        if (!refreshToken) {
+            return;
+        }
+        await fetch(`${API_BASE_URL}/auth/logout`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ refresh_token: refreshToken })
+        });
+    }
+
     static async getCurrentUser() {
         return this.request('/auth/me');
     }
 
     // Post endpoints
     static async createPost(formData) {
-        const token = localStorage.getItem('token');
-        const response = await fetch(`${API_BASE_URL}/posts/`, {
+        return this.request('/posts/', {
             method: 'POST',
-            headers: {
-                'Authorization': `Bearer ${token}`
-            },
             body: formData
         });
-        return response.json();
     }
 
-    static async getAllPosts() {
-        return this.request('/posts/');
+    static async getAllPosts(params = {}) {
+        const query = new URLSearchParams(params).toString();
+        return this.request(query ? `/posts/?${query}` : '/posts/');
+    }
+
+    static async searchPosts(q, params = {}) {
+        const query = new URLSearchParams({ ...params, q }).toString();
+        return this.request(`/posts/search?${query}`);
+    }
+
+    static async getNearbyPosts(lat, lng, params = {}) {
+        const query = new URLSearchParams({ ...params, lat, lng }).toString();
+        return this.request(`/posts/nearby?${query}`);
+    }
+
+    static async getMyPosts(params = {}) {
+        const query = new URLSearchParams(params).toString();
+        return this.request(query ? `/posts/my-posts?${query}` : '/posts/my-posts', { withCursor: true });
     }
 
-    static async getMyPosts() {
-        return this.request('/posts/my-posts');
+    static async getMyDashboard() {
+        return this.request('/users/me/dashboard');
     }
 
     static async getPost(id) {
@@ -114,4 +186,11 @@ class API {
     static async getMyRanking(postId) {
         return this.request(`/rankings/post/${postId}/my-ranking`);
     }
+
+    static async getRankingsBatch(postIds) {
+        return this.request('/rankings/batch', {
+            method: 'POST',
+            body: JSON.stringify({ post_ids: postIds })
+        });
+    }
 }
\ No newline at end of file
@@ -19,8 +19,14 @@ document.addEventListener('DOMContentLoaded', function() {
     // Logout button
     const logoutBtn = document.getElementById('logoutBtn');
     if (logoutBtn) {
-        logoutBtn.addEventListener('click', function() {
+        logoutBtn.addEventListener('click', async function() {
+            try {
+                await API.logout();
+            } catch (error) {
+                // Logging out locally is enough if the server can't be reached
+            }
             localStorage.removeItem('token');
+            localStorage.removeItem('refresh_token');
             localStorage.removeItem('user');
             window.location.href = 'login.html';
         });
@@ -88,6 +94,7 @@ document.addEventListener('DOMContentLoaded', function() {
             try {
                 const result = await API.login(credentials);
                 localStorage.setItem('token', result.access_token);
+                localStorage.setItem('refresh_token', result.refresh_token);
                 
                 // Get user info
                 const user = await API.getCurrentUser();
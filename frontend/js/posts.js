@@ -1,5 +1,7 @@
 // frontend/js/posts.js
 let currentPostId = null;
+// Cursor of the next page of "My Posts", null when there is none
+let myPostsCursor = null;
 
 document.addEventListener('DOMContentLoaded', function () {
     loadPosts();
@@ -13,15 +15,24 @@ async function loadPosts() {
 
     try {
         let posts;
+        const searchQuery = document.getElementById('searchInput')?.value.trim();
         if (isMyPostsPage) {
-            posts = await API.getMyPosts();
+            loadDashboard();
+            const page = await API.getMyPosts();
+            posts = page.items;
+            myPostsCursor = page.nextCursor;
+        } else if (searchQuery) {
+            posts = await API.searchPosts(searchQuery);
+        } else if (getCurrentFilter() === 'nearby') {
+            posts = await loadNearbyPosts();
         } else {
-            posts = await API.getAllPosts();
+            posts = await API.getAllPosts(getFeedParams());
         }
 
         // Store posts globally for sorting/filtering
         window.allLoadedPosts = posts;
         displayPosts(posts);
+        updateLoadMore();
     } catch (error) {
         console.error('Error loading posts:', error);
         container.innerHTML = `
@@ -33,6 +44,69 @@ async function loadPosts() {
     }
 }
 
+async function loadMorePosts() {
+    const button = document.getElementById('loadMoreBtn');
+    button.disabled = true;
+    try {
+        const page = await API.getMyPosts({ cursor: myPostsCursor });
+        myPostsCursor = page.nextCursor;
+        window.allLoadedPosts = window.allLoadedPosts.concat(page.items);
+        displayPosts(window.allLoadedPosts);
+    } catch (error) {
+        console.error('Error loading more posts:', error);
+    } finally {
+        button.disabled = false;
+        updateLoadMore();
+    }
+}
+
+function updateLoadMore() {
+    const container = document.getElementById('loadMoreContainer');
+    if (container) {
+        container.style.display = myPostsCursor ? 'block' : 'none';
+    }
+}
+
+// Summary counters for "My Posts", computed by the server
+async function loadDashboard() {
+    const container = document.getElementById('dashboardSummary');
+    if (!container) return;
+
+    try {
+        const stats = await API.getMyDashboard();
+        const distribution = stats.priority_distribution;
+        container.innerHTML = `
+            <div class="dashboard-card">
+                <i class="fas fa-clipboard-list"></i>
+                <strong>${stats.posts_count}</strong>
+                <span>Posts</span>
+            </div>
+            <div class="dashboard-card">
+                <i class="fas fa-users"></i>
+                <strong>${stats.votes_received}</strong>
+                <span>Votes received</span>
+            </div>
+            <div class="dashboard-card">
+                <i class="fas fa-vote-yea"></i>
+                <strong>${stats.votes_cast}</strong>
+                <span>Votes cast</span>
+            </div>
+            <div class="dashboard-card">
+                <i class="fas fa-chart-bar"></i>
+                <div class="dashboard-distribution">
+                    <span class="priority-badge priority-high">High ${distribution.high}</span>
+                    <span class="priority-badge priority-medium">Medium ${distribution.medium}</span>
+                    <span class="priority-badge priority-low">Low ${distribution.low}</span>
+                </div>
+                <span>Priority of your posts</span>
+            </div>
+        `;
+    } catch (error) {
+        console.error('Error loading dashboard:', error);
+        container.innerHTML = '';
+    }
+}
+
 function displayPosts(posts) {
     const container = document.getElementById('postsContainer');
 
@@ -52,6 +126,11 @@ function displayPosts(posts) {
 
     container.innerHTML = posts.map(post => createPostCard(post)).join('');
 
+    // Stats for these posts are pushed from now on instead of polled
+    if (typeof subscribeToLiveUpdates === 'function') {
+        subscribeToLiveUpdates(posts.map(post => post.id));
+    }
+
     // Add event listeners to rank buttons
     document.querySelectorAll('.rank-post-btn').forEach(btn => {
         btn.addEventListener('click', function () {
@@ -81,10 +160,16 @@ function displayPosts(posts) {
 }
 
 function createPostCard(post) {
-    const mediaHtml = post.media_url ? `
+    const mediaPending = post.media_status === 'pending';
+    const mediaHtml = mediaPending ? `
+        <div class="post-media media-pending">
+            <i class="fas fa-spinner fa-spin"></i>
+            <span>Media is still uploading...</span>
+        </div>
+    ` : post.media_url ? `
         <div class="post-media">
             ${post.media_type === 'image'
-            ? `<img src="${post.media_url}" alt="Post image" loading="lazy">`
+            ? createImageHtml(post)
             : `<video controls>
                     <source src="${post.media_url}" type="video/mp4">
                     Your browser does not support the video tag.
@@ -137,6 +222,10 @@ function createPostCard(post) {
                 <span class="priority-badge ${priorityClass}">
                     ${priorityText}
                 </span>
+                ${post.is_hidden ? `
+                <span class="priority-badge hidden-badge">
+                    <i class="fas fa-eye-slash"></i> Hidden by moderators
+                </span>` : ''}
                 <div class="post-text">${escapeHtml(post.text)}</div>
                 
                 <div class="post-stats">
@@ -148,6 +237,11 @@ function createPostCard(post) {
                         <i class="fas fa-users"></i>
                         <span>Votes: <strong>${post.total_rankings || 0}</strong></span>
                     </div>
+                    ${post.distance_m != null ? `
+                    <div class="stat-item">
+                        <i class="fas fa-map-marker-alt"></i>
+                        <span>Distance: <strong>${formatDistance(post.distance_m)}</strong></span>
+                    </div>` : ''}
                 </div>
                 
                 <div class="post-meta">
@@ -166,6 +260,30 @@ function createPostCard(post) {
     `;
 }
 
+// Serve resized variants when the server produced them; the original
+// stays one click away
+function createImageHtml(post) {
+    const variants = post.media_variants;
+    if (!variants) {
+        return `<img src="${post.media_url}" alt="Post image" loading="lazy">`;
+    }
+
+    const srcset = format => Object.entries(variants[format] || {})
+        .map(([width, url]) => `${url} ${width}w`)
+        .join(', ');
+    const sizes = '(max-width: 600px) 100vw, 400px';
+    const fallback = post.thumbnail_url || post.media_url;
+
+    return `
+        <a href="${post.media_url}" target="_blank" rel="noopener">
+            <picture>
+                ${variants.webp ? `<source type="image/webp" srcset="${srcset('webp')}" sizes="${sizes}">` : ''}
+                <img src="${fallback}" ${variants.jpeg ? `srcset="${srcset('jpeg')}" sizes="${sizes}"` : ''} alt="Post image" loading="lazy">
+            </picture>
+        </a>
+    `;
+}
+
 function setupEventListeners() {
     // Filter buttons
     document.querySelectorAll('.filter-btn').forEach(btn => {
@@ -182,6 +300,22 @@ function setupEventListeners() {
         sortSelect.addEventListener('change', applySorting);
     }
 
+    // Next page of "My Posts"
+    const loadMoreBtn = document.getElementById('loadMoreBtn');
+    if (loadMoreBtn) {
+        loadMoreBtn.addEventListener('click', loadMorePosts);
+    }
+
+    // Search box, debounced so every keystroke doesn't hit the server
+    const searchInput = document.getElementById('searchInput');
+    if (searchInput) {
+        let searchTimer = null;
+        searchInput.addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(loadPosts, 300);
+        });
+    }
+
     // Modal close
     const modal = document.getElementById('rankingModal');
     const closeBtn = document.querySelector('.close-modal');
@@ -234,10 +368,12 @@ async function submitRanking() {
             rank_value: rankValue
         });
 
-        // Close modal and refresh posts
+        // Close modal; the new stats arrive over the live stream
         document.getElementById('rankingModal').classList.remove('show');
         showMessage('Thank you for ranking this problem!', 'success');
-        loadPosts(); // Refresh to show updated stats
+        if (typeof isLiveConnected !== 'function' || !isLiveConnected()) {
+            loadPosts(); // No live stream, refresh to show updated stats
+        }
     } catch (error) {
         showMessage(error.message, 'error');
     }
@@ -289,65 +425,71 @@ async function handleDeletePost(postId) {
     }
 }
 
-function applyFilter(filter) {
-    if (!window.allLoadedPosts) return;
+// Map the UI filter/sort controls onto the server-side feed parameters
+const FILTER_TO_PRIORITY = {
+    urgent: 'high',
+    medium: 'medium',
+    low: 'low'
+};
 
-    let filteredPosts = [...window.allLoadedPosts];
+const SORT_TO_SERVER = {
+    newest: 'newest',
+    oldest: 'oldest',
+    priority: 'priority',
+    votes: 'most_ranked'
+};
 
-    if (filter !== 'all') {
-        filteredPosts = filteredPosts.filter(post => {
-            const avgRank = post.average_rank || 0;
-            if (filter === 'urgent') return avgRank >= 2.5;
-            if (filter === 'medium') return avgRank >= 1.5 && avgRank < 2.5;
-            if (filter === 'low') return avgRank < 1.5;
-            return true;
-        });
-    }
+// "Near Me" search radius
+const NEARBY_RADIUS_METERS = 2000;
+
+function getFeedParams() {
+    const params = {};
 
-    // Also apply current sorting
     const sortValue = document.getElementById('sortSelect')?.value || 'newest';
-    sortPosts(filteredPosts, sortValue);
+    params.sort = SORT_TO_SERVER[sortValue] || 'newest';
 
-    displayPosts(filteredPosts);
+    const currentFilter = getCurrentFilter();
+    if (FILTER_TO_PRIORITY[currentFilter]) {
+        params.priority = FILTER_TO_PRIORITY[currentFilter];
+    }
+
+    return params;
 }
 
-function applySorting() {
-    if (!window.allLoadedPosts) return;
-
-    const sortValue = this.value;
-    const currentFilter = document.querySelector('.filter-btn.active')?.dataset.filter || 'all';
-
-    // We filter first then sort
-    let filteredPosts = [...window.allLoadedPosts];
-    if (currentFilter !== 'all') {
-        filteredPosts = filteredPosts.filter(post => {
-            const avgRank = post.average_rank || 0;
-            if (currentFilter === 'urgent') return avgRank >= 2.5;
-            if (currentFilter === 'medium') return avgRank >= 1.5 && avgRank < 2.5;
-            if (currentFilter === 'low') return avgRank < 1.5;
-            return true;
-        });
-    }
+function formatDistance(meters) {
+    return meters < 1000 ? `${Math.round(meters)} m` : `${(meters / 1000).toFixed(1)} km`;
+}
 
-    sortPosts(filteredPosts, sortValue);
-    displayPosts(filteredPosts);
+function getCurrentFilter() {
+    return document.querySelector('.filter-btn.active')?.dataset.filter || 'all';
 }
 
-function sortPosts(posts, criteria) {
-    switch (criteria) {
-        case 'newest':
-            posts.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
-            break;
-        case 'oldest':
-            posts.sort((a, b) => new Date(a.created_at) - new Date(b.created_at));
-            break;
-        case 'priority':
-            posts.sort((a, b) => (b.average_rank || 0) - (a.average_rank || 0));
-            break;
-        case 'votes':
-            posts.sort((a, b) => (b.total_rankings || 0) - (a.total_rankings || 0));
-            break;
-    }
+function loadNearbyPosts() {
+    return new Promise((resolve, reject) => {
+        if (!navigator.geolocation) {
+            reject(new Error('Geolocation is not supported by this browser'));
+            return;
+        }
+        navigator.geolocation.getCurrentPosition(position => {
+            const sortValue = document.getElementById('sortSelect')?.value;
+            const params = { radius: NEARBY_RADIUS_METERS };
+            if (sortValue === 'priority') {
+                params.sort = 'priority';
+            }
+            API.getNearbyPosts(position.coords.latitude, position.coords.longitude, params)
+                .then(resolve, reject);
+        }, reject, { timeout: 10000 });
+    });
+}
+
+function applyFilter(filter) {
+    // Filtering runs in the database, so reload the feed
+    loadPosts();
+}
+
+function applySorting() {
+    // Sorting runs in the database, so reload the feed
+    loadPosts();
 }
 
 function getPriorityClass(averageRank) {
@@ -53,54 +53,100 @@ function hideRankTooltip(event) {
 
 // Real-time ranking updates
 async function updatePostRankings(postId) {
+    return updateRankingsForPosts([postId]);
+}
+
+// Stats and the user's own vote for many posts in one round trip
+async function updateRankingsForPosts(postIds) {
     try {
-        const stats = await API.getPostRankingStats(postId);
-        const myRanking = await API.getMyRanking(postId);
-        
-        // Update UI elements
-        const postElement = document.querySelector(`[data-post-id="${postId}"]`)?.closest('.post-card');
-        if (postElement) {
-            // Update stats display
-            const statsElement = postElement.querySelector('.post-stats');
-            if (statsElement) {
-                statsElement.innerHTML = `
-                    <div class="stat-item">
-                        <i class="fas fa-chart-line"></i>
-                        <span>Priority: <strong>${stats.average_rank}</strong></span>
-                    </div>
-                    <div class="stat-item">
-                        <i class="fas fa-users"></i>
-                        <span>Votes: <strong>${stats.total_rankings}</strong></span>
-                    </div>
-                    <div class="stat-item">
-                        <i class="fas fa-fire"></i>
-                        <span>High: ${stats.rank_3_count}</span>
-                    </div>
-                `;
-            }
-            
-            // Update priority badge
-            const badge = postElement.querySelector('.priority-badge');
-            if (badge) {
-                badge.className = `priority-badge ${getPriorityClass(stats.average_rank)}`;
-                badge.textContent = getPriorityText(stats.average_rank);
-            }
-            
-            // Highlight user's current ranking
-            if (myRanking.rank_value) {
-                postElement.querySelectorAll('.rank-btn-small').forEach(btn => {
-                    btn.classList.remove('user-ranked');
-                    if (parseInt(btn.dataset.rank) === myRanking.rank_value) {
-                        btn.classList.add('user-ranked');
-                        btn.innerHTML = `
-                            <i class="fas fa-check"></i>
-                            <span>Your Rank: ${myRanking.rank_value}</span>
-                        `;
-                    }
-                });
-            }
-        }
+        const summaries = await API.getRankingsBatch(postIds);
+        summaries.forEach(renderPostRanking);
     } catch (error) {
         console.error('Error updating rankings:', error);
     }
-}
\ No newline at end of file
+}
+
+function renderPostRanking(stats) {
+    const postId = stats.post_id;
+
+    // Update UI elements
+    const postElement = document.querySelector(`[data-post-id="${postId}"]`)?.closest('.post-card');
+    if (!postElement) return;
+
+    // Update stats display
+    const statsElement = postElement.querySelector('.post-stats');
+    if (statsElement) {
+        statsElement.innerHTML = `
+            <div class="stat-item">
+                <i class="fas fa-chart-line"></i>
+                <span>Priority: <strong>${stats.average_rank}</strong></span>
+            </div>
+            <div class="stat-item">
+                <i class="fas fa-users"></i>
+                <span>Votes: <strong>${stats.total_rankings}</strong></span>
+            </div>
+            <div class="stat-item">
+                <i class="fas fa-fire"></i>
+                <span>High: ${stats.rank_3_count}</span>
+            </div>
+        `;
+    }
+
+    // Update priority badge
+    const badge = postElement.querySelector('.priority-badge');
+    if (badge) {
+        badge.className = `priority-badge ${getPriorityClass(stats.average_rank)}`;
+        badge.textContent = getPriorityText(stats.average_rank);
+    }
+
+    // Highlight user's current ranking
+    if (stats.rank_value) {
+        postElement.querySelectorAll('.rank-btn-small').forEach(btn => {
+            btn.classList.remove('user-ranked');
+            if (parseInt(btn.dataset.rank) === stats.rank_value) {
+                btn.classList.add('user-ranked');
+                btn.innerHTML = `
+                    <i class="fas fa-check"></i>
+                    <span>Your Rank: ${stats.rank_value}</span>
+                `;
+            }
+        });
+    }
+}
+
+// Live updates: the server pushes stat changes for the posts on screen
+let liveSource = null;
+
+function subscribeToLiveUpdates(postIds) {
+    if (liveSource) {
+        liveSource.close();
+        liveSource = null;
+    }
+    if (!window.EventSource || postIds.length === 0) return;
+
+    const query = new URLSearchParams();
+    postIds.forEach(id => query.append('post_ids', id));
+    liveSource = new EventSource(`${API_BASE_URL}/rankings/live?${query}`);
+
+    liveSource.addEventListener('stats', event => {
+        renderPostRanking(JSON.parse(event.data));
+    });
+
+    liveSource.addEventListener('updated', event => {
+        const update = JSON.parse(event.data);
+        const postElement = document.querySelector(`[data-post-id="${update.post_id}"]`)?.closest('.post-card');
+        const textElement = postElement?.querySelector('.post-text');
+        if (textElement) {
+            textElement.textContent = update.text;
+        }
+    });
+
+    liveSource.addEventListener('deleted', event => {
+        const update = JSON.parse(event.data);
+        document.querySelector(`[data-post-id="${update.post_id}"]`)?.closest('.post-card')?.remove();
+    });
+}
+
+function isLiveConnected() {
+    return liveSource !== null && liveSource.readyState !== EventSource.CLOSED;
+}